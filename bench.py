@@ -0,0 +1,593 @@
+"""
+Claw-Log Benchmarks
+- startup: 조회 명령(--log, --status 등)의 시작 시간과 import 비용 (python -m claw_log.bench startup)
+- suite: 합성 Git 저장소를 만들어 탐색 → 수집 → payload 조립 → 요약(스텁) → 기록 → 조회 → 대시보드
+  단계별 시간을 측정하고 JSON으로 저장 (python -m claw_log.bench suite --output before.json)
+  --engine gemini/openai/openai-oauth: 실제 엔진을 로컬 모의 LLM 서버(mockllm)에 연결해 동시성/재시도 측정
+- compare: 두 suite 결과의 단계별 p50을 비교해 회귀를 표시 (python -m claw_log.bench compare before.json after.json)
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from claw_log.engine import BaseSummarizer
+from claw_log.metrics import percentile
+
+# 조회 명령의 목표 시간 (인터프리터 기동 제외, .env: BENCH_STARTUP_TARGET_MS)
+DEFAULT_STARTUP_TARGET_MS = 100
+DEFAULT_REPEAT = 7
+
+# 설정 없이 바로 끝나는 조회 명령
+STARTUP_COMMANDS = (
+    ("import", ["-c", "import claw_log.main"]),
+    ("--log", ["-m", "claw_log.main", "--log"]),
+    ("--schedule-show", ["-m", "claw_log.main", "--schedule-show"]),
+    ("--status", ["-m", "claw_log.main", "--status"]),
+)
+
+# 엔진 생성 전에는 불러오지 않아야 하는 무거운 SDK
+LAZY_MODULES = ("google.genai", "openai", "httpx")
+
+
+def _startup_target_ms():
+    try:
+        return float(os.getenv("BENCH_STARTUP_TARGET_MS", DEFAULT_STARTUP_TARGET_MS))
+    except ValueError:
+        return DEFAULT_STARTUP_TARGET_MS
+
+
+def _time_command(argv, repeat, cwd):
+    """argv를 repeat번 실행한 소요 시간(ms)의 중앙값."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + argv, cwd=cwd, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, stdin=subprocess.DEVNULL)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def import_profile(module="claw_log.main", cwd=None):
+    """
+    python -X importtime으로 module을 import하고 모듈별 비용을 해석합니다.
+    반환: [{"module", "self_ms", "cumulative_ms"}] (import 순서)
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd, capture_output=True, text=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            rows.append({
+                "module": name.strip(),
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            })
+        except ValueError:
+            continue
+    return rows
+
+
+def bench_startup(repeat=DEFAULT_REPEAT):
+    """
+    조회 명령의 시작 시간을 측정합니다. .env/로그가 없는 임시 디렉토리에서 실행합니다.
+    반환: {"baseline_ms", "target_ms", "commands": [...], "heaviest": [...], "eager_sdks": [...]}
+    """
+    with tempfile.TemporaryDirectory() as cwd:
+        baseline = _time_command(["-c", "pass"], repeat, cwd)
+        commands = []
+        for name, argv in STARTUP_COMMANDS:
+            total = _time_command(argv, repeat, cwd)
+            commands.append({"command": name, "total_ms": round(total, 1),
+                             "startup_ms": round(max(0.0, total - baseline), 1)})
+        profile = import_profile(cwd=cwd)
+
+    # importtime은 하위 모듈을 먼저 출력하므로, site 다음부터가 claw_log.main이 불러온 모듈
+    names = [row["module"] for row in profile]
+    start = len(names) - names[::-1].index("site") if "site" in names else 0
+    main_rows = profile[start:]
+    heaviest = sorted(main_rows, key=lambda r: -r["self_ms"])[:10]
+    return {
+        "python": sys.version.split()[0],
+        "baseline_ms": round(baseline, 1),
+        "target_ms": _startup_target_ms(),
+        "commands": commands,
+        "heaviest": heaviest,
+        "eager_sdks": [m for m in LAZY_MODULES if m in names],
+    }
+
+
+def _print_startup(report):
+    target = report["target_ms"]
+    print(f"\n⏱️  CLI 시작 시간 (Python {report['python']}, 인터프리터 기동 {report['baseline_ms']:.0f}ms 제외)")
+    print("=" * 50)
+    for c in report["commands"]:
+        mark = "✅" if c["startup_ms"] <= target else "❌"
+        print(f"  {mark} {c['command']:<16} {c['startup_ms']:>7.1f}ms  (전체 {c['total_ms']:.0f}ms)")
+    print("=" * 50)
+    print(f"  목표: {target:.0f}ms 이하")
+    if report["eager_sdks"]:
+        print(f"  ❌ 시작 시 불러온 SDK: {', '.join(report['eager_sdks'])}")
+    print("\n  import 비용 상위 모듈 (self)")
+    for r in report["heaviest"]:
+        print(f"    {r['self_ms']:>6.1f}ms  {r['module']}")
+
+
+# ── 합성 저장소 ──
+
+# 합성 커밋의 작성자 (fast-import는 사용자 git 설정을 쓰지 않음)
+SYNTHETIC_AUTHOR = "Claw Bench <bench@claw-log.invalid>"
+_WORDS = ("user", "order", "cache", "token", "event", "report", "session", "queue", "payload", "config")
+
+
+def _synthetic_line(rng):
+    a, b = rng.choice(_WORDS), rng.choice(_WORDS)
+    return f"    {a}_{b} = compute_{b}({a}, limit={rng.randint(1, 999)})\n"
+
+
+def _synthetic_file(rng, index, lines):
+    body = "".join(_synthetic_line(rng) for _ in range(lines))
+    return f"def handler_{index}(request):\n{body}    return request\n"
+
+
+def make_synthetic_repo(path, days=7, commits_per_day=5, files=50, diff_lines=20, seed=0):
+    """
+    path에 git 저장소를 만들고 과거 days일 ~ 오늘에 걸쳐 합성 커밋을 생성합니다. (git fast-import)
+    커밋마다 파일 몇 개에서 diff_lines줄씩 바꾸고, 마지막에 커밋하지 않은 변경을 남깁니다.
+    반환: 생성한 커밋 수
+    """
+    rng = random.Random(seed)
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+
+    lines_per_file = max(diff_lines * 2, 40)
+    contents = {f"src/module_{i}.py": _synthetic_file(rng, i, lines_per_file) for i in range(files)}
+    total = commits_per_day * (days + 1)
+    now = int(time.time())
+    start = now - days * 86400
+
+    stream = []
+
+    def _blob(name, text):
+        data = text.encode("utf-8")
+        stream.append(f"M 100644 inline {name}\ndata {len(data)}\n".encode("utf-8") + data + b"\n")
+
+    def _commit(index, when, names):
+        message = f"{rng.choice(_WORDS)}: update {len(names)} files ({index})".encode("utf-8")
+        header = (f"commit refs/heads/main\nauthor {SYNTHETIC_AUTHOR} {when} +0000\n"
+                  f"committer {SYNTHETIC_AUTHOR} {when} +0000\ndata {len(message)}\n")
+        stream.append(header.encode("utf-8") + message + b"\n")
+        for name in names:
+            _blob(name, contents[name])
+
+    # 첫 커밋(기준 시점 이전)에 모든 파일을 추가
+    _commit(0, start - 3600, sorted(contents))
+    per_commit = max(1, min(files, diff_lines // 8 + 1))
+    for index in range(1, total + 1):
+        when = start + int((now - 120 - start) * index / total)
+        names = rng.sample(sorted(contents), per_commit)
+        for name in names:
+            _mutate(rng, contents, name, max(1, diff_lines // per_commit))
+        _commit(index, when, names)
+
+    subprocess.run(["git", "fast-import", "--quiet"], cwd=path, input=b"".join(stream), check=True)
+    subprocess.run(["git", "symbolic-ref", "HEAD", "refs/heads/main"], cwd=path, check=True)
+    subprocess.run(["git", "checkout", "-q", "-f", "main"], cwd=path, check=True)
+
+    # 작업 중인 변경 (uncommitted)
+    for name in rng.sample(sorted(contents), min(files, 2)):
+        _mutate(rng, contents, name, diff_lines)
+        (path / name).write_text(contents[name], encoding="utf-8")
+    return total + 1
+
+
+def _mutate(rng, contents, name, count):
+    lines = contents[name].splitlines(keepends=True)
+    for _ in range(count):
+        i = rng.randrange(1, len(lines) - 1)
+        lines[i] = _synthetic_line(rng)
+    contents[name] = "".join(lines)
+
+
+def make_synthetic_workspace(root, repos=3, **repo_options):
+    """root/repo_N 저장소들을 만들고 경로 목록을 반환합니다."""
+    paths = []
+    seed = repo_options.pop("seed", 0)
+    for i in range(repos):
+        path = Path(root) / f"repo_{i}"
+        make_synthetic_repo(path, seed=seed + i, **repo_options)
+        paths.append(str(path))
+    return paths
+
+
+# ── 단계별 측정 ──
+
+def summarize_samples(samples_ms):
+    """측정값 목록(ms) → {"runs", "total_ms", "mean_ms", "p50_ms", "p95_ms", "max_ms"}"""
+    values = sorted(samples_ms)
+    return {
+        "runs": len(values),
+        "total_ms": round(sum(values), 2),
+        "mean_ms": round(statistics.mean(values), 2) if values else 0.0,
+        "p50_ms": round(percentile(values, 0.5) or 0.0, 2),
+        "p95_ms": round(percentile(values, 0.95) or 0.0, 2),
+        "max_ms": round(values[-1], 2) if values else 0.0,
+    }
+
+
+class _Stages:
+    """단계 이름별 측정값(ms) 모음. 측정 중 출력(print)은 버림."""
+
+    def __init__(self):
+        self.samples = {}
+
+    @contextlib.contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+        self.samples.setdefault(name, []).append((time.perf_counter() - start) * 1000)
+
+    def report(self):
+        return {name: summarize_samples(values) for name, values in self.samples.items()}
+
+
+class StubSummarizer(BaseSummarizer):
+    """
+    LLM 대신 쓰는 스텁. payload의 프로젝트마다 요약 형식의 짧은 본문을 만들어 반환합니다.
+    latency(초)를 주면 응답 대기를 흉내 냅니다.
+    """
+
+    model_name = "stub"
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+
+    def summarize(self, text_data, system_prompt=None):
+        if self.latency:
+            time.sleep(self.latency)
+        names = re.findall(r"^--- PROJECT: (.+?) ---$", text_data, flags=re.MULTILINE) or ["unknown"]
+        return "\n\n".join(
+            f"### 📂 [{name}]\n> **핵심 성과**: 합성 저장소 변경 요약 ({len(text_data):,}자)\n\n"
+            f"- **🛠 상세 내역**\n  - 모듈 갱신\n  - 설정 정리"
+            for name in names
+        )
+
+
+# suite --engine 선택지: stub 외에는 모의 LLM 서버에 연결한 실제 엔진
+SUITE_ENGINES = ("stub", "gemini", "openai", "openai-oauth")
+
+
+@contextlib.contextmanager
+def _bench_summarizer(engine, latency, mock):
+    """
+    벤치마크용 요약기를 만듭니다. 실제 엔진이면 모의 서버를 띄우고 기본 URL 설정을 그쪽으로 돌립니다.
+    측정 대상이 엔진 계층이므로 속도 제한(RATE_LIMIT_RPM/TPM)은 따로 지정하지 않으면 끔.
+    반환(yield): (summarizer, 모의 서버 또는 None)
+    """
+    if engine == "stub":
+        yield StubSummarizer(latency=latency), None
+        return
+
+    from claw_log.mockllm import MockConfig, start_mock_server, base_url_env
+    from claw_log.engine import GeminiSummarizer, OpenAISummarizer, CodexOAuthSummarizer
+
+    server, base_url = start_mock_server(MockConfig(latency=latency, **(mock or {})))
+    overrides = dict(base_url_env(base_url))
+    overrides.setdefault("RATE_LIMIT_RPM", os.getenv("RATE_LIMIT_RPM", "0"))
+    overrides.setdefault("RATE_LIMIT_TPM", os.getenv("RATE_LIMIT_TPM", "0"))
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    summarizer = None
+    try:
+        if engine == "openai":
+            summarizer = OpenAISummarizer("mock-key")
+        elif engine == "gemini":
+            summarizer = GeminiSummarizer("mock-key")
+        else:
+            summarizer = CodexOAuthSummarizer()
+            # 모의 서버는 인증을 확인하지 않으므로 저장된 OAuth 토큰 대신 고정 값 사용
+            summarizer.load_tokens = lambda: {"access_token": "mock", "expires_at": time.time() + 3600}
+        yield summarizer, server
+    finally:
+        if summarizer is not None and getattr(summarizer, "_client", None) is not None:
+            summarizer._client.close()
+        server.shutdown()
+        server.server_close()
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _mock_stats(server):
+    return server.RequestHandlerClass.state.snapshot()
+
+
+def _http_get(url):
+    from urllib.request import urlopen
+    with urlopen(url, timeout=30) as resp:
+        return resp.read()
+
+
+def run_suite(workdir, repos=3, days=7, commits_per_day=5, files=50, diff_lines=20,
+              log_entries=50, repeat=3, seed=0, latency=0.0, engine="stub", concurrency=4, mock=None):
+    """
+    합성 작업 공간을 만들고 단계별 시간을 측정합니다. workdir을 현재 디렉토리로 사용합니다.
+    (claw_log.main의 ENV_PATH, 로그 파일 경로가 CWD 기준이므로 import 전에 이동)
+    engine: "stub"이면 스텁 요약기, 그 외(SUITE_ENGINES)는 실제 엔진을 모의 LLM 서버(mockllm)에 연결
+    mock: MockConfig 인자 (latency 제외, 예: {"tokens_per_second": 200, "error_rate": 0.1})
+    반환: JSON으로 저장할 결과 dict
+    """
+    params = {
+        "repos": repos, "days": days, "commits_per_day": commits_per_day, "files": files,
+        "diff_lines": diff_lines, "log_entries": log_entries, "repeat": repeat, "seed": seed,
+        "latency": latency, "engine": engine, "concurrency": concurrency, "mock": mock or {},
+        "log_backend": os.getenv("LOG_BACKEND", "markdown"), "collector": os.getenv("COLLECTOR", "log"),
+    }
+    workdir = Path(workdir).resolve()
+    workspace = workdir / "workspace"
+    prev_cwd = os.getcwd()
+    os.chdir(workdir)
+    try:
+        start = time.perf_counter()
+        paths = make_synthetic_workspace(workspace, repos=repos, days=days, commits_per_day=commits_per_day,
+                                         files=files, diff_lines=diff_lines, seed=seed)
+        setup_ms = (time.perf_counter() - start) * 1000
+        (workdir / ".env").write_text(
+            f"LLM_TYPE=gemini\nAPI_KEY=bench\nPROJECT_PATHS={','.join(paths)}\nINPUT_PATHS={workspace}\n",
+            encoding="utf-8",
+        )
+        stages, mock_stats = _run_stages(workdir, workspace, paths, params)
+    finally:
+        os.chdir(prev_cwd)
+
+    report = {
+        "version": _package_version(),
+        "python": sys.version.split()[0],
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "params": params,
+        "setup_ms": round(setup_ms, 1),
+        "stages": stages,
+    }
+    if mock_stats is not None:
+        report["mock_stats"] = mock_stats
+    return report
+
+
+def _run_stages(workdir, workspace, paths, params):
+    from claw_log.discover import discover_git_repos, MTIME_GRACE_SECONDS
+    from claw_log.engine import GeminiSummarizer, run_summaries
+    from claw_log.main import get_git_diff_for_path, collect_diffs, _build_payload, _project_char_budget
+    from claw_log.storage import prepend_to_log_file, read_recent_logs
+
+    days, repeat, log_entries = params["days"], params["repeat"], params["log_entries"]
+    stages = _Stages()
+    model = GeminiSummarizer.DEFAULT_MODEL
+    max_chars = _project_char_budget(False, model)
+
+    # 1. 저장소 탐색: 캐시 없이 한 번, 이후는 mtime 캐시 사용
+    cache_path = workdir / "discover.json"
+    with stages.measure("discover_git_repos"):
+        found = discover_git_repos(str(workspace), cache_path=cache_path)
+    if len(found) != len(paths):
+        raise RuntimeError(f"탐색 결과 불일치: {len(found)}개 발견, {len(paths)}개 생성")
+    # 방금 만든 디렉토리는 캐시를 믿지 않으므로 유예 시간이 지난 뒤 캐시를 채움
+    time.sleep(MTIME_GRACE_SECONDS + 0.1)
+    discover_git_repos(str(workspace), cache_path=cache_path)
+    for _ in range(repeat):
+        with stages.measure("discover_git_repos_cached"):
+            discover_git_repos(str(workspace), cache_path=cache_path)
+
+    # 2. diff 수집: 저장소별 get_git_diff_for_path, 전체 병렬 수집(collect_diffs)
+    results = None
+    for _ in range(repeat):
+        for path in paths:
+            with stages.measure("get_git_diff_for_path"):
+                get_git_diff_for_path(path, days=days, max_chars=max_chars, stats={})
+        with stages.measure("collect_diffs"):
+            results = collect_diffs(paths, days=days, max_chars=max_chars)
+
+    # 3. payload 조립 (토큰 예산 배분, diff 압축 포함)
+    payload = ""
+    for _ in range(repeat):
+        with stages.measure("build_payload"):
+            payload, project_names = _build_payload(results, max_chars, "변경사항 없음", model)
+
+    # 4. 요약: 한 건씩, 그리고 concurrency건을 한 이벤트 루프에서 동시에
+    engine = params["engine"]
+    with _bench_summarizer(engine, params["latency"], params["mock"]) as (summarizer, mock_server):
+        summary = ""
+        for _ in range(repeat):
+            with stages.measure(f"summarize_{engine}"):
+                summary = run_summaries(summarizer, [payload])[0]
+        for _ in range(repeat):
+            with stages.measure(f"summarize_{engine}_x{params['concurrency']}"):
+                run_summaries(summarizer, [payload] * params["concurrency"])
+        mock_stats = _mock_stats(mock_server) if mock_server is not None else None
+
+    # 5. 기록: 로그가 쌓이는 동안 엔트리마다 측정
+    base_day = time.time() - log_entries * 86400
+    for i in range(log_entries):
+        label = time.strftime("%Y-%m-%d", time.localtime(base_day + i * 86400))
+        with stages.measure("prepend_to_log_file"):
+            prepend_to_log_file(summary, date_label=label, meta={"engine": "stub", "model": "stub",
+                                                                  "projects": project_names,
+                                                                  "payload_chars": len(payload),
+                                                                  "token_estimate": 0})
+
+    # 6. 조회
+    for _ in range(repeat):
+        with stages.measure("read_recent_logs"):
+            read_recent_logs(n=5)
+
+    # 7. 대시보드 (첫 요청은 캐시 없는 상태)
+    from http.server import ThreadingHTTPServer
+    from claw_log.server import DashboardHandler
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DashboardHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        for path, name in (("/", "dashboard_index"), ("/api/data", "dashboard_api_data")):
+            with stages.measure(name + "_cold"):
+                _http_get(base_url + path)
+            for _ in range(repeat):
+                with stages.measure(name):
+                    _http_get(base_url + path)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    return stages.report(), mock_stats
+
+
+def _package_version():
+    from claw_log.main import get_version
+    return get_version()
+
+
+def _print_suite(report):
+    params = report["params"]
+    print(f"\n⏱️  Claw-Log 벤치마크 (claw-log {report['version']}, Python {report['python']})")
+    print(f"   저장소 {params['repos']}개 × {params['days']}일 × 하루 {params['commits_per_day']}커밋, "
+          f"파일 {params['files']}개, 커밋당 {params['diff_lines']}줄, 로그 {params['log_entries']}개 "
+          f"(생성 {report['setup_ms'] / 1000:.1f}s)")
+    print(f"   요약 엔진: {params['engine']}" + (" (모의 LLM 서버)" if params["engine"] != "stub" else ""))
+    print("=" * 66)
+    print(f"  {'단계':<28}{'횟수':>6}{'p50':>10}{'p95':>10}{'합계':>12}")
+    for name, s in report["stages"].items():
+        print(f"  {name:<28}{s['runs']:>6}{s['p50_ms']:>8.1f}ms{s['p95_ms']:>8.1f}ms{s['total_ms']:>10.1f}ms")
+    print("=" * 66)
+    mock = report.get("mock_stats")
+    if mock:
+        print(f"  모의 서버: 요청 {mock['total']}건, 429 {mock['rate_limited']}건, 최대 동시 처리 {mock['max_in_flight']}")
+
+
+def compare_reports(before, after, threshold=0.1):
+    """
+    두 suite 결과의 단계별 p50을 비교합니다.
+    반환: [{"stage", "before_ms", "after_ms", "ratio", "regressed"}] (threshold 이상 느려지면 regressed)
+    """
+    rows = []
+    for name, new in after["stages"].items():
+        old = before["stages"].get(name)
+        if not old:
+            continue
+        ratio = new["p50_ms"] / old["p50_ms"] if old["p50_ms"] else 1.0
+        rows.append({"stage": name, "before_ms": old["p50_ms"], "after_ms": new["p50_ms"],
+                     "ratio": round(ratio, 3), "regressed": ratio > 1 + threshold})
+    return rows
+
+
+def _print_compare(rows, before, after):
+    print(f"\n📊 벤치마크 비교: {before.get('version')} → {after.get('version')} (p50 기준)")
+    if before.get("params") != after.get("params"):
+        print("   ⚠️ 측정 조건(params)이 다릅니다. 결과를 직접 비교하기 어렵습니다.")
+    print("=" * 66)
+    for r in rows:
+        mark = "❌" if r["regressed"] else ("✅" if r["ratio"] < 1 else "  ")
+        print(f"  {mark} {r['stage']:<28}{r['before_ms']:>9.1f}ms → {r['after_ms']:>9.1f}ms  ({r['ratio']:.2f}x)")
+    print("=" * 66)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m claw_log.bench", description="Claw-Log 성능 측정")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    startup = sub.add_parser("startup", help="조회 명령의 시작 시간 / import 비용 측정")
+    startup.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help=f"명령별 반복 횟수 (기본: {DEFAULT_REPEAT})")
+    startup.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+
+    suite = sub.add_parser("suite", help="합성 저장소로 단계별 시간 측정")
+    suite.add_argument("--repos", type=int, default=3, help="저장소 수 (기본: 3)")
+    suite.add_argument("--days", type=int, default=7, help="커밋 기간(일), 수집도 같은 기간 (기본: 7)")
+    suite.add_argument("--commits-per-day", type=int, default=5, help="하루 커밋 수 (기본: 5)")
+    suite.add_argument("--files", type=int, default=50, help="저장소당 파일 수 (기본: 50)")
+    suite.add_argument("--diff-lines", type=int, default=20, help="커밋당 변경 줄 수 (기본: 20)")
+    suite.add_argument("--log-entries", type=int, default=50, help="기록할 로그 엔트리 수 (기본: 50)")
+    suite.add_argument("--repeat", type=int, default=3, help="단계별 반복 횟수 (기본: 3)")
+    suite.add_argument("--engine", choices=SUITE_ENGINES, default="stub",
+                       help="요약 엔진 (stub 외에는 로컬 모의 LLM 서버에 연결, 기본: stub)")
+    suite.add_argument("--latency", type=float, default=0.0, help="요약 응답 지연(초, 스텁/모의 서버 공통)")
+    suite.add_argument("--concurrency", type=int, default=4, help="동시 요약 측정 건수 (기본: 4)")
+    suite.add_argument("--mock-tokens-per-second", type=float, default=0.0, help="모의 서버 생성 속도 (0: 즉시)")
+    suite.add_argument("--mock-chunk-chars", type=int, default=16, help="모의 서버 스트리밍 조각 글자 수")
+    suite.add_argument("--mock-error-rate", type=float, default=0.0, help="모의 서버 429 확률 (0~1)")
+    suite.add_argument("--mock-retry-after", type=float, default=1.0, help="모의 서버 429의 Retry-After 초")
+    suite.add_argument("--seed", type=int, default=0)
+    suite.add_argument("--workdir", help="작업 디렉토리 (지정하면 삭제하지 않음, 비어 있어야 함)")
+    suite.add_argument("--output", help="결과 JSON 저장 경로")
+    suite.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+
+    compare = sub.add_parser("compare", help="두 suite 결과 JSON 비교")
+    compare.add_argument("before")
+    compare.add_argument("after")
+    compare.add_argument("--threshold", type=float, default=0.1, help="회귀로 볼 p50 증가율 (기본: 0.1 = 10%%)")
+    args = parser.parse_args(argv)
+
+    if args.bench == "startup":
+        report = bench_startup(repeat=max(1, args.repeat))
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            _print_startup(report)
+        over = [c for c in report["commands"] if c["startup_ms"] > report["target_ms"]]
+        return 1 if over or report["eager_sdks"] else 0
+
+    if args.bench == "suite":
+        options = dict(repos=args.repos, days=args.days, commits_per_day=args.commits_per_day, files=args.files,
+                       diff_lines=args.diff_lines, log_entries=args.log_entries, repeat=max(1, args.repeat),
+                       seed=args.seed, latency=args.latency, engine=args.engine,
+                       concurrency=max(1, args.concurrency))
+        if args.engine != "stub":
+            options["mock"] = {"tokens_per_second": args.mock_tokens_per_second,
+                               "chunk_chars": args.mock_chunk_chars, "error_rate": args.mock_error_rate,
+                               "retry_after": args.mock_retry_after, "seed": args.seed}
+        if args.workdir:
+            Path(args.workdir).mkdir(parents=True, exist_ok=True)
+            if any(Path(args.workdir).iterdir()):
+                print(f"❌ 작업 디렉토리가 비어 있지 않습니다: {args.workdir}")
+                return 2
+            report = run_suite(args.workdir, **options)
+        else:
+            with tempfile.TemporaryDirectory(prefix="claw-bench-") as workdir:
+                report = run_suite(workdir, **options)
+        if args.output:
+            Path(args.output).write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            _print_suite(report)
+            if args.output:
+                print(f"💾 결과 저장: {args.output}")
+        return 0
+
+    with open(args.before, encoding="utf-8") as f:
+        before = json.load(f)
+    with open(args.after, encoding="utf-8") as f:
+        after = json.load(f)
+    rows = compare_reports(before, after, threshold=args.threshold)
+    _print_compare(rows, before, after)
+    return 1 if any(r["regressed"] for r in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
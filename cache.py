@@ -0,0 +1,228 @@
+"""
+Claw-Log Summary Cache
+동일한 입력(엔진, 모델, 프롬프트, diff)에 대한 LLM 응답을 디스크에 저장해 재사용합니다.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from claw_log.engine import BaseSummarizer, SYSTEM_PROMPT, is_error_summary
+
+CACHE_DIR = Path.home() / ".claw-log" / "cache"
+STATS_FILENAME = "stats.json"
+
+DEFAULT_MAX_MB = 50
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Map-Reduce 등에서 여러 스레드가 동시에 통계를 갱신하므로 직렬화
+_stats_lock = threading.Lock()
+
+
+def _env_number(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def is_cache_enabled():
+    """SUMMARY_CACHE=false 로 끌 수 있습니다. (기본: 사용)"""
+    return os.getenv("SUMMARY_CACHE", "true").lower() not in ("0", "false", "no")
+
+
+class CachedSummarizer(BaseSummarizer):
+    """
+    임의의 BaseSummarizer를 감싸는 내용 주소 기반(content-addressed) 응답 캐시.
+    키 = sha256(엔진, 모델, 시스템 프롬프트, payload). 적중 시 네트워크 호출 없이 즉시 반환합니다.
+    """
+
+    def __init__(self, inner, cache_dir=CACHE_DIR, max_mb=None, max_age_days=None):
+        self.inner = inner
+        self.cache_dir = Path(cache_dir)
+        if max_mb is None:
+            max_mb = _env_number("CACHE_MAX_MB", DEFAULT_MAX_MB)
+        if max_age_days is None:
+            max_age_days = _env_number("CACHE_MAX_AGE_DAYS", DEFAULT_MAX_AGE_DAYS)
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.max_age = max_age_days * 86400
+        self.last_hit = False
+        # 적중/실패 횟수는 메모리에 모았다가 aclose() 또는 종료 시 한 번만 stats.json에 반영
+        self._pending_stats = {"hits": 0, "misses": 0}
+        atexit.register(self.flush_stats)
+
+    @property
+    def engine_name(self):
+        return type(self.inner).__name__
+
+    @property
+    def model_name(self):
+        return getattr(self.inner, "model_name", None) or getattr(self.inner, "model", "")
+
+    def cache_key(self, text_data, system_prompt=None):
+        h = hashlib.sha256()
+        parts = [self.engine_name, self.model_name, system_prompt or SYSTEM_PROMPT, text_data]
+        # 기본이 아닌 엔드포인트(모의 서버 등)의 응답은 실제 API 응답과 섞이지 않도록 키에 포함
+        base_url = getattr(self.inner, "base_url", None)
+        if base_url:
+            parts.insert(2, base_url)
+        for part in parts:
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def summarize(self, text_data, system_prompt=None):
+        key, cached = self._lookup(text_data, system_prompt)
+        if cached is not None:
+            return cached
+
+        summary = self.inner.summarize(text_data, system_prompt=system_prompt)
+        self._store(key, summary)
+        return summary
+
+    async def asummarize(self, text_data, system_prompt=None):
+        key, cached = self._lookup(text_data, system_prompt)
+        if cached is not None:
+            return cached
+
+        summary = await self.inner.asummarize(text_data, system_prompt=system_prompt)
+        self._store(key, summary)
+        return summary
+
+    async def aclose(self):
+        await self.inner.aclose()
+        self.flush_stats()
+
+    def flush_stats(self):
+        """메모리에 모은 적중/실패 횟수를 stats.json에 더합니다."""
+        with _stats_lock:
+            pending, self._pending_stats = self._pending_stats, {"hits": 0, "misses": 0}
+            if pending["hits"] or pending["misses"]:
+                _add_stats(self.cache_dir, pending)
+
+    def _lookup(self, text_data, system_prompt):
+        key = self.cache_key(text_data, system_prompt)
+        cached = self._get(key)
+        self.last_hit = cached is not None
+        with _stats_lock:
+            self._pending_stats["hits" if self.last_hit else "misses"] += 1
+        return key, cached
+
+    def _store(self, key, summary):
+        # 오류 메시지는 캐시하지 않음 (다음 실행에서 재시도)
+        if summary and not is_error_summary(summary):
+            self._put(key, summary)
+
+    # ── 저장소 ──
+
+    def _path(self, key):
+        return self.cache_dir / f"{key}.json"
+
+    def _get(self, key):
+        path = self._path(key)
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        if self.max_age and time.time() - stat.st_mtime > self.max_age:
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                summary = json.load(f).get("summary")
+        except (json.JSONDecodeError, IOError):
+            return None
+        # LRU: 적중한 항목은 mtime 갱신
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return summary
+
+    def _put(self, key, summary):
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            record = {
+                "engine": self.engine_name,
+                "model": self.model_name,
+                "created_at": int(time.time()),
+                "summary": summary,
+            }
+            tmp_path = self.cache_dir / f"{key}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(record, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+            self._evict()
+        except OSError as e:
+            print(f"⚠️ 요약 캐시 저장 실패: {e}")
+
+    def _evict(self):
+        """만료 항목 삭제 후, 전체 크기가 한도를 넘으면 오래된 것부터 삭제합니다."""
+        now = time.time()
+        entries = []
+        for path in self.cache_dir.glob("*.json"):
+            if path.name == STATS_FILENAME:
+                continue
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if self.max_age and now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+# ── 적중률 통계 ──
+
+def _add_stats(cache_dir, counts):
+    """stats.json에 counts를 더해 원자적으로 교체합니다. (호출자가 _stats_lock을 잡고 있어야 함)"""
+    stats_path = Path(cache_dir) / STATS_FILENAME
+    stats = _load_stats(stats_path)
+    for key in ("hits", "misses"):
+        stats[key] += counts.get(key, 0)
+    try:
+        stats_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = stats_path.with_name(f"{STATS_FILENAME}.{os.getpid()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(stats, f)
+        os.replace(tmp_path, stats_path)
+    except OSError:
+        pass
+
+
+def _load_stats(stats_path):
+    try:
+        with open(stats_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return {"hits": int(data.get("hits", 0)), "misses": int(data.get("misses", 0))}
+    except (json.JSONDecodeError, IOError, ValueError, AttributeError):
+        return {"hits": 0, "misses": 0}
+
+
+def get_cache_summary(cache_dir=CACHE_DIR):
+    """캐시 상태를 문자열로 반환합니다 (--status용)."""
+    if not is_cache_enabled():
+        return "사용 안 함 (SUMMARY_CACHE=false)"
+
+    cache_dir = Path(cache_dir)
+    files = [p for p in cache_dir.glob("*.json") if p.name != STATS_FILENAME] if cache_dir.exists() else []
+    size_mb = sum(p.stat().st_size for p in files) / (1024 * 1024)
+    stats = _load_stats(cache_dir / STATS_FILENAME)
+    lookups = stats["hits"] + stats["misses"]
+    if lookups:
+        rate = f"적중률 {stats['hits'] / lookups:.0%} ({stats['hits']}/{lookups})"
+    else:
+        rate = "조회 기록 없음"
+    return f"{len(files)}개 항목 ({size_mb:.1f}MB), {rate}"
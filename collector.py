@@ -0,0 +1,296 @@
+"""
+Claw-Log Collector
+`git --numstat` 사전 점검으로 바이너리·대용량·생성물 파일을 패치 생성 전에 걸러냅니다.
+- COLLECTOR=log (기본): 제외할 파일을 pathspec으로 넘겨 `git log -p` 실행
+- COLLECTOR=batch: 커밋별로 보낼 파일만 골라 하나의 `git diff-tree --stdin` 프로세스로 패치 생성
+제외 규칙은 .env 또는 프로젝트 루트의 .claw-log.env로 설정합니다. (load_diff_filter 참고)
+"""
+
+import fnmatch
+import os
+import re
+import subprocess
+import threading
+from pathlib import Path
+
+from dotenv import dotenv_values
+
+from claw_log.compact import diff_header_path
+from claw_log.tokens import file_priority
+
+COLLECTORS = ("log", "batch")
+
+# 파일 하나의 변경 줄 수(추가+삭제)가 이보다 많으면 패치 생성 전에 제외 (.env: DIFF_MAX_FILE_LINES)
+DEFAULT_MAX_FILE_LINES = 2000
+# 프로젝트 루트의 설정 파일. .env와 같은 KEY=VALUE 형식이며 전역 .env보다 우선
+PROJECT_CONFIG_FILENAME = ".claw-log.env"
+FILTER_KEYS = ("DIFF_MAX_FILE_LINES", "DIFF_EXCLUDE", "DIFF_SKIP_BINARY", "DIFF_SKIP_GENERATED")
+
+# pathspec이 이보다 많으면 명령줄 길이 제한을 피해 경로 지정 없이 실행 후 출력에서 거름
+MAX_PATHSPECS = 500
+
+_COMMIT_LINE_RE = re.compile(r"^commit ([0-9a-f]{40})")
+
+# numstat 조회용 커밋 구분자 (커밋 메시지에 나올 일이 없는 제어 문자)
+_RECORD_SEP = "\x1e"
+
+
+def get_collector():
+    """현재 수집 방식 (.env의 COLLECTOR, 기본: log)"""
+    collector = os.getenv("COLLECTOR", "log").lower()
+    return collector if collector in COLLECTORS else "log"
+
+
+def _parse_numstat_z(text, renames=None):
+    """
+    `--numstat -z` 출력을 [(경로, 추가 줄 수 또는 None, 삭제 줄 수 또는 None)]로. 바이너리는 None.
+    -z 출력은 경로를 따옴표/8진수로 바꾸지 않으므로(core.quotepath) 한글 등 비ASCII 파일 이름이 그대로 남음.
+    이름 변경은 '추가\t삭제\t\0이전 경로\0새 경로\0' 형식이며 새 경로를 사용.
+    renames: dict를 넘기면 {새 경로: 이전 경로}를 채움
+    """
+    files = []
+    tokens = text.split("\0")
+    i = 0
+    while i < len(tokens):
+        parts = tokens[i].lstrip("\n").split("\t", 2)
+        i += 1
+        if len(parts) != 3:
+            continue
+        added, deleted, path = parts
+        if not path:
+            if i + 1 >= len(tokens):
+                break
+            path = tokens[i + 1]
+            if renames is not None:
+                renames[path] = tokens[i]
+            i += 2
+        files.append((
+            path,
+            int(added) if added.isdigit() else None,
+            int(deleted) if deleted.isdigit() else None,
+        ))
+    return files
+
+
+class DiffFilter:
+    """
+    numstat 결과(경로, 추가, 삭제)만 보고 패치를 만들 가치가 있는지 판단합니다.
+    바이너리, 변경 줄 수가 max_file_lines를 넘는 파일, exclude_globs에 맞는 파일, 생성물/lock/벤더 파일을 제외.
+    """
+
+    def __init__(self, max_file_lines=DEFAULT_MAX_FILE_LINES, exclude_globs=(), skip_binary=True,
+                 skip_generated=True):
+        self.max_file_lines = max_file_lines
+        self.exclude_globs = tuple(exclude_globs)
+        self.skip_binary = skip_binary
+        self.skip_generated = skip_generated
+
+    def __call__(self, path, added, deleted):
+        if added is None or deleted is None:
+            return not self.skip_binary
+        if self.max_file_lines and added + deleted > self.max_file_lines:
+            return False
+        name = path.rsplit("/", 1)[-1]
+        if any(fnmatch.fnmatch(path, g) or fnmatch.fnmatch(name, g) for g in self.exclude_globs):
+            return False
+        return not (self.skip_generated and file_priority(path) == 4)
+
+
+worth_sending = DiffFilter()
+
+
+def _flag(value, default=True):
+    if value is None:
+        return default
+    return value.lower() not in ("0", "false", "no")
+
+
+def load_diff_filter(repo):
+    """
+    전역 .env와 프로젝트 루트의 .claw-log.env(우선)에서 제외 규칙을 읽어 DiffFilter를 만듭니다.
+    DIFF_MAX_FILE_LINES (0이면 제한 없음), DIFF_EXCLUDE (쉼표 구분 glob),
+    DIFF_SKIP_BINARY / DIFF_SKIP_GENERATED (기본 true)
+    """
+    values = {key: os.getenv(key) for key in FILTER_KEYS}
+    config_path = Path(repo) / PROJECT_CONFIG_FILENAME
+    if config_path.exists():
+        values.update({k: v for k, v in dotenv_values(config_path).items() if k in FILTER_KEYS and v is not None})
+
+    try:
+        max_lines = int(values["DIFF_MAX_FILE_LINES"] or DEFAULT_MAX_FILE_LINES)
+    except ValueError:
+        max_lines = DEFAULT_MAX_FILE_LINES
+    globs = [g.strip() for g in (values["DIFF_EXCLUDE"] or "").split(",") if g.strip()]
+    return DiffFilter(max_lines, globs, _flag(values["DIFF_SKIP_BINARY"]), _flag(values["DIFF_SKIP_GENERATED"]))
+
+
+def list_commit_changes(repo, log_range, excludes=(), renames=None):
+    """
+    기간 내 커밋별 변경 파일 목록 (최신순).
+    반환: [(커밋 SHA, [(경로, 추가, 삭제)])]
+    renames: dict를 넘기면 {커밋 SHA: {새 경로: 이전 경로}}를 채움
+    """
+    cmd = ["git", "-C", str(repo), "log", f"--format={_RECORD_SEP}%H", "--numstat", "-z"] + \
+        list(log_range) + ["--", "."] + list(excludes)
+    output = subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode("utf-8", errors="replace")
+    commits = []
+    for record in output.split(_RECORD_SEP)[1:]:
+        sha, _, rest = record.partition("\0")
+        sha = sha.strip()
+        if sha:
+            commit_renames = {}
+            commits.append((sha, _parse_numstat_z(rest, commit_renames)))
+            if renames is not None and commit_renames:
+                renames[sha] = commit_renames
+    return commits
+
+
+def select_changes(changes, select=worth_sending, stats=None):
+    """
+    커밋별로 보낼 파일만 남깁니다.
+    stats가 있으면 제외된 파일을 stats["skipped_files"]에 {경로: (추가, 삭제)}로 기록합니다.
+    반환: {커밋 SHA: 선택된 경로 set} (선택된 파일이 없는 커밋은 제외, 입력 순서 유지)
+    """
+    selected = {}
+    for sha, files in changes:
+        keep = set()
+        for path, added, deleted in files:
+            if select(path, added, deleted):
+                keep.add(path)
+            elif stats is not None:
+                _record_skipped(stats, path, added, deleted)
+        if keep:
+            selected[sha] = keep
+    return selected
+
+
+def stream_commit_patches(repo, selected, excludes=(), max_chars=None, renames=None):
+    """
+    선택된 커밋의 패치를 하나의 `git diff-tree --stdin` 프로세스로 생성합니다.
+    출력 형식은 `git log -p`와 같고(commit/Author/Date/메시지 + diff), 커밋마다 선택된 파일만 포함합니다.
+    renames: list_commit_changes가 채운 {SHA: {새 경로: 이전 경로}}. 이전 경로도 pathspec에 넣어야
+    -M이 이름 변경을 짝지어 파일 전체 추가 대신 변경분만 출력함
+    반환: (text, skipped_bytes, truncated) — main._stream_git_output과 같은 의미
+    """
+    if not selected:
+        return "", 0, False
+
+    paths = set().union(*selected.values())
+    for sha, keep in selected.items():
+        commit_renames = (renames or {}).get(sha, {})
+        paths.update(commit_renames[p] for p in keep if p in commit_renames)
+    cmd = ["git", "-C", str(repo), "diff-tree", "--stdin", "-p", "-r", "-M", "--root",
+           "--pretty=medium", "--"] + _pathspec(paths, excludes)
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    # 커밋이 많으면 stdin 버퍼가 가득 차 교착될 수 있으므로 별도 스레드에서 입력
+    def _feed():
+        try:
+            for sha in selected:
+                proc.stdin.write(f"{sha}\n".encode("ascii"))
+            proc.stdin.close()
+        except (BrokenPipeError, OSError):
+            pass
+
+    writer = threading.Thread(target=_feed, daemon=True)
+    writer.start()
+
+    parts, n_chars, skipped_bytes, truncated = [], 0, 0, False
+    keep_paths, keep_file = set(), True
+    try:
+        for raw in proc.stdout:
+            line = raw.decode("utf-8", errors="replace")
+            m = _COMMIT_LINE_RE.match(line)
+            if m:
+                keep_paths, keep_file = selected.get(m.group(1), set()), True
+            else:
+                header_path = diff_header_path(line)
+                if header_path is not None:
+                    keep_file = header_path in keep_paths
+            if not keep_file:
+                continue
+            if max_chars is not None and n_chars + len(line) > max_chars:
+                keep = max_chars - n_chars
+                parts.append(line[:keep])
+                skipped_bytes = len(line[keep:].encode("utf-8"))
+                truncated = True
+                break
+            parts.append(line)
+            n_chars += len(line)
+    finally:
+        if truncated:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
+        writer.join(timeout=1)
+
+    if not truncated and proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return "".join(parts), skipped_bytes, truncated
+
+
+def _record_skipped(stats, path, added, deleted):
+    skipped = stats.setdefault("skipped_files", {})
+    prev_added, prev_deleted = skipped.get(path, (0, 0))
+    if added is None or prev_added is None:
+        skipped[path] = (None, None)
+    else:
+        skipped[path] = (prev_added + added, prev_deleted + deleted)
+
+
+def excluded_pathspecs(repo, log_range, excludes=(), stats=None, select=worth_sending):
+    """
+    `git log -p` 방식용 numstat 사전 점검. 기간 내 어느 커밋에서도 보낼 가치가 없는 파일의
+    제외 pathspec 목록을 반환합니다. (한 커밋에서만 큰 파일은 다른 커밋의 변경을 위해 남김)
+    """
+    changes = list_commit_changes(repo, log_range, excludes)
+    kept = set().union(*select_changes(changes, select).values()) if changes else set()
+    local_stats = {}
+    for _, files in changes:
+        for path, added, deleted in files:
+            if path not in kept and not select(path, added, deleted):
+                _record_skipped(local_stats, path, added, deleted)
+    skipped = local_stats.get("skipped_files", {})
+    if len(skipped) > MAX_PATHSPECS:
+        return []
+    if stats is not None:
+        for path, counts in skipped.items():
+            stats.setdefault("skipped_files", {})[path] = counts
+    return [f":(exclude,literal){p}" for p in sorted(skipped)]
+
+
+def format_skipped_files(skipped, limit=20):
+    """LLM 입력에 덧붙일 제외 파일 목록 (요약이 변경 사실 자체는 알 수 있도록)."""
+    lines = []
+    for path, (added, deleted) in sorted(skipped.items())[:limit]:
+        lines.append(f"{path} (binary)\n" if added is None else f"{path} (+{added}/-{deleted})\n")
+    if len(skipped) > limit:
+        lines.append(f"... 외 {len(skipped) - limit}개\n")
+    return "".join(lines)
+
+
+def collect_commits(repo, log_range, excludes=(), max_chars=None, stats=None, select=worth_sending):
+    """커밋 기간의 diff를 numstat 선별 → diff-tree 일괄 생성으로 수집합니다. 반환 형식은 stream_commit_patches와 동일."""
+    renames = {}
+    changes = list_commit_changes(repo, log_range, excludes, renames)
+    selected = select_changes(changes, select, stats)
+    return stream_commit_patches(repo, selected, excludes, max_chars, renames)
+
+
+def worktree_pathspec(repo, excludes=(), stats=None, select=worth_sending):
+    """
+    미커밋 변경(`git diff HEAD`) 중 보낼 파일만의 pathspec을 반환합니다.
+    보낼 파일이 없으면 None.
+    """
+    cmd = ["git", "-C", str(repo), "diff", "HEAD", "--numstat", "-z", "--", "."] + list(excludes)
+    output = subprocess.check_output(cmd, stderr=subprocess.DEVNULL).decode("utf-8", errors="replace")
+    selected = select_changes([("worktree", _parse_numstat_z(output))], select, stats)
+    paths = selected.get("worktree")
+    return _pathspec(paths, excludes) if paths else None
+
+
+def _pathspec(paths, excludes):
+    """선택된 경로들의 pathspec (파일 이름의 *, ? 등은 문자 그대로). 너무 많으면 제외 패턴만 사용."""
+    if len(paths) > MAX_PATHSPECS:
+        return ["."] + list(excludes)
+    return [f":(literal){p}" for p in sorted(paths)]
@@ -0,0 +1,283 @@
+"""
+Claw-Log Diff Compaction
+git diff/log -p 출력을 hunk 단위로 해석해 요약에 도움이 되지 않는 부분을 줄입니다.
+- 공백만 바뀐 hunk, 다른 곳으로 옮겨진 코드 hunk 제거
+- index/---/+++ 줄, 이름만 바뀐 파일, 모드 변경 정리
+- 긴 문맥(context) 줄 접기, 큰 삭제는 줄 수로 요약
+"""
+
+import os
+import re
+from collections import Counter
+
+# 연속 문맥 줄이 이보다 길면 앞뒤 한 줄씩만 남김
+MAX_CONTEXT_RUN = 2
+# 연속 삭제 줄이 이보다 길면 줄 수로 요약
+MAX_DELETION_RUN = 12
+# 이동 코드 판별: 변경 줄이 이 이상인 hunk만 대상 (짧은 hunk는 우연히 겹치기 쉬움)
+MIN_MOVED_LINES = 3
+
+_HUNK_HEADER_RE = re.compile(r"^@@ -\d+(?:,\d+)? \+\d+(?:,\d+)? @@ ?(.*)$")
+# 'diff --git a/x b/x' 또는 특수/비ASCII 문자가 있으면 '"a/\355..." "b/\355..."' (core.quotepath)
+_FILE_HEADER_RE = re.compile(r'^diff --git (?:"a/(?:[^"\\]|\\.)*"|a/.+?) (?:"b/((?:[^"\\]|\\.)*)"|b/(.+))$')
+_C_ESCAPES = {"a": 7, "b": 8, "t": 9, "n": 10, "v": 11, "f": 12, "r": 13, '"': 34, "\\": 92}
+_SIGNATURE_RE = re.compile(
+    r"^\s*(?:export\s+)?(?:async\s+)?(?:def|class|function|func|fn|interface|type|struct|enum|impl|public|private|protected)\b"
+)
+_TRIVIAL_RE = re.compile(r"^\s*(?:#|//|/\*|\*|import\b|from\b.+\bimport\b|using\b|require\b|[{}()\[\];,]*$)")
+
+# 파일 헤더 중 요약에 필요 없는 줄
+_DROP_META_PREFIXES = ("index ", "--- ", "+++ ", "similarity index", "dissimilarity index", "old mode", "new mode")
+
+
+def is_compaction_enabled():
+    """DIFF_COMPACT=false 로 끌 수 있습니다. (기본: 사용)"""
+    return os.getenv("DIFF_COMPACT", "true").lower() not in ("0", "false", "no")
+
+
+def _unquote_path(quoted):
+    """git의 C 형식 따옴표 경로('\\355\\225\\234', '\\t' 등)를 원래 문자열로."""
+    out = bytearray()
+    i = 0
+    while i < len(quoted):
+        ch = quoted[i]
+        if ch == "\\" and i + 1 < len(quoted):
+            octal = quoted[i + 1:i + 4]
+            if len(octal) == 3 and all(c in "01234567" for c in octal):
+                out.append(int(octal, 8) & 0xFF)
+                i += 4
+                continue
+            if quoted[i + 1] in _C_ESCAPES:
+                out.append(_C_ESCAPES[quoted[i + 1]])
+                i += 2
+                continue
+        out += ch.encode("utf-8")
+        i += 1
+    return out.decode("utf-8", errors="replace")
+
+
+def diff_header_path(line):
+    """'diff --git' 줄이면 새 파일 경로(따옴표 표기는 풀어서), 아니면 None."""
+    if not line.startswith("diff --git "):
+        return None
+    m = _FILE_HEADER_RE.match(line.rstrip("\n"))
+    if not m:
+        return None
+    return _unquote_path(m.group(1)) if m.group(1) is not None else m.group(2)
+
+
+def _normalize(line):
+    """들여쓰기/공백 폭 차이를 무시한 비교용 문자열. 연속 공백은 한 칸으로 (공백이 있고 없음은 구분)."""
+    return " ".join(line.split())
+
+
+class Hunk:
+    """'@@' 헤더 하나와 그 아래 줄들. lines는 접두어(' ', '+', '-', '\\')를 포함한 원문."""
+
+    def __init__(self, header, lines):
+        self.header = header
+        self.lines = lines
+
+    @property
+    def added(self):
+        return [l[1:] for l in self.lines if l.startswith("+")]
+
+    @property
+    def removed(self):
+        return [l[1:] for l in self.lines if l.startswith("-")]
+
+    def is_whitespace_only(self):
+        """공백/빈 줄만 바뀐 hunk인지 판별. 줄 순서가 바뀐 것은 실제 변경으로 봄."""
+        added = [n for n in map(_normalize, self.added) if n]
+        removed = [n for n in map(_normalize, self.removed) if n]
+        return added == removed
+
+    def score(self):
+        """요약에 중요한 정도의 추정치. 추가된 줄, 정의(def/class 등) 변경에 가중치."""
+        score = 0.0
+        for line in self.added:
+            if not line.strip():
+                continue
+            if _SIGNATURE_RE.match(line):
+                score += 4
+            elif _TRIVIAL_RE.match(line):
+                score += 0.3
+            else:
+                score += 1
+        for line in self.removed:
+            if line.strip():
+                score += 2 if _SIGNATURE_RE.match(line) else 0.3
+        return score
+
+    def render(self):
+        """문맥 줄을 접고 긴 삭제 구간을 요약한 hunk 텍스트."""
+        m = _HUNK_HEADER_RE.match(self.header.rstrip("\n"))
+        # 줄 번호는 요약에 쓰이지 않으므로 함수 문맥만 남김
+        out = [f"@@ {m.group(1)}\n" if m and m.group(1) else "@@\n"] if m else [self.header]
+        i, lines = 0, self.lines
+        while i < len(lines):
+            prefix = lines[i][:1]
+            j = i
+            while j < len(lines) and lines[j][:1] == prefix:
+                j += 1
+            run = lines[i:j]
+            if prefix == " " and len(run) > MAX_CONTEXT_RUN:
+                # 맨 앞/뒤 문맥은 바깥쪽을, 중간 문맥은 양 끝 한 줄씩 남김
+                if i == 0:
+                    run = run[-1:]
+                elif j == len(lines):
+                    run = run[:1]
+                else:
+                    run = [run[0], " ⋯\n", run[-1]]
+            elif prefix == "-" and len(run) > MAX_DELETION_RUN:
+                run = [run[0], f"-⋯ (삭제 {len(run)}줄)\n"]
+            out.extend(run)
+            i = j
+        return "".join(out)
+
+
+class FileDiff:
+    """'diff --git' 헤더로 시작하는 파일 하나의 diff."""
+
+    def __init__(self, header, meta, hunks, body=""):
+        self.header = header
+        self.meta = meta
+        self.hunks = hunks
+        # hunk가 아닌 내용 (바이너리 안내 등)
+        self.body = body
+
+    @property
+    def path(self):
+        return diff_header_path(self.header) or ""
+
+    def render(self, hunks=None, notes=()):
+        meta = []
+        rename_from = rename_to = None
+        for line in self.meta:
+            if line.startswith("rename from "):
+                rename_from = line[12:].strip()
+            elif line.startswith("rename to "):
+                rename_to = line[10:].strip()
+            elif line.startswith("copy from ") or line.startswith("copy to "):
+                continue
+            elif not line.startswith(_DROP_META_PREFIXES):
+                meta.append(line)
+        if rename_from and rename_to:
+            meta.append(f"rename: {rename_from} → {rename_to}\n")
+
+        hunks = self.hunks if hunks is None else hunks
+        if any(l.startswith("deleted file mode") for l in self.meta):
+            # 삭제된 파일은 내용 대신 줄 수만
+            removed = sum(len(h.removed) for h in self.hunks)
+            return self.header + f"삭제된 파일 ({removed}줄)\n"
+        return self.header + "".join(meta) + self.body + "".join(h.render() for h in hunks) + "".join(notes)
+
+
+def parse_diff(text):
+    """
+    diff 텍스트를 [str 또는 FileDiff] 조각 목록으로 해석합니다.
+    파일 diff가 아닌 부분(커밋 헤더/메시지, '=== [...] ===' 구분선)은 문자열 그대로 둡니다.
+    """
+    parts = []
+    current = None
+    hunk = None
+    for line in text.splitlines(keepends=True):
+        if diff_header_path(line) is not None:
+            current = FileDiff(line, [], [])
+            parts.append(current)
+            hunk = None
+            continue
+        if current is None:
+            parts.append(line)
+            continue
+        if line.startswith("@@"):
+            hunk = Hunk(line, [])
+            current.hunks.append(hunk)
+        elif hunk is not None and line[:1] in (" ", "+", "-", "\\"):
+            hunk.lines.append(line)
+        elif hunk is None and not line.startswith(("commit ", "=== [")) and line.strip():
+            if line.startswith("Binary files"):
+                current.body += line
+            else:
+                current.meta.append(line)
+        else:
+            # 파일 diff가 끝나고 다음 커밋 헤더 등이 시작됨
+            current, hunk = None, None
+            parts.append(line)
+    return parts
+
+
+def compact_diff(text):
+    """
+    diff를 압축합니다.
+    반환: (압축된 텍스트, 통계 {"whitespace_hunks", "moved_hunks", "files"})
+    """
+    parts = parse_diff(text)
+    files = [p for p in parts if isinstance(p, FileDiff)]
+    stats = {"whitespace_hunks": 0, "moved_hunks": 0, "files": len(files)}
+
+    # 이동 코드 판별용: 전체 diff에서 추가/삭제된 줄 (공백 무시)
+    all_added, all_removed = Counter(), Counter()
+    for f in files:
+        for h in f.hunks:
+            all_added.update(n for n in map(_normalize, h.added) if n)
+            all_removed.update(n for n in map(_normalize, h.removed) if n)
+
+    out = []
+    for part in parts:
+        if not isinstance(part, FileDiff):
+            out.append(part)
+            continue
+        kept, moved_lines = [], 0
+        for h in part.hunks:
+            if h.is_whitespace_only():
+                stats["whitespace_hunks"] += 1
+                continue
+            if _is_moved(h, all_added, all_removed):
+                stats["moved_hunks"] += 1
+                moved_lines += len(h.added) + len(h.removed)
+                continue
+            kept.append(h)
+        notes = [f"(이동된 코드 {moved_lines}줄 생략)\n"] if moved_lines else []
+        if part.hunks and not kept and not notes:
+            # 공백 변경만 있는 파일은 통째로 생략
+            continue
+        out.append(part.render(kept, notes))
+    return "".join(out), stats
+
+
+def _is_moved(hunk, all_added, all_removed):
+    """hunk의 변경 줄이 모두 다른 hunk에서 반대로(삭제↔추가) 나타나면 이동된 코드로 봅니다."""
+    added = Counter(n for n in map(_normalize, hunk.added) if n)
+    removed = Counter(n for n in map(_normalize, hunk.removed) if n)
+    if sum(added.values()) + sum(removed.values()) < MIN_MOVED_LINES:
+        return False
+    # 자기 자신의 변경은 빼고 비교 (같은 hunk 안의 수정은 이동이 아님)
+    # 전체 Counter를 복사하지 않도록 이 hunk의 줄만 조회
+    return all(all_removed[n] - removed[n] >= c for n, c in added.items()) and \
+        all(all_added[n] - added[n] >= c for n, c in removed.items())
+
+
+def select_hunks(section, budget, count_tokens):
+    """
+    파일 하나의 diff에서 중요도(score)가 높은 hunk부터 budget 토큰 이내로 고릅니다.
+    고른 hunk는 원래 순서대로 이어 붙입니다. 해석할 수 없는 형식이면 None.
+    """
+    parts = parse_diff(section)
+    files = [p for p in parts if isinstance(p, FileDiff)]
+    if len(files) != 1 or not files[0].hunks:
+        return None
+    f = files[0]
+    base = count_tokens(f.render([]))
+    ranked = sorted(range(len(f.hunks)), key=lambda i: -f.hunks[i].score())
+    chosen, used = set(), base
+    for i in ranked:
+        cost = count_tokens(f.hunks[i].render())
+        if used + cost <= budget:
+            chosen.add(i)
+            used += cost
+    if not chosen:
+        return None
+    skipped = len(f.hunks) - len(chosen)
+    notes = [f"(덜 중요한 변경 {skipped}곳 생략)\n"] if skipped else []
+    return f.render([h for i, h in enumerate(f.hunks) if i in chosen], notes)
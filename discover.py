@@ -0,0 +1,195 @@
+"""
+Claw-Log Repository Discovery
+입력 경로(INPUT_PATHS) 아래의 Git 저장소를 찾습니다.
+- os.scandir 기반, 최상위 하위 디렉토리별로 스레드 풀에서 병렬 탐색
+- node_modules, __pycache__ 같은 의존성/캐시 디렉토리는 건너뜀 (.env: DISCOVER_SKIP_DIRS로 추가)
+  제외 목록에 있어도 그 디렉토리 자체가 저장소(.git 포함)이면 찾아냄
+- 디렉토리 mtime 기준 탐색 캐시: mtime이 그대로인 디렉토리는 다시 읽지 않고 기록된 하위 목록을 사용
+"""
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+DEFAULT_MAX_DEPTH = 3
+DEFAULT_DISCOVER_JOBS = 8
+
+# 저장소가 있을 리 없는 의존성/캐시 디렉토리 (숨김 디렉토리는 항상 제외).
+# build, bin, env처럼 프로젝트 이름으로도 쓰이는 이름은 넣지 않음 — 필요하면 DISCOVER_SKIP_DIRS로 추가
+SKIP_DIRS = frozenset(("node_modules", "bower_components", "site-packages", "__pycache__"))
+
+DISCOVER_CACHE_PATH = Path.home() / ".claw-log" / "discover.json"
+DISCOVER_CACHE_VERSION = 2
+# 방금 바뀐 디렉토리는 같은 mtime으로 한 번 더 바뀔 수 있으므로 캐시를 믿지 않음 (초)
+MTIME_GRACE_SECONDS = 2.0
+
+_cache_lock = threading.Lock()
+
+
+def is_discover_cache_enabled():
+    """DISCOVER_CACHE=false 로 끌 수 있습니다. (기본: 사용)"""
+    return os.getenv("DISCOVER_CACHE", "true").lower() not in ("0", "false", "no")
+
+
+def get_skip_dirs():
+    """기본 제외 목록 + .env의 DISCOVER_SKIP_DIRS (쉼표 구분)"""
+    extra = {d.strip() for d in os.getenv("DISCOVER_SKIP_DIRS", "").split(",") if d.strip()}
+    return SKIP_DIRS | extra
+
+
+def _discover_jobs():
+    try:
+        return max(1, int(os.getenv("DISCOVER_JOBS", DEFAULT_DISCOVER_JOBS)))
+    except ValueError:
+        return DEFAULT_DISCOVER_JOBS
+
+
+def load_discover_cache(cache_path=DISCOVER_CACHE_PATH, skip_dirs=None):
+    """
+    {기준 경로: {디렉토리 경로: [mtime_ns, 저장소 여부, 하위 디렉토리 이름 목록]}}
+    제외 목록(skip_dirs)이 캐시를 만들 때와 다르면 하위 목록을 믿을 수 없으므로 빈 캐시.
+    """
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != DISCOVER_CACHE_VERSION:
+        return {}
+    if skip_dirs is not None and data.get("skip_dirs") != sorted(skip_dirs):
+        return {}
+    roots = data.get("roots")
+    return roots if isinstance(roots, dict) else {}
+
+
+def save_discover_cache(roots, cache_path=DISCOVER_CACHE_PATH, skip_dirs=None):
+    cache_path = Path(cache_path)
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": DISCOVER_CACHE_VERSION, "skip_dirs": sorted(skip_dirs or ()), "roots": roots},
+                      f, ensure_ascii=False)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"⚠️ 저장소 탐색 캐시 저장 실패: {e}")
+
+
+def _read_dir(path, skip_dirs):
+    """디렉토리 하나를 읽어 (저장소 여부, 내려갈 하위 디렉토리 이름 목록)을 반환합니다."""
+    is_repo = False
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            name = entry.name
+            if name == ".git":
+                # 워크트리/서브모듈은 .git이 파일
+                is_repo = True
+            elif name.startswith("."):
+                continue
+            elif name in skip_dirs and not os.path.exists(os.path.join(entry.path, ".git")):
+                continue
+            else:
+                try:
+                    if entry.is_dir():
+                        subdirs.append(name)
+                except OSError:
+                    continue
+    subdirs.sort()
+    return is_repo, subdirs
+
+
+def _walk(path, depth, max_depth, skip_dirs, cached, visited, repos, stats):
+    """
+    path(depth 단계)를 방문합니다. 저장소면 repos에 추가하고, 아니면 max_depth까지 하위로 내려갑니다.
+    cached/visited: {경로: [mtime_ns, 저장소 여부, 하위 목록]} (이전 캐시 / 이번 탐색 결과)
+    """
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return
+    entry = cached.get(path)
+    if entry and entry[0] == mtime:
+        is_repo, subdirs = entry[1], entry[2]
+        stats["cached"] += 1
+    else:
+        try:
+            is_repo, subdirs = _read_dir(path, skip_dirs)
+        except OSError:
+            return
+        stats["scanned"] += 1
+        if time.time() - mtime / 1e9 < MTIME_GRACE_SECONDS:
+            mtime = None
+    visited[path] = [mtime, is_repo, subdirs]
+
+    if is_repo:
+        repos.append(path)
+        return
+    if depth >= max_depth:
+        return
+    for name in subdirs:
+        _walk(os.path.join(path, name), depth + 1, max_depth, skip_dirs, cached, visited, repos, stats)
+
+
+def discover_git_repos(base_path_str, max_depth=DEFAULT_MAX_DEPTH, jobs=None, stats=None, cache_path=DISCOVER_CACHE_PATH):
+    """
+    주어진 경로에서 Git 저장소를 재귀 탐색합니다.
+    반환: [(repo_path, is_direct)] 리스트
+    - is_direct=True: 입력 경로 자체가 git repo
+    - is_direct=False: 하위에서 재귀 발견
+    stats: dict를 넘기면 {"scanned": 새로 읽은 디렉토리 수, "cached": 캐시로 건너뛴 수}를 채움
+    """
+    base = Path(base_path_str).expanduser().resolve()
+    if stats is None:
+        stats = {}
+    stats.setdefault("scanned", 0)
+    stats.setdefault("cached", 0)
+
+    if not base.exists():
+        print(f"⚠️  경로를 찾을 수 없습니다: {base}")
+        return []
+
+    # 자기 자신이 git repo인 경우 → 직접 지정
+    if (base / ".git").exists():
+        return [(base, True)]
+
+    use_cache = is_discover_cache_enabled()
+    skip_dirs = get_skip_dirs()
+    with _cache_lock:
+        roots = load_discover_cache(cache_path, skip_dirs) if use_cache else {}
+    cached = roots.get(str(base), {})
+
+    # 기준 경로 바로 아래 디렉토리 목록은 항상 새로 읽음 (병렬 작업 분배용)
+    try:
+        _, top_dirs = _read_dir(str(base), skip_dirs)
+    except OSError:
+        return []
+    stats["scanned"] += 1
+
+    def _walk_subtree(name):
+        visited, repos = {}, []
+        local_stats = {"scanned": 0, "cached": 0}
+        _walk(os.path.join(str(base), name), 1, max_depth, skip_dirs, cached, visited, repos, local_stats)
+        return visited, repos, local_stats
+
+    # 결과는 이름순으로 모음 (작업 완료 순서와 무관하게 항상 같은 순서)
+    visited_all, repos = {}, []
+    jobs = jobs or _discover_jobs()
+    with ThreadPoolExecutor(max_workers=max(1, min(jobs, len(top_dirs) or 1))) as pool:
+        for visited, found, local_stats in pool.map(_walk_subtree, top_dirs):
+            visited_all.update(visited)
+            repos.extend(found)
+            stats["scanned"] += local_stats["scanned"]
+            stats["cached"] += local_stats["cached"]
+
+    if use_cache and visited_all != cached:
+        # 이번에 방문한 디렉토리만 남겨 삭제/이동된 경로는 캐시에서 정리
+        with _cache_lock:
+            roots = load_discover_cache(cache_path, skip_dirs)
+            roots[str(base)] = visited_all
+            save_discover_cache(roots, cache_path, skip_dirs)
+
+    return [(Path(p), False) for p in repos]
@@ -1,16 +1,29 @@
 from abc import ABC, abstractmethod
-from openai import OpenAI
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import json
 import os
+import re
 import sys
+import time
 
-try:
-    import google.genai as genai
-except ImportError:
-    print("❌ [Import Error] 필수 라이브러리 로드 실패.")
-    print("   'google-generativeai'와 'google-genai' 간의 충돌일 수 있습니다.")
-    print("   👉 아래 명령어로 의존성을 재설치해주세요:")
-    print("      pipx install claw-log --force")
-    sys.exit(1)
+from claw_log.tokens import count_tokens
+from claw_log.ratelimit import get_limiter, max_retries, is_retryable, retry_after, backoff_delay, error_status
+
+# SDK(google.genai, openai, httpx)는 import 비용이 커서(수백 ms) 해당 엔진을 만들 때 불러옵니다.
+# --log, --status 같은 조회 명령은 SDK를 전혀 불러오지 않습니다.
+
+
+def _import_genai():
+    try:
+        import google.genai as genai
+    except ImportError:
+        print("❌ [Import Error] 필수 라이브러리 로드 실패.")
+        print("   'google-generativeai'와 'google-genai' 간의 충돌일 수 있습니다.")
+        print("   👉 아래 명령어로 의존성을 재설치해주세요:")
+        print("      pipx install claw-log --force")
+        sys.exit(1)
+    return genai
 
 # --- 프롬프트 정의 ---
 SYSTEM_PROMPT = """
@@ -41,152 +54,461 @@ SYSTEM_PROMPT = """
 ---
 """
 
+# 요약 실패 시 summarize()가 반환하는 안내 메시지의 머리말
+ERROR_PREFIXES = ("❌", "🌐", "⚠️")
+
+
+def is_error_summary(text):
+    """summarize() 반환값이 오류 안내 메시지인지 판별합니다."""
+    return not text or text.lstrip().startswith(ERROR_PREFIXES)
+
+
+# Map 단계: 프로젝트(또는 diff 조각) 하나를 최종 리포트의 재료가 될 중간 요약으로 압축
+MAP_PROMPT = """
+당신은 수석 테크니컬 라이터입니다.
+아래는 하나의 프로젝트(또는 그 일부 조각)에 대한 Git 데이터입니다.
+이후 여러 프로젝트의 중간 요약을 합쳐 최종 리포트를 작성할 예정이므로, 그 재료가 될 **중간 요약**을 작성하세요.
+
+[작성 원칙]
+1. 모든 설명은 한국어로 작성하고, 기술 용어(API, 라이브러리, 클래스명 등)는 원어를 유지하세요.
+2. 구체적인 파일명, 함수명, 라이브러리, 디자인 패턴을 빠짐없이 남기세요.
+3. 커밋된 내용과 미커밋 내용을 구분하지 말고 '기능 단위'로 정리하세요.
+4. 꾸밈말 없이 사실 위주의 불릿 목록으로, 1,000자 이내로 작성하세요.
+"""
+
+# Reduce 단계: 프로젝트별 중간 요약을 SYSTEM_PROMPT 형식의 최종 리포트로 병합
+REDUCE_PROMPT = SYSTEM_PROMPT + """
+[입력 데이터 안내]
+아래 데이터는 원본 diff가 아니라, 프로젝트(또는 diff 조각)별로 먼저 작성된 **중간 요약**입니다.
+같은 프로젝트의 여러 조각은 하나로 합쳐 위 [출력 형식]에 맞춘 최종 리포트로 작성하세요.
+"""
+
+PROJECT_HEADER_RE = re.compile(r"^--- PROJECT: (.+) ---$", re.MULTILINE)
+
+
+# 현재 요약 호출의 측정값. asyncio 태스크/스레드마다 따로 유지되어 동시 호출끼리 섞이지 않음
+_current_call = contextvars.ContextVar("claw_log_current_call", default=None)
+
+
+def mark_first_token():
+    """스트리밍 엔진이 첫 텍스트 조각을 받았을 때 호출합니다. (time-to-first-token 기록)"""
+    call = _current_call.get()
+    if call is not None and "ttft_ms" not in call:
+        call["ttft_ms"] = round((time.perf_counter() - call["attempt_started"]) * 1000, 1)
+
+
+def estimate_tokens(text):
+    """대략적인 토큰 수 추정 (한글/코드 비율을 반영한 근사값, tokens.count_tokens)."""
+    return count_tokens(text)
+
+
 class BaseSummarizer(ABC):
     @abstractmethod
-    def summarize(self, text_data):
+    def summarize(self, text_data, system_prompt=None):
+        """text_data를 요약합니다. system_prompt가 None이면 SYSTEM_PROMPT를 사용."""
+        pass
+
+    async def asummarize(self, text_data, system_prompt=None):
+        """summarize()의 비동기 버전. 기본 구현은 스레드 풀에서 summarize()를 실행합니다."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.summarize(text_data, system_prompt=system_prompt))
+
+    async def aclose(self):
+        """asummarize()가 사용한 비동기 클라이언트(연결 풀)를 닫습니다."""
         pass
 
-class GeminiSummarizer(BaseSummarizer):
-    def __init__(self, api_key):
-        self.client = genai.Client(api_key=api_key)
-        self.model_name = 'gemini-2.5-flash' # 최신 모델 사용
 
+def run_summaries(summarizer, payloads, system_prompt=None):
+    """
+    여러 payload를 하나의 이벤트 루프에서 동시에 요약합니다.
+    같은 연결 풀(keep-alive)을 공유하므로 요청마다 TLS 연결을 새로 맺지 않습니다.
+    반환: 입력 순서대로의 요약 목록
+    """
+    import asyncio
 
-    def summarize(self, text_data):
+    async def _run():
         try:
-            response = self.client.models.generate_content(
-                model=self.model_name,
-                contents=f"{SYSTEM_PROMPT}\n\n[전체 개발 내역 데이터]\n{text_data}"
+            return await asyncio.gather(
+                *(summarizer.asummarize(p, system_prompt=system_prompt) for p in payloads)
             )
-            return response.text
-        except Exception as e:
-            error_msg = str(e)
-            if "400" in error_msg or "API_KEY_INVALID" in error_msg:
-                return (
-                    "❌ [API Key Error] 유효하지 않은 API 키입니다.\n"
-                    "   👉 'claw-log --reset' 명령어로 키를 다시 설정하거나,\n"
-                    "      Google AI Studio(https://aistudio.google.com/app/apikey)에서 키 상태를 확인해주세요."
-                )
-            elif "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
-                return (
-                    "🌐 [Quota Error] API 사용량이 초과되었습니다.\n"
-                    "   👉 잠시 후 다시 시도하거나, 할당량을 확인해주세요."
-                )
-            elif "404" in error_msg:
-                return (
-                     "⚠️ [Model Error] 모델을 찾을 수 없습니다.\n"
-                     "   👉 지원되지 않는 리전이거나 모델명이 변경되었을 수 있습니다."
-                )
-            else:
-                return f"❌ [Unknown Error] Gemini 요약 실패:\n   {error_msg}\n   👉 네트워크 연결을 확인해주세요."
+        finally:
+            await summarizer.aclose()
+
+    return list(asyncio.run(_run()))
+
+
+class LLMSummarizer(BaseSummarizer):
+    """
+    실제 LLM API를 호출하는 Summarizer의 공통 부분.
+    하위 클래스는 _request/_arequest(실패 시 예외 발생)와 _format_error만 구현하고,
+    엔진/모델별 호출 속도 제한과 429 등 일시적인 오류의 재시도는 여기서 처리합니다.
+    """
 
-class OpenAISummarizer(BaseSummarizer):
-    def __init__(self, api_key):
-        self.client = OpenAI(api_key=api_key)
-        self.model_name = "gpt-4o-mini"
+    # (분당 요청 수, 분당 토큰 수) 기본값. 0이면 제한 없음, .env의 RATE_LIMIT_RPM/TPM으로 변경
+    RATE_LIMITS = (0, 0)
+
+    @property
+    def limiter(self):
+        rpm, tpm = self.RATE_LIMITS
+        model = getattr(self, "model_name", None) or getattr(self, "model", "")
+        return get_limiter(type(self).__name__, model, rpm, tpm)
+
+    @property
+    def calls(self):
+        """이 인스턴스의 요약 호출별 측정값 목록 (실행 기록용, metrics 참고)"""
+        if "_calls" not in self.__dict__:
+            self._calls = []
+        return self._calls
+
+    def summarize(self, text_data, system_prompt=None):
+        system_prompt = system_prompt or SYSTEM_PROMPT
+        tokens = estimate_tokens(system_prompt) + estimate_tokens(text_data)
+        call, context_token = self._begin_call(tokens)
+        result = None
+        try:
+            attempt = 0
+            while True:
+                waited = time.perf_counter()
+                self.limiter.acquire(tokens)
+                call["wait_ms"] += (time.perf_counter() - waited) * 1000
+                self._begin_attempt(call)
+                try:
+                    result = self._request(text_data, system_prompt)
+                    return result
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt)
+                    if delay is None:
+                        result = self._format_error(e)
+                        return result
+                call["wait_ms"] += delay * 1000
+                time.sleep(delay)
+                attempt += 1
+        finally:
+            self._end_call(call, context_token, result)
 
-    def summarize(self, text_data):
+    async def asummarize(self, text_data, system_prompt=None):
+        import asyncio
+        system_prompt = system_prompt or SYSTEM_PROMPT
+        tokens = estimate_tokens(system_prompt) + estimate_tokens(text_data)
+        call, context_token = self._begin_call(tokens)
+        result = None
         try:
-            response = self.client.chat.completions.create(
-                model=self.model_name,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": f"[전체 개발 내역 데이터]\n{text_data}"}
-                ],
-                temperature=0.7
+            attempt = 0
+            while True:
+                waited = time.perf_counter()
+                await self.limiter.aacquire(tokens)
+                call["wait_ms"] += (time.perf_counter() - waited) * 1000
+                self._begin_attempt(call)
+                try:
+                    result = await self._arequest(text_data, system_prompt)
+                    return result
+                except Exception as e:
+                    delay = self._retry_delay(e, attempt)
+                    if delay is None:
+                        result = self._format_error(e)
+                        return result
+                call["wait_ms"] += delay * 1000
+                await asyncio.sleep(delay)
+                attempt += 1
+        finally:
+            self._end_call(call, context_token, result)
+
+    # ── 호출 측정 (대기 시간 = 속도 제한 + 재시도 백오프) ──
+
+    def _begin_call(self, tokens):
+        call = {"input_tokens": tokens, "attempts": 0, "wait_ms": 0.0, "started": time.perf_counter()}
+        return call, _current_call.set(call)
+
+    @staticmethod
+    def _begin_attempt(call):
+        call["attempts"] += 1
+        call["attempt_started"] = time.perf_counter()
+        call.pop("ttft_ms", None)
+
+    def _end_call(self, call, context_token, result):
+        _current_call.reset(context_token)
+        now = time.perf_counter()
+        call["latency_ms"] = round((now - call.pop("started")) * 1000, 1)
+        started = call.pop("attempt_started", None)
+        if started is not None:
+            call["request_ms"] = round((now - started) * 1000, 1)
+        call["wait_ms"] = round(call["wait_ms"], 1)
+        call["ok"] = bool(result) and not is_error_summary(result)
+        self.calls.append(call)
+
+    def _retry_delay(self, exc, attempt):
+        """재시도할 오류면 대기 시간(초), 아니면 None. Retry-After는 같은 엔진/모델 전체에 적용."""
+        limit = max_retries()
+        if attempt >= limit or not is_retryable(exc):
+            return None
+        server_delay = retry_after(exc)
+        if server_delay is not None:
+            self.limiter.pause(server_delay)
+        delay = backoff_delay(attempt, server_delay)
+        reason = error_status(exc) or type(exc).__name__
+        print(f"  ⏳ 일시적인 API 오류({reason}) — {delay:.1f}초 후 재시도합니다. ({attempt + 1}/{limit})")
+        return delay
+
+    @abstractmethod
+    def _request(self, text_data, system_prompt):
+        """API를 한 번 호출해 요약 텍스트를 반환합니다. 실패 시 예외를 그대로 발생."""
+        pass
+
+    async def _arequest(self, text_data, system_prompt):
+        """_request()의 비동기 버전. 기본 구현은 스레드 풀에서 _request()를 실행합니다."""
+        import asyncio
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self._request(text_data, system_prompt))
+
+    @abstractmethod
+    def _format_error(self, e):
+        """재시도 후에도 실패한 예외를 사용자 안내 메시지로 변환합니다."""
+        pass
+
+
+class GeminiSummarizer(LLMSummarizer):
+    DEFAULT_MODEL = "gemini-2.5-flash"
+    # 무료 티어 gemini-2.5-flash 기준
+    RATE_LIMITS = (10, 250000)
+
+    def __init__(self, api_key, base_url=None):
+        self.api_key = api_key
+        # 모의 서버(mockllm) 등 다른 엔드포인트 사용 시 (.env: GEMINI_BASE_URL)
+        self.base_url = base_url or os.getenv("GEMINI_BASE_URL") or None
+        self.client = self._new_client()
+        self.model_name = self.DEFAULT_MODEL # 최신 모델 사용
+        self._async_client = None
+
+    def _new_client(self):
+        options = {"http_options": {"base_url": self.base_url}} if self.base_url else {}
+        return _import_genai().Client(api_key=self.api_key, **options)
+
+    def _contents(self, text_data, system_prompt):
+        return f"{system_prompt}\n\n[전체 개발 내역 데이터]\n{text_data}"
+
+    def _request(self, text_data, system_prompt):
+        response = self.client.models.generate_content(
+            model=self.model_name,
+            contents=self._contents(text_data, system_prompt)
+        )
+        return response.text
+
+    async def _arequest(self, text_data, system_prompt):
+        # 비동기 클라이언트는 이벤트 루프에 묶이므로 루프마다 따로 만들고 aclose()에서 정리
+        if self._async_client is None:
+            self._async_client = self._new_client()
+        response = await self._async_client.aio.models.generate_content(
+            model=self.model_name,
+            contents=self._contents(text_data, system_prompt)
+        )
+        return response.text
+
+    async def aclose(self):
+        client, self._async_client = self._async_client, None
+        if client is not None and hasattr(client.aio, "aclose"):
+            await client.aio.aclose()
+
+    def _format_error(self, e):
+        error_msg = str(e)
+        if "400" in error_msg or "API_KEY_INVALID" in error_msg:
+            return (
+                "❌ [API Key Error] 유효하지 않은 API 키입니다.\n"
+                "   👉 'claw-log --reset' 명령어로 키를 다시 설정하거나,\n"
+                "      Google AI Studio(https://aistudio.google.com/app/apikey)에서 키 상태를 확인해주세요."
             )
-            return response.choices[0].message.content
-        except Exception as e:
-            error_msg = str(e)
-            if "AuthenticationError" in error_msg or "401" in error_msg:
-                return (
-                    "❌ [API Key Error] 유효하지 않은 API 키입니다.\n"
-                    "   👉 'claw-log --reset' 명령어로 키를 다시 설정하거나,\n"
-                    "      OpenAI Platform(https://platform.openai.com/api-keys)에서 키를 확인해주세요."
-                )
-            elif "RateLimitError" in error_msg or "429" in error_msg:
-                return (
-                    "🌐 [Quota Error] API 사용량이 초과되었거나 너무 많은 요청이 발생했습니다.\n"
-                    "   👉 잠시 후 다시 시도하거나, 크레딧 잔액을 확인해주세요."
-                )
-            else:
-                 return f"❌ [Unknown Error] OpenAI 요약 실패:\n   {error_msg}\n   👉 네트워크 상태를 확인해주세요."
+        elif "429" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
+            return (
+                "🌐 [Quota Error] API 사용량이 초과되었습니다.\n"
+                "   👉 잠시 후 다시 시도하거나, 할당량을 확인해주세요."
+            )
+        elif "404" in error_msg:
+            return (
+                 "⚠️ [Model Error] 모델을 찾을 수 없습니다.\n"
+                 "   👉 지원되지 않는 리전이거나 모델명이 변경되었을 수 있습니다."
+            )
+        else:
+            return f"❌ [Unknown Error] Gemini 요약 실패:\n   {error_msg}\n   👉 네트워크 연결을 확인해주세요."
+
+class OpenAISummarizer(LLMSummarizer):
+    DEFAULT_MODEL = "gpt-4o-mini"
+    # Tier 1 gpt-4o-mini 기준
+    RATE_LIMITS = (500, 200000)
 
-class CodexOAuthSummarizer(BaseSummarizer):
+    def __init__(self, api_key, base_url=None):
+        from openai import OpenAI
+        self.api_key = api_key
+        # 모의 서버(mockllm) 등 다른 엔드포인트 사용 시 (.env: OPENAI_BASE_URL)
+        self.base_url = base_url or os.getenv("OPENAI_BASE_URL") or None
+        # 재시도는 LLMSummarizer가 담당하므로 SDK 자체 재시도는 끔
+        self.client = OpenAI(api_key=api_key, base_url=self.base_url, max_retries=0)
+        self.model_name = self.DEFAULT_MODEL
+        self._async_client = None
+
+    def _messages(self, text_data, system_prompt):
+        return [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"[전체 개발 내역 데이터]\n{text_data}"}
+        ]
+
+    def _request(self, text_data, system_prompt):
+        response = self.client.chat.completions.create(
+            model=self.model_name,
+            messages=self._messages(text_data, system_prompt),
+            temperature=0.7
+        )
+        return response.choices[0].message.content
+
+    async def _arequest(self, text_data, system_prompt):
+        if self._async_client is None:
+            from openai import AsyncOpenAI
+            self._async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url, max_retries=0)
+        response = await self._async_client.chat.completions.create(
+            model=self.model_name,
+            messages=self._messages(text_data, system_prompt),
+            temperature=0.7
+        )
+        return response.choices[0].message.content
+
+    async def aclose(self):
+        client, self._async_client = self._async_client, None
+        if client is not None:
+            await client.close()
+
+    def _format_error(self, e):
+        error_msg = f"{type(e).__name__}: {e}"
+        if "AuthenticationError" in error_msg or "401" in error_msg:
+            return (
+                "❌ [API Key Error] 유효하지 않은 API 키입니다.\n"
+                "   👉 'claw-log --reset' 명령어로 키를 다시 설정하거나,\n"
+                "      OpenAI Platform(https://platform.openai.com/api-keys)에서 키를 확인해주세요."
+            )
+        elif "RateLimitError" in error_msg or "429" in error_msg:
+            return (
+                "🌐 [Quota Error] API 사용량이 초과되었거나 너무 많은 요청이 발생했습니다.\n"
+                "   👉 잠시 후 다시 시도하거나, 크레딧 잔액을 확인해주세요."
+            )
+        else:
+             return f"❌ [Unknown Error] OpenAI 요약 실패:\n   {str(e)}\n   👉 네트워크 상태를 확인해주세요."
+
+class _MissingTokensError(Exception):
+    """저장된 OAuth 인증 정보가 없음"""
+
+
+class CodexOAuthSummarizer(LLMSummarizer):
     """ChatGPT Plus/Pro 구독의 OAuth 인증을 통해 Codex 백엔드 API를 사용하는 Summarizer"""
     
-    CODEX_API_URL = "https://chatgpt.com/backend-api/codex/responses"
+    CODEX_BASE_URL = "https://chatgpt.com/backend-api/codex"
+    # 응답 생성이 길어질 수 있으므로 읽기 제한은 넉넉하게, 연결 제한은 짧게
+    READ_TIMEOUT = 300.0
+    CONNECT_TIMEOUT = 10.0
+    # 구독 한도는 공개되지 않아 요청 수만 보수적으로 제한
+    RATE_LIMITS = (60, 0)
     
-    def __init__(self, model="gpt-5.1"):
+    def __init__(self, model="gpt-5.1", base_url=None):
         from claw_log.oauth import load_tokens, refresh_if_needed
         self.load_tokens = load_tokens
         self.refresh_if_needed = refresh_if_needed
         self.model = model
+        # 모의 서버(mockllm) 등 다른 엔드포인트 사용 시 (.env: CODEX_BASE_URL)
+        self.base_url = base_url or os.getenv("CODEX_BASE_URL") or None
+        self.api_url = (self.base_url or self.CODEX_BASE_URL).rstrip("/") + "/responses"
+        # keep-alive 연결 풀: 같은 인스턴스의 요청들은 연결을 재사용
+        self._client = None
+        self._async_client = None
 
-    def summarize(self, text_data):
-        import json
-        try:
-            from urllib.request import Request, urlopen
-            from urllib.error import HTTPError, URLError
-            
-            # 토큰 로드 및 필요 시 갱신
-            tokens = self.load_tokens()
-            if not tokens:
-                return (
-                    "❌ [OAuth Error] 저장된 인증 정보가 없습니다.\n"
-                    "   👉 'claw-log --reset' 명령어로 OAuth 로그인을 다시 진행해주세요."
-                )
-            
-            tokens = self.refresh_if_needed(tokens)
-            access_token = tokens.get("access_token", "")
-            
-            # Codex Responses API 형식으로 요청 구성 (stream 필수)
-            payload = {
-                "model": self.model,
-                "instructions": SYSTEM_PROMPT,
-                "input": [
-                    {"role": "user", "content": f"[전체 개발 내역 데이터]\n{text_data}"}
-                ],
-                "stream": True,
-                "store": False,
-            }
-            
-            req = Request(
-                self.CODEX_API_URL,
-                data=json.dumps(payload).encode("utf-8"),
-                headers={
-                    "Content-Type": "application/json",
-                    "Authorization": f"Bearer {access_token}",
-                },
-                method="POST",
+    def _timeout(self):
+        import httpx
+        return httpx.Timeout(self.READ_TIMEOUT, connect=self.CONNECT_TIMEOUT)
+
+    def _auth_headers(self):
+        """토큰 로드 및 필요 시 갱신. 저장된 인증 정보가 없으면 _MissingTokensError."""
+        tokens = self.load_tokens()
+        if not tokens:
+            raise _MissingTokensError()
+        tokens = self.refresh_if_needed(tokens)
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {tokens.get('access_token', '')}",
+        }
+
+    def _payload(self, text_data, system_prompt):
+        # Codex Responses API 형식으로 요청 구성 (stream 필수)
+        return {
+            "model": self.model,
+            "instructions": system_prompt,
+            "input": [
+                {"role": "user", "content": f"[전체 개발 내역 데이터]\n{text_data}"}
+            ],
+            "stream": True,
+            "store": False,
+        }
+
+    def _request(self, text_data, system_prompt):
+        headers = self._auth_headers()
+        if self._client is None:
+            import httpx
+            self._client = httpx.Client(timeout=self._timeout())
+
+        # SSE 스트리밍 응답 파싱
+        # [DONE] 이후에도 끝까지 읽어야 연결이 풀로 반환되어 재사용됨
+        text_parts, done_seen = [], False
+        with self._client.stream("POST", self.api_url, headers=headers,
+                                 json=self._payload(text_data, system_prompt)) as resp:
+            if resp.is_error:
+                resp.read()
+                resp.raise_for_status()
+            for line in resp.iter_lines():
+                delta, done = _parse_sse_line(line)
+                if done:
+                    done_seen = True
+                elif delta and not done_seen:
+                    if not text_parts:
+                        mark_first_token()
+                    text_parts.append(delta)
+
+        return "".join(text_parts) if text_parts else "⚠️ 응답에서 텍스트를 추출할 수 없습니다."
+
+    async def _arequest(self, text_data, system_prompt):
+        # 토큰 갱신은 동기 HTTP 호출이므로 스레드에서 실행
+        import asyncio
+        loop = asyncio.get_running_loop()
+        headers = await loop.run_in_executor(None, self._auth_headers)
+        if self._async_client is None:
+            import httpx
+            self._async_client = httpx.AsyncClient(timeout=self._timeout())
+
+        text_parts, done_seen = [], False
+        async with self._async_client.stream("POST", self.api_url, headers=headers,
+                                             json=self._payload(text_data, system_prompt)) as resp:
+            if resp.is_error:
+                await resp.aread()
+                resp.raise_for_status()
+            async for line in resp.aiter_lines():
+                delta, done = _parse_sse_line(line)
+                if done:
+                    done_seen = True
+                elif delta and not done_seen:
+                    if not text_parts:
+                        mark_first_token()
+                    text_parts.append(delta)
+
+        return "".join(text_parts) if text_parts else "⚠️ 응답에서 텍스트를 추출할 수 없습니다."
+
+    async def aclose(self):
+        client, self._async_client = self._async_client, None
+        if client is not None:
+            await client.aclose()
+
+    def _format_error(self, e):
+        import httpx
+        if isinstance(e, _MissingTokensError):
+            return (
+                "❌ [OAuth Error] 저장된 인증 정보가 없습니다.\n"
+                "   👉 'claw-log --reset' 명령어로 OAuth 로그인을 다시 진행해주세요."
             )
-            
-            # SSE 스트리밍 응답 파싱
-            text_parts = []
-            with urlopen(req) as resp:
-                for raw_line in resp:
-                    line = raw_line.decode("utf-8").strip()
-                    if not line.startswith("data: "):
-                        continue
-                    data_str = line[6:]  # "data: " 이후
-                    if data_str == "[DONE]":
-                        break
-                    try:
-                        event = json.loads(data_str)
-                        ev_type = event.get("type", "")
-                        # output_text.delta → 텍스트 청크 수집
-                        if ev_type == "response.output_text.delta":
-                            delta = event.get("delta", "")
-                            if delta:
-                                text_parts.append(delta)
-                    except json.JSONDecodeError:
-                        continue
-            
-            return "".join(text_parts) if text_parts else "⚠️ 응답에서 텍스트를 추출할 수 없습니다."
-            
-        except HTTPError as e:
-            status = e.code
-            body = e.read().decode("utf-8", errors="replace")
+        if isinstance(e, httpx.HTTPStatusError):
+            status = e.response.status_code
             if status == 401:
                 return (
                     "❌ [OAuth Error] 인증이 만료되었습니다.\n"
@@ -198,8 +520,171 @@ class CodexOAuthSummarizer(BaseSummarizer):
                     "   👉 잠시 후 다시 시도해주세요."
                 )
             else:
-                return f"❌ [API Error] Codex 백엔드 오류 ({status}, model={self.model}):\n   {body[:200]}"
-        except URLError as e:
-            return f"❌ [Network Error] 네트워크 연결 실패:\n   {e.reason}"
-        except Exception as e:
-            return f"❌ [Unknown Error] Codex OAuth 요약 실패:\n   {str(e)}"
\ No newline at end of file
+                return f"❌ [API Error] Codex 백엔드 오류 ({status}, model={self.model}):\n   {e.response.text[:200]}"
+        if isinstance(e, httpx.TransportError):
+            return f"❌ [Network Error] 네트워크 연결 실패:\n   {e}"
+        return f"❌ [Unknown Error] Codex OAuth 요약 실패:\n   {str(e)}"
+
+
+def _parse_sse_line(line):
+    """
+    Codex SSE 한 줄을 해석합니다.
+    반환: (텍스트 조각 또는 None, 스트림 종료 여부)
+    """
+    line = line.strip()
+    if not line.startswith("data: "):
+        return None, False
+    data_str = line[6:]  # "data: " 이후
+    if data_str == "[DONE]":
+        return None, True
+    try:
+        event = json.loads(data_str)
+    except json.JSONDecodeError:
+        return None, False
+    # output_text.delta → 텍스트 청크 수집
+    if event.get("type", "") == "response.output_text.delta":
+        return event.get("delta", "") or None, False
+    return None, False
+
+
+class MapReduceSummarizer(BaseSummarizer):
+    """
+    여러 프로젝트가 합쳐진 대용량 payload를 Map-Reduce로 요약합니다.
+    1. Map: '--- PROJECT: name ---' 단위로 나누고, 큰 프로젝트는 map_tokens 크기 조각으로 분할하여
+       각 조각을 MAP_PROMPT로 동시에 요약
+    2. Reduce: 중간 요약들을 REDUCE_PROMPT로 병합하여 SYSTEM_PROMPT 형식의 최종 리포트 생성
+       (중간 요약 합계가 reduce_tokens를 넘으면 묶음 단위로 한 번 더 압축)
+    전체 payload가 map_tokens 이내면 Map 없이 inner에 그대로 전달합니다.
+    """
+
+    DEFAULT_MAP_TOKENS = 12000
+    DEFAULT_REDUCE_TOKENS = 24000
+    DEFAULT_JOBS = 4
+
+    def __init__(self, inner, map_tokens=None, reduce_tokens=None, max_workers=None):
+        self.inner = inner
+        self.map_tokens = map_tokens or _env_int("MAP_CHUNK_TOKENS", self.DEFAULT_MAP_TOKENS)
+        self.reduce_tokens = reduce_tokens or _env_int("REDUCE_INPUT_TOKENS", self.DEFAULT_REDUCE_TOKENS)
+        self.max_workers = max_workers or _env_int("MAP_JOBS", self.DEFAULT_JOBS)
+
+    @property
+    def model_name(self):
+        return getattr(self.inner, "model_name", None) or getattr(self.inner, "model", "")
+
+    def summarize(self, text_data, system_prompt=None):
+        if estimate_tokens(text_data) <= self.map_tokens:
+            return self.inner.summarize(text_data, system_prompt=system_prompt)
+
+        chunks = self._split_chunks(text_data)
+        partials = self._map(chunks, MAP_PROMPT)
+        for partial in partials:
+            if is_error_summary(partial):
+                return partial
+
+        # 중간 요약이 reduce 예산을 넘으면 예산 크기 묶음으로 한 번 더 압축
+        while estimate_tokens("".join(partials)) > self.reduce_tokens and len(partials) > 1:
+            groups = self._group(partials, self.reduce_tokens * 4)
+            if len(groups) == len(partials):
+                break
+            partials = self._map([("merged", "\n".join(g)) for g in groups], MAP_PROMPT)
+            for partial in partials:
+                if is_error_summary(partial):
+                    return partial
+
+        return self.inner.summarize("\n".join(partials), system_prompt=REDUCE_PROMPT)
+
+    async def asummarize(self, text_data, system_prompt=None):
+        if estimate_tokens(text_data) <= self.map_tokens:
+            return await self.inner.asummarize(text_data, system_prompt=system_prompt)
+
+        chunks = self._split_chunks(text_data)
+        partials = await self._amap(chunks, MAP_PROMPT)
+        for partial in partials:
+            if is_error_summary(partial):
+                return partial
+
+        while estimate_tokens("".join(partials)) > self.reduce_tokens and len(partials) > 1:
+            groups = self._group(partials, self.reduce_tokens * 4)
+            if len(groups) == len(partials):
+                break
+            partials = await self._amap([("merged", "\n".join(g)) for g in groups], MAP_PROMPT)
+            for partial in partials:
+                if is_error_summary(partial):
+                    return partial
+
+        return await self.inner.asummarize("\n".join(partials), system_prompt=REDUCE_PROMPT)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+    def _map(self, chunks, prompt):
+        """(label, text) 조각들을 동시에 요약하여 입력 순서대로 '--- PROJECT ---' 블록으로 반환."""
+        def _run(chunk):
+            label, text = chunk
+            summary = self.inner.summarize(text, system_prompt=prompt)
+            if is_error_summary(summary):
+                return summary
+            return f"--- PROJECT: {label} ---\n{summary.strip()}\n"
+
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as pool:
+            return list(pool.map(_run, chunks))
+
+    async def _amap(self, chunks, prompt):
+        """_map()의 비동기 버전. 동시에 진행되는 요청은 max_workers개로 제한합니다."""
+        import asyncio
+        semaphore = asyncio.Semaphore(max(1, self.max_workers))
+
+        async def _run(chunk):
+            label, text = chunk
+            async with semaphore:
+                summary = await self.inner.asummarize(text, system_prompt=prompt)
+            if is_error_summary(summary):
+                return summary
+            return f"--- PROJECT: {label} ---\n{summary.strip()}\n"
+
+        return list(await asyncio.gather(*(_run(c) for c in chunks)))
+
+    def _split_chunks(self, text_data):
+        """payload를 (label, text) 조각 목록으로 분할합니다."""
+        max_chars = self.map_tokens * 4
+        chunks = []
+        for name, body in _split_projects(text_data):
+            pieces = self._group(body.splitlines(keepends=True), max_chars)
+            for i, piece in enumerate(pieces, 1):
+                label = name if len(pieces) == 1 else f"{name} (part {i}/{len(pieces)})"
+                # 한 줄이 예산보다 긴 경우(minified 파일 등)는 잘라서 보냄
+                chunks.append((label, f"--- PROJECT: {label} ---\n{''.join(piece)[:max_chars]}"))
+        return chunks
+
+    @staticmethod
+    def _group(items, max_chars):
+        """문자열 목록을 순서대로 합계 max_chars 이내 묶음들로 나눕니다."""
+        groups, current, size = [], [], 0
+        for item in items:
+            if current and size + len(item) > max_chars:
+                groups.append(current)
+                current, size = [], 0
+            current.append(item)
+            size += len(item)
+        if current:
+            groups.append(current)
+        return groups
+
+
+def _split_projects(text_data):
+    """'--- PROJECT: name ---' 헤더 기준으로 [(name, body)]를 반환합니다."""
+    matches = list(PROJECT_HEADER_RE.finditer(text_data))
+    if not matches:
+        return [("unknown", text_data)]
+    projects = []
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text_data)
+        projects.append((m.group(1), text_data[m.end():end].strip("\n")))
+    return projects
+
+
+def _env_int(name, default):
+    try:
+        return int(os.getenv(name, default))
+    except ValueError:
+        return default
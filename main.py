@@ -1,63 +1,51 @@
 import os
 import sys
 import argparse
+import codecs
+import hashlib
 import subprocess
+import time
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from importlib.metadata import version, PackageNotFoundError
 from dotenv import load_dotenv
 
-try:
-    __version__ = version("claw_log")
-except PackageNotFoundError:
-    __version__ = "unknown"
-
-from claw_log.engine import GeminiSummarizer, OpenAISummarizer, CodexOAuthSummarizer
-from claw_log.storage import prepend_to_log_file, read_recent_logs, LOG_FILENAME
+from claw_log.engine import (
+    GeminiSummarizer, OpenAISummarizer, CodexOAuthSummarizer, MapReduceSummarizer, is_error_summary,
+    run_summaries,
+)
+from claw_log.tokens import (
+    count_tokens, payload_token_budget, project_token_budget, allocate_budget, fit_to_budget, tokenizer_name,
+)
+from claw_log.compact import compact_diff, is_compaction_enabled
+from claw_log.collector import (
+    get_collector, collect_commits, worktree_pathspec, excluded_pathspecs, load_diff_filter, format_skipped_files,
+)
+from claw_log.storage import (
+    prepend_to_log_file, read_recent_logs, get_log_overview, export_markdown, get_log_backend,
+    LOG_FILENAME, load_watermarks, save_watermarks,
+)
+from claw_log.discover import discover_git_repos
+from claw_log.metrics import RunRecorder, show_run_stats, DEFAULT_STATS_RUNS
 from claw_log.scheduler import install_schedule, show_schedule, remove_schedule, get_schedule_summary
 
 # .env 파일은 현재 작업 디렉토리(CWD)에서 찾습니다.
 ENV_PATH = Path(os.getcwd()) / ".env"
 
+# 저장소별 git 수집 동시 실행 수 기본값 (--jobs / COLLECT_JOBS 로 변경)
+DEFAULT_COLLECT_JOBS = 8
 
-# ── 프로젝트 탐색 & 선택 (공용 로직) ──
+# 프로젝트당 LLM으로 보내는 diff 최대 글자 수
+MAX_DIFF_CHARS = 15000
+# Map-Reduce 모드의 프로젝트당 수집 예산 (토큰, .env: MAP_PROJECT_TOKENS)
+DEFAULT_MAP_PROJECT_TOKENS = 48000
+# 토큰 예산 대비 수집량 배수 (생성물 등을 걸러낼 여유분)
+COLLECT_OVERSAMPLE = 4
+# git 출력 스트리밍 시 한 번에 읽는 바이트 수
+STREAM_CHUNK_BYTES = 64 * 1024
 
-def discover_git_repos(base_path_str, max_depth=3):
-    """
-    주어진 경로에서 Git 저장소를 재귀 탐색합니다.
-    반환: [(repo_path, is_direct)] 리스트
-    - is_direct=True: 입력 경로 자체가 git repo
-    - is_direct=False: 하위에서 재귀 발견
-    """
-    base = Path(base_path_str).resolve()
-    
-    if not base.exists():
-        print(f"⚠️  경로를 찾을 수 없습니다: {base}")
-        return []
-    
-    # 자기 자신이 git repo인 경우 → 직접 지정
-    if (base / ".git").exists():
-        return [(base, True)]
-    
-    # 하위 탐색 → 자동 발견
-    repos = []
-    def _scan(current, depth):
-        if depth > max_depth:
-            return
-        try:
-            for entry in sorted(current.iterdir()):
-                if not entry.is_dir() or entry.name.startswith("."):
-                    continue
-                if (entry / ".git").exists():
-                    repos.append((entry, False))
-                else:
-                    _scan(entry, depth + 1)
-        except PermissionError:
-            pass
-    
-    _scan(base, 1)
-    return repos
 
+# ── 프로젝트 탐색 & 선택 (공용 로직) ──
 
 def discover_and_select(raw_paths_str, existing_selected=None):
     """
@@ -80,9 +68,12 @@ def discover_and_select(raw_paths_str, existing_selected=None):
     
     # 1. 전체 탐색
     all_repos = []  # [(path, is_direct)]
+    scan_stats = {}
     for p in raw_paths:
-        found = discover_git_repos(p)
+        found = discover_git_repos(p, stats=scan_stats)
         all_repos.extend(found)
+    if scan_stats.get("cached"):
+        print(f"   (디렉토리 {scan_stats['scanned'] + scan_stats['cached']:,}개 중 변경된 {scan_stats['scanned']:,}개만 다시 탐색)")
     
     if not all_repos:
         print("⚠️ Git 저장소를 찾지 못했습니다.")
@@ -285,22 +276,20 @@ def show_status():
     schedule_info = get_schedule_summary()
     print(f"  스케줄:    {schedule_info}")
 
+    # 요약 캐시 정보
+    from claw_log.cache import get_cache_summary
+    print(f"  요약캐시:  {get_cache_summary()}")
+
     # 로그 파일 정보
-    log_path = Path.cwd() / "career_logs.md"
-    if log_path.exists():
-        try:
-            with open(log_path, "r", encoding="utf-8") as f:
-                content = f.read()
-            line_count = content.count("\n")
-            # 최근 날짜 추출
-            import re
-            dates = re.findall(r"## 📅 (\d{4}-\d{2}-\d{2})", content)
-            last_date = dates[0] if dates else "알 수 없음"
-            print(f"  로그파일:  career_logs.md ({line_count}줄, 최근: {last_date})")
-        except Exception:
-            print(f"  로그파일:  career_logs.md (읽기 실패)")
-    else:
-        print(f"  로그파일:  없음 (첫 실행 전)")
+    try:
+        overview = get_log_overview()
+        if overview:
+            last_date = overview["latest"] or "알 수 없음"
+            print(f"  로그파일:  {overview['file']} ({overview['entries']}개 기록, 최근: {last_date})")
+        else:
+            print(f"  로그파일:  없음 (첫 실행 전)")
+    except Exception:
+        print(f"  로그파일:  {LOG_FILENAME} (읽기 실패)")
 
     print("━" * 40)
 
@@ -449,8 +438,79 @@ def run_wizard():
 
 # ── Git Diff 수집 ──
 
-def get_git_diff_for_path(path_str, days=0):
-    """Git diff를 수집합니다. days=0이면 오늘만, days>0이면 과거 N일치."""
+def _stream_git_output(cmd, max_chars=None):
+    """
+    git 출력을 파이프에서 조금씩 읽어 디코딩합니다.
+    max_chars에 도달하면 즉시 서브프로세스를 종료하여 나머지 출력을 읽지 않습니다.
+
+    Returns:
+        (text, skipped_bytes, truncated)
+        - skipped_bytes: 읽었지만 예산 초과로 버린 바이트 수 (조기 종료 시 최소값)
+    Raises:
+        subprocess.CalledProcessError: 예산 도달 전에 git이 실패한 경우
+    """
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    parts = []
+    n_chars = 0
+    skipped_bytes = 0
+    truncated = False
+    try:
+        while True:
+            chunk = proc.stdout.read(STREAM_CHUNK_BYTES)
+            text = decoder.decode(chunk, final=not chunk)
+            if max_chars is not None and n_chars + len(text) > max_chars:
+                keep = max_chars - n_chars
+                parts.append(text[:keep])
+                skipped_bytes = len(text[keep:].encode("utf-8"))
+                truncated = True
+                break
+            parts.append(text)
+            n_chars += len(text)
+            if not chunk:
+                break
+    finally:
+        if truncated:
+            proc.kill()
+        proc.stdout.close()
+        proc.wait()
+
+    if not truncated and proc.returncode != 0:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+    return "".join(parts), skipped_bytes, truncated
+
+
+def _git_head(path):
+    """저장소의 현재 HEAD 커밋 SHA를 반환합니다. (커밋이 없으면 None)"""
+    try:
+        return subprocess.check_output(
+            ["git", "-C", str(path), "rev-parse", "--verify", "-q", "HEAD"],
+            stderr=subprocess.DEVNULL,
+        ).decode("utf-8").strip() or None
+    except subprocess.CalledProcessError:
+        return None
+
+
+def _is_ancestor(path, commit, head):
+    """commit이 head의 조상인지 확인합니다. (rebase 등으로 사라진 SHA면 False)"""
+    result = subprocess.run(
+        ["git", "-C", str(path), "merge-base", "--is-ancestor", commit, head],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    return result.returncode == 0
+
+
+def get_git_diff_for_path(path_str, days=0, max_chars=None, stats=None, watermark=None, day=None):
+    """
+    Git diff를 수집합니다. days=0이면 오늘만, days>0이면 과거 N일치.
+    day: datetime.date를 넘기면 그날 하루의 커밋만 수집합니다 (미커밋 변경은 오늘인 경우만 포함).
+
+    max_chars: 반환 문자열의 최대 길이. 도달하면 git 출력을 더 읽지 않고 중단합니다.
+    stats: dict를 넘기면 수집 통계(skipped_bytes, truncated, skipped_files)와
+           다음 워터마크(head, worktree_hash)를 채워줍니다.
+    watermark: 증분 모드. {"head", "worktree_hash"}를 넘기면 기간 대신 head 이후의
+               커밋만 수집하고, 미커밋 diff가 지난번과 같으면 생략합니다.
+    """
     path = Path(path_str).resolve()
 
     if not path.exists():
@@ -469,30 +529,92 @@ def get_git_diff_for_path(path_str, days=0):
         ":(exclude)node_modules/", ":(exclude).next/", ":(exclude).git/", ":(exclude).DS_Store"
     ]
 
+    if stats is None:
+        stats = {}
+    watermark = watermark or {}
+    stats.update(skipped_bytes=0, truncated=False, worktree_hash=watermark.get("worktree_hash"), skipped_files={})
+    batch = get_collector() == "batch"
+    diff_filter = load_diff_filter(path)
+
+    def _remaining(used, header, trailer):
+        if max_chars is None:
+            return None
+        return max(0, max_chars - used - len(header) - len(trailer))
+
     try:
         combined_result = ""
         since_date = datetime.datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
         if days > 0:
             since_date -= datetime.timedelta(days=days)
 
-        # 1. 커밋 로그
-        period_label = f"Past {days} Days" if days > 0 else "Today"
+        # 1. 커밋 로그 (워터마크가 유효하면 기간 대신 마지막 처리 커밋 이후만)
+        head = _git_head(path)
+        stats["head"] = head
+        last_head = watermark.get("head")
+        if day is not None:
+            day_start = datetime.datetime.combine(day, datetime.time())
+            day_end = day_start + datetime.timedelta(days=1)
+            log_range = [f"--since={day_start.isoformat()}", f"--until={day_end.isoformat()}"]
+            period_label = day.isoformat()
+        elif head and last_head and _is_ancestor(path, last_head, head):
+            log_range = [f"{last_head}..{head}"]
+            period_label = f"Since {last_head[:7]}"
+        else:
+            log_range = [f"--since={since_date.isoformat()}"]
+            period_label = f"Past {days} Days" if days > 0 else "Today"
+        header = f"=== [Past Commits ({period_label})] ===\n"
         try:
-            cmd_log = ["git", "-C", str(path), "log", f"--since={since_date.isoformat()}", "-p", "--", "."] + exclude_patterns
-            log_output = subprocess.check_output(cmd_log, stderr=subprocess.STDOUT).decode("utf-8")
+            if batch:
+                log_output, skipped, truncated = collect_commits(
+                    path, log_range, exclude_patterns, _remaining(0, header, "\n\n"), stats, diff_filter)
+            else:
+                # numstat 사전 점검으로 바이너리/대용량 파일을 패치 생성 전에 제외
+                prepass = excluded_pathspecs(path, log_range, exclude_patterns, stats, diff_filter)
+                cmd_log = ["git", "-C", str(path), "log"] + log_range + ["-p", "--", "."] + exclude_patterns + prepass
+                log_output, skipped, truncated = _stream_git_output(cmd_log, _remaining(0, header, "\n\n"))
+            stats["skipped_bytes"] += skipped
+            stats["truncated"] |= truncated
             if log_output.strip():
-                combined_result += f"=== [Past Commits ({period_label})] ===\n" + log_output + "\n\n"
+                combined_result += header + log_output + "\n\n"
         except subprocess.CalledProcessError:
             pass
 
-        # 2. 미커밋 변경사항
-        try:
-            cmd_diff = ["git", "-C", str(path), "diff", "HEAD", "--", "."] + exclude_patterns
-            diff_output = subprocess.check_output(cmd_diff, stderr=subprocess.STDOUT).decode("utf-8")
-            if diff_output.strip():
-                combined_result += "=== [Uncommitted Current Work] ===\n" + diff_output + "\n"
-        except subprocess.CalledProcessError:
+        # 2. 미커밋 변경사항 (커밋 로그가 예산을 다 쓴 경우 git 실행 자체를 생략)
+        header = "=== [Uncommitted Current Work] ===\n"
+        budget = _remaining(len(combined_result), header, "\n")
+        if day is not None and day != datetime.date.today():
+            # 날짜 단위 수집: 미커밋 변경은 오늘 작업으로만 취급
             pass
+        elif budget is None or budget > 0:
+            try:
+                # 미커밋 변경도 numstat으로 먼저 걸러낸 파일만 diff 생성
+                pathspec = worktree_pathspec(path, exclude_patterns, stats, diff_filter)
+                if pathspec:
+                    cmd_diff = ["git", "-C", str(path), "diff", "HEAD", "--"] + pathspec
+                    diff_output, skipped, truncated = _stream_git_output(cmd_diff, budget)
+                else:
+                    diff_output, skipped, truncated = "", 0, False
+                stats["skipped_bytes"] += skipped
+                stats["truncated"] |= truncated
+                worktree_hash = None
+                if diff_output.strip():
+                    worktree_hash = hashlib.sha1(diff_output.encode("utf-8")).hexdigest()
+                stats["worktree_hash"] = worktree_hash
+                # 지난 실행 이후 미커밋 상태가 그대로면 다시 보내지 않음
+                if worktree_hash and worktree_hash != watermark.get("worktree_hash"):
+                    combined_result += header + diff_output + "\n"
+            except subprocess.CalledProcessError:
+                pass
+        else:
+            stats["truncated"] = True
+
+        # 3. 제외된 파일 목록 (내용 없이 이름과 줄 수만 — 요약에서 변경 사실은 언급할 수 있도록)
+        if combined_result.strip() and stats["skipped_files"]:
+            header = "=== [Excluded Files (binary/large/generated)] ===\n"
+            listing = format_skipped_files(stats["skipped_files"])
+            budget = _remaining(len(combined_result), header, "")
+            if budget is None or len(listing) <= budget:
+                combined_result += header + listing
 
         return combined_result if combined_result.strip() else None
 
@@ -500,25 +622,222 @@ def get_git_diff_for_path(path_str, days=0):
         return None
 
 
+def _watermark_key(path_str):
+    """워터마크 파일에서 저장소를 식별하는 키 (절대 경로)."""
+    return str(Path(path_str).resolve())
+
+
+def _is_incremental(flag=False):
+    """증분 모드 여부: --incremental 또는 .env의 INCREMENTAL=true"""
+    return flag or os.getenv("INCREMENTAL", "").lower() in ("1", "true", "yes")
+
+
+def _resolve_collect_jobs(jobs=None):
+    """수집 동시 실행 수 결정: --jobs > COLLECT_JOBS(.env) > 기본값."""
+    if jobs is None:
+        try:
+            jobs = int(os.getenv("COLLECT_JOBS", DEFAULT_COLLECT_JOBS))
+        except ValueError:
+            jobs = DEFAULT_COLLECT_JOBS
+    return max(1, jobs)
+
+
+def collect_diffs(target_paths, days=0, jobs=None, max_chars=MAX_DIFF_CHARS, watermarks=None):
+    """
+    여러 저장소의 diff를 워커 풀로 동시에 수집합니다.
+    git 서브프로세스 대기 시간이 대부분이므로 스레드 풀로 충분합니다.
+    watermarks: 증분 모드에서 load_watermarks() 결과 (저장소 경로 → 워터마크)
+
+    Returns:
+        [(repo_path_str, diff or None, stats)] — 입력 target_paths 순서 그대로
+    """
+    def _collect(path_str):
+        stats = {}
+        watermark = watermarks.get(_watermark_key(path_str)) if watermarks is not None else None
+        start = time.perf_counter()
+        diff = get_git_diff_for_path(path_str, days=days, max_chars=max_chars, stats=stats, watermark=watermark)
+        stats["collect_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return path_str, diff, stats
+
+    jobs = min(_resolve_collect_jobs(jobs), max(1, len(target_paths)))
+    if jobs == 1:
+        return [_collect(p) for p in target_paths]
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        # map()은 제출 순서대로 결과를 돌려주므로 출력 순서가 결정적으로 유지됨
+        return list(pool.map(_collect, target_paths))
+
+
+def collect_daily_diffs(target_paths, days, jobs=None, max_chars=MAX_DIFF_CHARS):
+    """
+    과거 days일 ~ 오늘을 하루 단위로 나눠 (저장소, 날짜) 조합을 워커 풀로 동시에 수집합니다.
+    날짜마다 max_chars 예산을 따로 쓰므로 기간 전체를 한 번에 자르는 것보다 세부 내용이 보존됩니다.
+
+    Returns:
+        [(date, [(repo_path_str, diff or None, stats)])] — 오래된 날짜부터, 저장소는 입력 순서대로
+    """
+    today = datetime.date.today()
+    dates = [today - datetime.timedelta(days=offset) for offset in range(days, -1, -1)]
+    # 존재하지 않는 경로 안내가 날짜 수만큼 반복되지 않도록 미리 걸러냄
+    valid_paths = []
+    for path_str in target_paths:
+        path = Path(path_str).resolve()
+        if not path.exists():
+            print(f"⚠️  경로를 찾을 수 없습니다: {path}")
+        elif not (path / ".git").exists():
+            print(f"⚠️  Git 저장소가 아닙니다 (건너뜀): {path}")
+        else:
+            valid_paths.append(path_str)
+
+    def _collect(task):
+        day, path_str = task
+        stats = {}
+        start = time.perf_counter()
+        diff = get_git_diff_for_path(path_str, max_chars=max_chars, stats=stats, day=day)
+        stats["collect_ms"] = round((time.perf_counter() - start) * 1000, 1)
+        return path_str, diff, stats
+
+    tasks = [(day, p) for day in dates for p in valid_paths]
+    jobs = min(_resolve_collect_jobs(jobs), max(1, len(tasks)))
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        results = list(pool.map(_collect, tasks))
+
+    per_repo = len(valid_paths)
+    return [(day, results[i * per_repo:(i + 1) * per_repo]) for i, day in enumerate(dates)]
+
+
+def _is_per_day(flag=False):
+    """--days 하루 단위 요약 여부: --per-day 또는 .env의 DAYS_MODE=per-day"""
+    return flag or os.getenv("DAYS_MODE", "").lower() == "per-day"
+
+
+def _format_skipped(stats, max_chars=MAX_DIFF_CHARS):
+    """예산 초과로 생략된 분량을 사람이 읽을 수 있는 문자열로 반환합니다."""
+    label = ""
+    skipped_files = stats.get("skipped_files") or {}
+    if skipped_files:
+        label += f" — 바이너리/대용량/생성물 파일 {len(skipped_files)}개 제외"
+    if stats.get("truncated"):
+        label += f" — {max_chars:,}자 초과분 생략 (git 조기 종료, ≥{stats['skipped_bytes']:,} bytes)"
+    return label
+
+
+def _is_map_reduce(flag=False):
+    """Map-Reduce 요약 여부: --map-reduce 또는 .env의 SUMMARY_MODE=map-reduce"""
+    return flag or os.getenv("SUMMARY_MODE", "").lower() == "map-reduce"
+
+
+def _env_model(llm_type):
+    """.env의 LLM_TYPE에 해당하는 모델 이름 (Summarizer를 만들지 않고 토큰 계산에 사용)."""
+    if llm_type == "openai-oauth":
+        return os.getenv("CODEX_MODEL", "gpt-5.1")
+    if llm_type == "openai":
+        return OpenAISummarizer.DEFAULT_MODEL
+    return GeminiSummarizer.DEFAULT_MODEL
+
+
+def _project_token_budget(map_reduce=False, model=None):
+    """
+    프로젝트 하나의 토큰 예산. 기본 모드는 PROJECT_TOKENS(요청 전체 예산 안에서 나눠 씀),
+    Map-Reduce 모드는 조각 단위로 나눠 요약하므로 프로젝트마다 MAP_PROJECT_TOKENS를 따로 씀.
+    """
+    if not map_reduce:
+        return min(project_token_budget(), payload_token_budget(model))
+    try:
+        return int(os.getenv("MAP_PROJECT_TOKENS", DEFAULT_MAP_PROJECT_TOKENS))
+    except ValueError:
+        return DEFAULT_MAP_PROJECT_TOKENS
+
+
+def _project_char_budget(map_reduce=False, model=None):
+    """
+    프로젝트당 수집할 최대 글자 수 (git 조기 종료 기준).
+    토큰 예산의 COLLECT_OVERSAMPLE배를 수집한 뒤 fit_to_budget()에서 중요한 파일 위주로 줄임.
+    """
+    return _project_token_budget(map_reduce, model) * 4 * COLLECT_OVERSAMPLE
+
+
+def _fit_projects(diffs, model=None, map_reduce=False):
+    """
+    [(프로젝트 이름, diff)]를 토큰 예산에 맞춥니다.
+    기본 모드는 프로젝트마다 PROJECT_TOKENS까지 담되, 합계가 요청 예산(컨텍스트 기준)을 넘으면
+    변경량에 비례해 배분합니다.
+    반환: [(이름, 줄인 diff, 토큰 수, 생략된 파일 목록, 압축 전 토큰 수)]
+    """
+    budget = _project_token_budget(map_reduce, model)
+    raw_sizes = [count_tokens(diff, model) for _, diff in diffs]
+    if is_compaction_enabled():
+        diffs = [(name, compact_diff(diff)[0]) for name, diff in diffs]
+    sizes = [count_tokens(diff, model) for _, diff in diffs]
+    if map_reduce:
+        allocations = [min(size, budget) for size in sizes]
+    else:
+        wanted = [min(size, budget) for size in sizes]
+        allocations = allocate_budget(wanted, payload_token_budget(model)) if diffs else []
+
+    fitted = []
+    for (name, diff), raw_size, size, allocation in zip(diffs, raw_sizes, sizes, allocations):
+        if size > allocation:
+            diff, dropped = fit_to_budget(diff, allocation, model)
+            size = count_tokens(diff, model)
+        else:
+            dropped = []
+        fitted.append((name, diff, size, dropped, raw_size))
+    return fitted
+
+
+def _format_dropped(dropped):
+    """토큰 예산 초과로 생략된 파일 수를 문자열로 반환합니다."""
+    return f" — 예산 초과 파일 {len(dropped)}개 생략" if dropped else ""
+
+
 # ── 환경 점검 ──
 
-def check_environment():
-    """실행 전 필수 의존성 및 환경 점검"""
+def get_version():
+    """설치된 패키지 버전. importlib.metadata 조회는 느리므로 --version 에서만 호출"""
+    from importlib.metadata import version, PackageNotFoundError
     try:
-        import google.genai
-        import openai
-        import dotenv
-    except ImportError as e:
-        print(f"❌ [Critical Error] 필수 라이브러리가 설치되지 않았습니다: {e}")
-        print("   👉 'pip install claw-log --force-reinstall'을 시도해보세요.")
-        sys.exit(1)
+        return version("claw_log")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def __getattr__(name):
+    # 기존 claw_log.main.__version__ 호환 (접근할 때 조회)
+    if name == "__version__":
+        return get_version()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class _VersionAction(argparse.Action):
+    """--version: 버전 조회를 실제로 요청받았을 때만 수행"""
+
+    def __init__(self, option_strings, dest=argparse.SUPPRESS, default=argparse.SUPPRESS, help=None):
+        super().__init__(option_strings, dest=dest, default=default, nargs=0, help=help)
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        parser.exit(message=f"claw-log {get_version()}\n")
+
+
+def check_environment():
+    """실행 전 필수 의존성 및 환경 점검 (설치 여부만 확인, 실제 import는 엔진 생성 시)"""
+    from importlib.util import find_spec
+    for module in ("google.genai", "openai", "httpx", "dotenv"):
+        try:
+            found = find_spec(module) is not None
+        except ImportError:
+            found = False
+        if not found:
+            print(f"❌ [Critical Error] 필수 라이브러리가 설치되지 않았습니다: {module}")
+            print("   👉 'pip install claw-log --force-reinstall'을 시도해보세요.")
+            sys.exit(1)
 
 
 # ── 메인 ──
 
 def main():
     parser = argparse.ArgumentParser(description="Claw-Log: 커리어 자동 기록 도구")
-    parser.add_argument("--version", action="version", version=f"claw-log {__version__}")
+    parser.add_argument("--version", action=_VersionAction, help="버전 정보 출력")
     parser.add_argument("--reset", action="store_true", help="설정 초기화 및 마법사 재실행")
     parser.add_argument("--schedule", metavar="HH:MM", help="스케줄 등록/변경 (예: --schedule 23:30)")
     parser.add_argument("--schedule-show", action="store_true", help="현재 스케줄 조회")
@@ -529,14 +848,23 @@ def main():
     parser.add_argument("--dry-run", action="store_true", help="API 호출 없이 수집될 diff 미리보기")
     parser.add_argument("--engine", action="store_true", help="AI 엔진/모델 변경 (프로젝트·스케줄 유지)")
     parser.add_argument("--days", type=int, default=0, metavar="N", help="과거 N일치 커밋 요약 (예: --days 7)")
+    parser.add_argument("--per-day", action="store_true", help="--days 기간을 하루 단위로 나눠 날짜별로 기록 (.env: DAYS_MODE=per-day)")
+    parser.add_argument("--incremental", action="store_true", help="마지막 기록 이후 새 커밋/변경만 수집 (.env: INCREMENTAL=true)")
+    parser.add_argument("--map-reduce", action="store_true", help="프로젝트별 요약 후 병합 (대용량 payload용, .env: SUMMARY_MODE=map-reduce)")
+    parser.add_argument("--jobs", type=int, default=None, metavar="N", help=f"저장소 동시 수집 수 (기본: COLLECT_JOBS 또는 {DEFAULT_COLLECT_JOBS})")
     parser.add_argument("--log", nargs="?", const=5, type=int, metavar="N", help="최근 N개 로그 조회 (기본: 5)")
     parser.add_argument("--serve", nargs="?", const=8080, type=int, metavar="PORT", help="로컬 웹 대시보드 (기본 포트: 8080)")
     parser.add_argument("--log-edit", action="store_true", help="커리어 로그 파일을 기본 편집기로 열기")
+    parser.add_argument("--search", metavar="QUERY", help="커리어 로그 전문 검색 (예: --search \"Redis 캐싱\")")
+    parser.add_argument("--stats", nargs="?", const=DEFAULT_STATS_RUNS, type=int, metavar="N",
+                        help=f"최근 N회 실행의 단계별 소요 시간 p50/p95 (기본: {DEFAULT_STATS_RUNS}, runs.jsonl)")
+    parser.add_argument("--log-export", action="store_true", help="career_logs.md 다시 생성 (LOG_BACKEND=append/sqlite 용)")
     args = parser.parse_args()
 
     # 0. 즉시 실행 명령어 (설정 불필요)
     if args.serve is not None:
         from claw_log.server import serve_dashboard
+        load_dotenv(ENV_PATH, override=True)
         serve_dashboard(port=args.serve)
         return
     if args.status:
@@ -545,11 +873,23 @@ def main():
     if args.engine:
         change_engine()
         return
+    if args.log_export:
+        load_dotenv(ENV_PATH, override=True)
+        log_path = export_markdown()
+        if log_path:
+            print(f"📤 로그 내보내기 완료: {log_path}")
+        else:
+            print("⚠️ 로그 파일이 없습니다. 먼저 'claw-log'를 실행하세요.")
+        return
     if args.log_edit:
-        log_path = Path.cwd() / LOG_FILENAME
-        if not log_path.exists():
+        load_dotenv(ENV_PATH, override=True)
+        log_path = export_markdown()
+        if not log_path:
             print("⚠️ 로그 파일이 없습니다. 먼저 'claw-log'를 실행하세요.")
             return
+        backend = get_log_backend()
+        if backend != "markdown":
+            print(f"ℹ️  {backend} 방식에서는 내보낸 사본을 엽니다. (수정 내용은 기록에 반영되지 않음)")
         import platform
         system = platform.system()
         if system == "Windows":
@@ -564,7 +904,22 @@ def main():
                 return
         print(f"📝 편집기로 열었습니다: {log_path}")
         return
+    if args.search is not None:
+        load_dotenv(ENV_PATH, override=True)
+        from claw_log.search import search_logs
+        results, error = search_logs(args.search)
+        if error:
+            print(f"⚠️ {error}")
+        elif not results:
+            print(f"\n🔎 '{args.search}' 검색 결과가 없습니다.")
+        else:
+            print(f"\n🔎 '{args.search}' 검색 결과 {len(results)}건\n")
+            for r in results:
+                print(f"  📅 {r['date']}")
+                print(f"     {r['snippet']}\n")
+        return
     if args.log is not None:
+        load_dotenv(ENV_PATH, override=True)
         entries, error = read_recent_logs(n=args.log)
         if error:
             print(f"⚠️ {error}")
@@ -574,6 +929,10 @@ def main():
                 print(entry)
                 print("\n" + "─" * 50 + "\n")
         return
+    if args.stats is not None:
+        load_dotenv(ENV_PATH, override=True)
+        show_run_stats(args.stats)
+        return
     if args.schedule_show:
         show_schedule()
         return
@@ -599,25 +958,41 @@ def main():
         print(f"\n🔍 Claw-Log Dry Run — {len(target_paths)}개 프로젝트 스캔")
         print("=" * 50)
 
+        model = _env_model(os.getenv("LLM_TYPE", "gemini").lower())
+        map_reduce = _is_map_reduce(args.map_reduce)
+        watermarks = load_watermarks() if _is_incremental(args.incremental) else None
+        max_chars = _project_char_budget(map_reduce, model)
+        results = collect_diffs(target_paths, jobs=args.jobs, max_chars=max_chars, watermarks=watermarks)
+
+        collected = [(Path(p).name, d) for p, d, _ in results if d]
+        fitted = iter(_fit_projects(collected, model, map_reduce))
         total_chars = 0
-        collected = 0
-        for repo_path_str in target_paths:
+        total_tokens = 0
+        total_raw = 0
+        for repo_path_str, diff, stats in results:
             p_name = Path(repo_path_str).name
-            diff = get_git_diff_for_path(repo_path_str)
             if diff:
-                chars = len(diff)
-                truncated = min(chars, 15000)
-                total_chars += truncated
-                collected += 1
-                print(f"  ✅ [{p_name}] {chars:,}자 (전송: {truncated:,}자)")
+                _, diff, tokens, dropped, raw_tokens = next(fitted)
+                total_chars += len(diff)
+                total_tokens += tokens
+                total_raw += raw_tokens
+                print(f"  ✅ [{p_name}] 전송: {len(diff):,}자 / {tokens:,} 토큰 (원본 {raw_tokens:,} 토큰)"
+                      f"{_format_dropped(dropped)}{_format_skipped(stats, max_chars)}")
             elif Path(repo_path_str).exists():
                 print(f"  ⏭️  [{p_name}] 변경사항 없음")
             else:
                 print(f"  ❌ [{p_name}] 경로 없음")
 
         print("=" * 50)
-        print(f"  수집 프로젝트: {collected}/{len(target_paths)}")
-        print(f"  총 전송 크기:  {total_chars:,}자 (약 {total_chars // 4:,} 토큰)")
+        print(f"  수집 프로젝트: {len(collected)}/{len(target_paths)}")
+        print(f"  총 전송 크기:  {total_chars:,}자 / {total_tokens:,} 토큰 ({model}, {tokenizer_name(model)})")
+        if total_raw:
+            compact_label = "켜짐" if is_compaction_enabled() else "꺼짐, .env: DIFF_COMPACT"
+            print(f"  원본 대비:    {total_tokens / total_raw:.0%} (diff 압축 {compact_label})")
+        budget_label = f"{_project_token_budget(map_reduce, model):,} (프로젝트당)"
+        if not map_reduce:
+            budget_label += f", 요청 전체 {payload_token_budget(model):,}"
+        print(f"  토큰 예산:    {budget_label}")
         if total_chars == 0:
             print("  ⚠️ 오늘 변경사항이 없습니다.")
         return
@@ -665,59 +1040,205 @@ def main():
         print("❌ API Key가 설정되지 않았습니다. 마법사를 완료하거나 .env 파일을 확인해주세요.")
         return
 
-    # Summarizer 초기화
+    days = args.days
+    per_day = days > 0 and _is_per_day(args.per_day)
+    recorder = RunRecorder("per-day" if per_day else ("days" if days > 0 else "today"), engine=llm_type, days=days)
+
+    # Summarizer 초기화 (엔진 SDK import 포함)
     summarizer = None
-    if llm_type == "openai-oauth":
-        codex_model = os.getenv("CODEX_MODEL", "gpt-5.1")
-        summarizer = CodexOAuthSummarizer(model=codex_model)
-    elif llm_type == "openai":
-        summarizer = OpenAISummarizer(api_key)
-    else:
-        summarizer = GeminiSummarizer(api_key)
+    with recorder.stage("setup"):
+        if llm_type == "openai-oauth":
+            codex_model = os.getenv("CODEX_MODEL", "gpt-5.1")
+            summarizer = CodexOAuthSummarizer(model=codex_model)
+        elif llm_type == "openai":
+            summarizer = OpenAISummarizer(api_key)
+        else:
+            summarizer = GeminiSummarizer(api_key)
+    model_name = getattr(summarizer, "model_name", None) or getattr(summarizer, "model", "")
+    # 캐시/Map-Reduce로 감싸기 전의 엔진 (호출별 측정값 수집용)
+    engine = summarizer
+    recorder.set(model=model_name)
+
+    from claw_log.cache import CachedSummarizer, is_cache_enabled
+    if is_cache_enabled():
+        summarizer = CachedSummarizer(summarizer)
+    # Map-Reduce는 캐시 바깥에서 감싸서 변경 없는 프로젝트 조각은 캐시 적중
+    map_reduce = _is_map_reduce(args.map_reduce)
+    if map_reduce:
+        summarizer = MapReduceSummarizer(summarizer)
+    max_chars = _project_char_budget(map_reduce, model_name)
 
     engine_label = llm_type.upper()
     if llm_type == "openai-oauth":
         engine_label = f"OPENAI-OAUTH / {codex_model}"
-    days = args.days
     if days > 0:
-        print(f"🚀 Claw-Log 분석 시작 — 과거 {days}일 (Engine: {engine_label})...")
+        mode_label = ", 하루 단위" if per_day else ""
+        print(f"🚀 Claw-Log 분석 시작 — 과거 {days}일{mode_label} (Engine: {engine_label})...")
     else:
         print(f"🚀 Claw-Log 분석 시작 (Engine: {engine_label})...")
 
     # 5. Git 데이터 수집 (선택된 프로젝트만)
     target_paths = [p.strip() for p in paths_env.split(",") if p.strip()]
-    combined_diffs = ""
 
-    for repo_path_str in target_paths:
-        diff = get_git_diff_for_path(repo_path_str, days=days)
-        if diff:
-            p_name = Path(repo_path_str).name
-            print(f"  ✅ [{p_name}] 데이터 수집 완료")
-            combined_diffs += f"\n--- PROJECT: {p_name} ---\n{diff[:15000]}\n"
-        elif Path(repo_path_str).exists():
-            p_name = Path(repo_path_str).name
-            no_change_label = f"최근 {days}일 변경사항 없음" if days > 0 else "오늘 변경사항 없음"
-            print(f"  ⏭️  [{p_name}] {no_change_label}")
+    if per_day:
+        _run_per_day(summarizer, target_paths, days, args.jobs, max_chars, llm_type, model_name, map_reduce,
+                     recorder=recorder, engine=engine)
+        return
+
+    incremental = _is_incremental(args.incremental)
+    watermarks = load_watermarks() if incremental else None
+    new_watermarks = {}
+
+    with recorder.stage("collect"):
+        results = collect_diffs(target_paths, days=days, jobs=args.jobs, max_chars=max_chars, watermarks=watermarks)
+    recorder.add_repos(results)
+    for repo_path_str, _, stats in results:
+        if stats.get("head"):
+            new_watermarks[_watermark_key(repo_path_str)] = {
+                "head": stats["head"],
+                "worktree_hash": stats.get("worktree_hash"),
+            }
+    no_change_label = f"최근 {days}일 변경사항 없음" if days > 0 else "오늘 변경사항 없음"
+    with recorder.stage("payload"):
+        combined_diffs, project_names = _build_payload(results, max_chars, no_change_label, model_name, map_reduce)
+    recorder.set(payload_chars=len(combined_diffs), projects=len(project_names))
 
     if not combined_diffs:
         print("⚠️  변경사항이 발견되지 않았습니다. (종료)")
+        recorder.finish("no_changes")
         return
 
     # 요약 및 저장
     print("🤖 AI 요약 생성 중...")
-    summary = summarizer.summarize(combined_diffs)
-
-    if summary and not summary.startswith(("Gemini 요약 생성 실패", "OpenAI 요약 생성 실패")):
+    with recorder.stage("summarize"):
+        summary = run_summaries(summarizer, [combined_diffs])[0]
+    recorder.add_calls(engine.calls)
+    recorder.set(cache_hit=bool(getattr(summarizer, "last_hit", False)))
+    if getattr(summarizer, "last_hit", False):
+        print("  ♻️  동일한 입력의 캐시된 요약을 사용합니다. (API 호출 생략)")
+
+    if not is_error_summary(summary):
         if days > 0:
             start_date = (datetime.date.today() - datetime.timedelta(days=days)).strftime("%Y-%m-%d")
             end_date = datetime.date.today().strftime("%Y-%m-%d")
-            saved_file = prepend_to_log_file(summary, date_label=f"{start_date} ~ {end_date}")
+            date_label = f"{start_date} ~ {end_date}"
         else:
-            saved_file = prepend_to_log_file(summary)
+            date_label = None
+        with recorder.stage("store"):
+            saved_file = _save_summary(summary, date_label, _run_meta(llm_type, model_name, project_names, combined_diffs))
         print(f"\n💾 기록 완료: {saved_file}")
+        # 기록이 저장된 경우에만 워터마크 전진 (실패 시 다음 실행에서 다시 수집)
+        if incremental and saved_file and new_watermarks:
+            save_watermarks(new_watermarks)
+        if saved_file:
+            with recorder.stage("search_index"):
+                _sync_search_index()
+        recorder.finish("ok" if saved_file else "error")
         print("\n" + "="*60 + f"\n{summary}\n" + "="*60)
     else:
+        recorder.finish("error")
         print(f"❌ 요약 실패: {summary}")
 
+
+def _build_payload(results, max_chars, no_change_label, model=None, map_reduce=False):
+    """
+    수집 결과를 토큰 예산에 맞춰 LLM 입력으로 합칩니다.
+    반환: (payload, 변경이 있는 프로젝트 이름 목록)
+    """
+    collected = {}
+    for repo_path_str, diff, stats in results:
+        if not diff and Path(repo_path_str).exists():
+            print(f"  ⏭️  [{Path(repo_path_str).name}] {no_change_label}")
+        elif diff:
+            collected[repo_path_str] = (diff, stats)
+
+    fitted = _fit_projects([(Path(p).name, d) for p, (d, _) in collected.items()], model, map_reduce)
+    combined_diffs = ""
+    project_names = []
+    for (p_name, diff, tokens, dropped, _), (_, stats) in zip(fitted, collected.values()):
+        print(f"  ✅ [{p_name}] 데이터 수집 완료 ({tokens:,} 토큰){_format_dropped(dropped)}{_format_skipped(stats, max_chars)}")
+        combined_diffs += f"\n--- PROJECT: {p_name} ---\n{diff}\n"
+        project_names.append(p_name)
+    return combined_diffs, project_names
+
+
+def _run_meta(llm_type, model_name, project_names, combined_diffs):
+    """실행 메타데이터 (LOG_BACKEND=sqlite에서 엔트리와 함께 저장)"""
+    return {
+        "engine": llm_type,
+        "model": model_name,
+        "projects": project_names,
+        "payload_chars": len(combined_diffs),
+        "token_estimate": count_tokens(combined_diffs, model_name),
+    }
+
+
+def _save_summary(summary, date_label, meta):
+    if date_label:
+        return prepend_to_log_file(summary, date_label=date_label, meta=meta)
+    return prepend_to_log_file(summary, meta=meta)
+
+
+def _sync_search_index():
+    """검색 색인에 새 엔트리만 추가"""
+    try:
+        from claw_log.search import sync_index
+        sync_index()
+    except Exception as e:
+        print(f"⚠️ 검색 색인 갱신 실패: {e}")
+
+
+def _run_per_day(summarizer, target_paths, days, jobs, max_chars, llm_type, model_name, map_reduce=False,
+                 recorder=None, engine=None):
+    """
+    --days N --per-day: 기간을 하루 단위로 나눠 동시에 수집·요약하고, 날짜별 엔트리를 기록합니다.
+    요약 요청은 한꺼번에 보내되 엔진별 속도 제한(ratelimit)을 따릅니다.
+    recorder/engine: 단계별 소요 시간과 LLM 호출 기록 (metrics.RunRecorder, 캐시로 감싸기 전 요약기)
+    """
+    recorder = recorder or RunRecorder("per-day", engine=llm_type, days=days)
+    engine = engine or summarizer
+
+    with recorder.stage("collect"):
+        daily = collect_daily_diffs(target_paths, days, jobs=jobs, max_chars=max_chars)
+    batches = []
+    with recorder.stage("payload"):
+        for day, results in daily:
+            recorder.add_repos(results)
+            if not any(diff for _, diff, _ in results):
+                continue
+            print(f"📅 {day.isoformat()}")
+            combined_diffs, project_names = _build_payload(results, max_chars, "변경사항 없음", model_name, map_reduce)
+            batches.append((day, combined_diffs, project_names))
+    recorder.set(payload_chars=sum(len(payload) for _, payload, _ in batches), batches=len(batches))
+
+    if not batches:
+        print("⚠️  변경사항이 발견되지 않았습니다. (종료)")
+        recorder.finish("no_changes")
+        return
+
+    print(f"🤖 AI 요약 생성 중... ({len(batches)}일)")
+    with recorder.stage("summarize"):
+        summaries = run_summaries(summarizer, [payload for _, payload, _ in batches])
+    recorder.add_calls(getattr(engine, "calls", []))
+
+    # 오래된 날짜부터 기록해야 최신 날짜가 로그 맨 위에 옴
+    saved, failed = 0, 0
+    with recorder.stage("store"):
+        for (day, combined_diffs, project_names), summary in zip(batches, summaries):
+            if is_error_summary(summary):
+                failed += 1
+                print(f"❌ [{day.isoformat()}] 요약 실패: {summary}")
+                continue
+            meta = _run_meta(llm_type, model_name, project_names, combined_diffs)
+            if _save_summary(summary, day.isoformat(), meta):
+                saved += 1
+
+    print(f"\n💾 기록 완료: {saved}일" + (f" (실패 {failed}일)" if failed else ""))
+    if saved:
+        with recorder.stage("search_index"):
+            _sync_search_index()
+    recorder.finish("ok" if saved else "error")
+
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,243 @@
+"""
+Claw-Log Run Metrics
+실행(main)의 단계별 소요 시간을 측정해 runs.jsonl(scheduler.log와 같은 CWD)에 한 줄씩 기록하고,
+`claw-log --stats`로 최근 실행들의 p50/p95를 보여줍니다.
+- 단계: 설정/엔진 준비, 저장소별 git 수집(시간, 크기), payload 조립, LLM 요약, 로그 저장, 검색 색인
+- LLM 호출: 응답 시간, 대기(속도 제한/재시도), 시도 횟수, 스트리밍 엔진의 첫 토큰까지 시간(TTFT)
+"""
+
+import contextlib
+import json
+import math
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+
+RUNS_FILENAME = "runs.jsonl"
+RUNS_RECORD_VERSION = 1
+# runs.jsonl이 이 줄 수를 넘으면 오래된 기록부터 정리
+MAX_RUN_RECORDS = 1000
+DEFAULT_STATS_RUNS = 30
+
+_write_lock = threading.Lock()
+
+
+def is_run_stats_enabled():
+    """RUN_STATS=false 로 끌 수 있습니다. (기본: 사용)"""
+    return os.getenv("RUN_STATS", "true").lower() not in ("0", "false", "no")
+
+
+def _runs_path(filename=RUNS_FILENAME):
+    return Path.cwd() / filename
+
+
+def percentile(values, fraction):
+    """nearest-rank 백분위수 (values는 정렬되지 않아도 됨). 값이 없으면 None."""
+    values = sorted(values)
+    if not values:
+        return None
+    rank = max(1, math.ceil(fraction * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+class RunRecorder:
+    """
+    실행 한 번의 측정값을 모읍니다.
+    stage()로 단계 시간을 재고, add_repo()/set()으로 세부 값을 더한 뒤 finish()에서 기록합니다.
+    """
+
+    def __init__(self, mode, **fields):
+        self.started = time.perf_counter()
+        self.record = {
+            "version": RUNS_RECORD_VERSION,
+            "run_id": uuid.uuid4().hex[:12],
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "mode": mode,
+            "stages": {},
+            "repos": [],
+            "calls": [],
+        }
+        self.record.update(fields)
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """같은 이름의 단계는 누적 (per-day 모드의 날짜별 반복 등)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = (time.perf_counter() - start) * 1000
+            stages = self.record["stages"]
+            stages[name] = round(stages.get(name, 0.0) + elapsed, 1)
+
+    def add_repos(self, results):
+        """collect_diffs 결과의 저장소별 수집 시간/크기를 기록합니다."""
+        for repo_path_str, diff, stats in results:
+            self.record["repos"].append({
+                "name": Path(repo_path_str).name,
+                "collect_ms": stats.get("collect_ms"),
+                "bytes": len(diff.encode("utf-8")) if diff else 0,
+                "skipped_files": len(stats.get("skipped_files") or ()),
+                "truncated": bool(stats.get("truncated")),
+            })
+
+    def add_calls(self, calls):
+        self.record["calls"].extend(calls)
+
+    def set(self, **fields):
+        self.record.update(fields)
+
+    def finish(self, status, filename=RUNS_FILENAME):
+        """총 소요 시간을 채우고 runs.jsonl에 추가합니다. 기록 실패는 실행 결과에 영향을 주지 않음."""
+        self.record["status"] = status
+        self.record["total_ms"] = round((time.perf_counter() - self.started) * 1000, 1)
+        if not is_run_stats_enabled():
+            return None
+        try:
+            append_run_record(self.record, filename)
+        except OSError as e:
+            print(f"⚠️ 실행 기록 저장 실패: {e}")
+            return None
+        return self.record
+
+
+def append_run_record(record, filename=RUNS_FILENAME):
+    path = _runs_path(filename)
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    with _write_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line)
+        _trim_runs(path)
+
+
+def _trim_runs(path):
+    """MAX_RUN_RECORDS의 1.2배를 넘으면 최근 MAX_RUN_RECORDS줄만 남김 (매번 다시 쓰지 않도록 여유를 둠)."""
+    try:
+        if path.stat().st_size < MAX_RUN_RECORDS * 200:
+            return
+        with open(path, "r", encoding="utf-8") as f:
+            lines = f.readlines()
+    except OSError:
+        return
+    if len(lines) <= MAX_RUN_RECORDS * 1.2:
+        return
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.writelines(lines[-MAX_RUN_RECORDS:])
+    os.replace(tmp_path, path)
+
+
+def load_run_records(limit=DEFAULT_STATS_RUNS, filename=RUNS_FILENAME):
+    """최근 limit개의 실행 기록 (오래된 것부터). 깨진 줄은 건너뜀."""
+    path = _runs_path(filename)
+    if not path.exists():
+        return []
+    records = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+    return records[-limit:] if limit else records
+
+
+def summarize_runs(records):
+    """
+    실행 기록들의 단계별/LLM 호출별/저장소별 p50·p95를 계산합니다.
+    반환: {"runs", "stages": {이름: {...}}, "calls": {항목: {...}}, "repos": {이름: {...}}, "recent": [...]}
+    """
+    def _dist(values):
+        values = [v for v in values if v is not None]
+        return {"count": len(values), "p50": percentile(values, 0.5), "p95": percentile(values, 0.95)}
+
+    stage_names = []
+    for record in records:
+        for name in list(record.get("stages", {})) + ["total"]:
+            if name not in stage_names:
+                stage_names.append(name)
+    stages = {
+        name: _dist(r.get("total_ms") if name == "total" else r.get("stages", {}).get(name) for r in records)
+        for name in stage_names
+    }
+
+    calls = [c for r in records for c in r.get("calls", [])]
+    call_stats = {
+        key: _dist(c.get(key) for c in calls)
+        for key in ("latency_ms", "ttft_ms", "request_ms", "wait_ms")
+    }
+    call_stats["retried"] = sum(1 for c in calls if c.get("attempts", 1) > 1)
+    call_stats["failed"] = sum(1 for c in calls if not c.get("ok", True))
+
+    repos = {}
+    for record in records:
+        for repo in record.get("repos", []):
+            repos.setdefault(repo.get("name", "?"), []).append(repo)
+    repo_stats = {
+        name: dict(_dist(e.get("collect_ms") for e in entries),
+                   bytes_p50=percentile([e.get("bytes", 0) for e in entries], 0.5))
+        for name, entries in repos.items()
+    }
+
+    recent = [
+        {key: r.get(key) for key in ("started_at", "mode", "engine", "status", "total_ms", "payload_chars")}
+        for r in records[-5:]
+    ]
+    return {"runs": len(records), "stages": stages, "calls": call_stats, "repos": repo_stats, "recent": recent}
+
+
+def _ms(value):
+    if value is None:
+        return "-"
+    return f"{value / 1000:.1f}s" if value >= 10000 else f"{value:,.0f}ms"
+
+
+def show_run_stats(limit=DEFAULT_STATS_RUNS):
+    """claw-log --stats: 최근 실행들의 단계별 p50/p95 출력"""
+    records = load_run_records(limit)
+    if not records:
+        print(f"\n📈 실행 기록이 없습니다. ({RUNS_FILENAME})")
+        print("   👉 'claw-log'를 실행하면 단계별 소요 시간이 기록됩니다. (.env: RUN_STATS=false 로 끄기)")
+        return
+    summary = summarize_runs(records)
+
+    print(f"\n📈 최근 {summary['runs']}회 실행 통계 ({_runs_path()})")
+    print("=" * 50)
+    print(f"  {'단계':<16}{'p50':>10}{'p95':>10}{'횟수':>8}")
+    for name, d in summary["stages"].items():
+        print(f"  {name:<16}{_ms(d['p50']):>10}{_ms(d['p95']):>10}{d['count']:>8}")
+
+    calls = summary["calls"]
+    if calls["latency_ms"]["count"]:
+        print("-" * 50)
+        print(f"  LLM 호출 {calls['latency_ms']['count']}회 (재시도 {calls['retried']}회, 실패 {calls['failed']}회)")
+        labels = (("latency_ms", "응답 시간"), ("ttft_ms", "첫 토큰(TTFT)"), ("wait_ms", "대기(제한/재시도)"))
+        for key, label in labels:
+            d = calls[key]
+            if d["count"]:
+                print(f"  {label:<16}{_ms(d['p50']):>10}{_ms(d['p95']):>10}{d['count']:>8}")
+
+    if summary["repos"]:
+        print("-" * 50)
+        print(f"  {'저장소 수집':<16}{'p50':>10}{'p95':>10}{'크기':>10}")
+        ranked = sorted(summary["repos"].items(), key=lambda item: -(item[1]["p95"] or 0))
+        for name, d in ranked[:10]:
+            size = d["bytes_p50"] or 0
+            print(f"  {name[:16]:<16}{_ms(d['p50']):>10}{_ms(d['p95']):>10}{size / 1024:>8.0f}KB")
+        if len(ranked) > 10:
+            print(f"  ... 외 {len(ranked) - 10}개")
+
+    print("-" * 50)
+    print("  최근 실행")
+    for r in reversed(summary["recent"]):
+        status = {"ok": "✅", "no_changes": "⏭️ ", "error": "❌"}.get(r.get("status"), "•")
+        print(f"  {status} {r.get('started_at', '?')}  {r.get('mode', ''):<8} {_ms(r.get('total_ms')):>8}"
+              f"  {r.get('engine') or ''}")
+    print("=" * 50)
@@ -0,0 +1,388 @@
+"""
+Claw-Log Mock LLM Server
+네트워크 없이 엔진 계층(동시성, 재시도, 스트리밍)을 부하/지연 테스트하기 위한 로컬 대역 서버.
+OpenAI chat-completions, Gemini generateContent, Codex responses(SSE) 형식으로 응답합니다.
+
+    python -m claw_log.mockllm --port 8765 --latency 0.5 --tokens-per-second 200 --error-rate 0.1
+
+엔진은 .env의 기본 URL 설정으로 이 서버를 가리키게 합니다.
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1
+    GEMINI_BASE_URL=http://127.0.0.1:8765
+    CODEX_BASE_URL=http://127.0.0.1:8765/backend-api/codex
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse
+
+DEFAULT_PORT = 8765
+# 토큰당 글자 수 근사값 (처리량 → 전송 속도 환산용)
+CHARS_PER_TOKEN = 4
+
+_GEMINI_PATH_RE = re.compile(r"^/(?:v1|v1beta|v1alpha)/models/([^/:]+):(generateContent|streamGenerateContent)$")
+_PROJECT_RE = re.compile(r"^--- PROJECT: (.+?) ---$", re.MULTILINE)
+
+
+class MockConfig:
+    """
+    응답 동작 설정.
+    - latency: 첫 바이트까지의 지연(초), jitter: 지연에 더할 임의 값 상한(초)
+    - tokens_per_second: 응답 생성 속도 (0이면 즉시)
+    - chunk_chars: 스트리밍 조각 하나의 글자 수
+    - response_chars: 응답 본문 길이
+    - error_rate: 429를 돌려줄 확률, fail_first: 처음 N개 요청은 무조건 429
+    - retry_after: 429 응답의 Retry-After(초, 0이면 헤더 없음)
+    - max_concurrent: 동시에 처리 중인 요청이 이보다 많으면 429 (0이면 제한 없음)
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, tokens_per_second=0.0, chunk_chars=16, response_chars=800,
+                 error_rate=0.0, fail_first=0, retry_after=1.0, max_concurrent=0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.tokens_per_second = tokens_per_second
+        self.chunk_chars = max(1, chunk_chars)
+        self.response_chars = max(1, response_chars)
+        self.error_rate = error_rate
+        self.fail_first = fail_first
+        self.retry_after = retry_after
+        self.max_concurrent = max_concurrent
+        self.random = random.Random(seed)
+
+
+class MockState:
+    """요청 통계 (GET /stats) 및 동시 처리 수."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = {}
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.total = 0
+
+    def enter(self, route):
+        with self.lock:
+            self.total += 1
+            self.requests[route] = self.requests.get(route, 0) + 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            return self.total, self.in_flight
+
+    def leave(self):
+        with self.lock:
+            self.in_flight -= 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "total": self.total,
+                "requests": dict(self.requests),
+                "rate_limited": self.rate_limited,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+            }
+
+
+def _summary_text(prompt, chars):
+    """요청에 들어 있는 프로젝트 이름으로 요약 형식의 응답 본문을 chars 길이로 만듭니다."""
+    names = _PROJECT_RE.findall(prompt) or ["mock-project"]
+    blocks = []
+    for name in names:
+        blocks.append(
+            f"### 📂 [{name}]\n> **핵심 성과**: 모의 응답으로 생성된 요약입니다.\n\n"
+            f"- **🛠 상세 내역**\n  - 입력 {len(prompt):,}자를 처리함\n"
+        )
+    text = "\n".join(blocks)
+    filler = "  - 세부 변경 사항을 정리함\n"
+    while len(text) < chars:
+        text += filler
+    return text[:max(chars, len(blocks[0]))]
+
+
+def _chunks(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    # keep-alive: 클라이언트 연결 풀 재사용 경로도 그대로 측정
+    protocol_version = "HTTP/1.1"
+    config = MockConfig()
+    state = MockState()
+
+    def log_message(self, format, *args):
+        pass
+
+    # ── 라우팅 ──
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/stats":
+            self._send_json(200, self.state.snapshot())
+        else:
+            self._send_json(404, {"error": {"message": "not found"}})
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        body = self._read_json()
+        if path.endswith("/chat/completions"):
+            route, handler = "openai", self._openai
+        elif path.endswith("/responses"):
+            route, handler = "codex", self._codex
+        else:
+            m = _GEMINI_PATH_RE.match(path)
+            if not m:
+                self._send_json(404, {"error": {"message": f"unknown path: {path}"}})
+                return
+            route, handler = "gemini", lambda b: self._gemini(b, m.group(1), m.group(2) == "streamGenerateContent")
+
+        seq, in_flight = self.state.enter(route)
+        try:
+            if self._should_rate_limit(seq, in_flight):
+                with self.state.lock:
+                    self.state.rate_limited += 1
+                self._rate_limited(route)
+                return
+            self._wait_first_byte()
+            handler(body)
+        finally:
+            self.state.leave()
+
+    # ── 형식별 응답 ──
+
+    def _openai(self, body):
+        prompt = "\n".join(str(m.get("content", "")) for m in body.get("messages", []))
+        text = _summary_text(prompt, self.config.response_chars)
+        model = body.get("model", "mock")
+        created = int(time.time())
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        usage = {"prompt_tokens": len(prompt) // CHARS_PER_TOKEN,
+                 "completion_tokens": len(text) // CHARS_PER_TOKEN}
+        usage["total_tokens"] = usage["prompt_tokens"] + usage["completion_tokens"]
+
+        if not body.get("stream"):
+            self._generate_delay(text)
+            self._send_json(200, {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+            return
+
+        def _events():
+            for piece in _chunks(text, self.config.chunk_chars):
+                yield {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                       "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+            yield {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                   "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]}
+
+        self._send_sse(_events(), len(text))
+
+    def _gemini(self, body, model, stream):
+        prompt = "\n".join(
+            part.get("text", "")
+            for content in body.get("contents", [])
+            for part in (content.get("parts", []) if isinstance(content, dict) else [])
+        )
+        text = _summary_text(prompt, self.config.response_chars)
+
+        def _response(piece, finished):
+            candidate = {"content": {"parts": [{"text": piece}], "role": "model"}, "index": 0}
+            if finished:
+                candidate["finishReason"] = "STOP"
+            return {
+                "candidates": [candidate],
+                "usageMetadata": {"promptTokenCount": len(prompt) // CHARS_PER_TOKEN,
+                                  "candidatesTokenCount": len(text) // CHARS_PER_TOKEN,
+                                  "totalTokenCount": (len(prompt) + len(text)) // CHARS_PER_TOKEN},
+                "modelVersion": model,
+            }
+
+        if not stream:
+            self._generate_delay(text)
+            self._send_json(200, _response(text, True))
+            return
+
+        pieces = _chunks(text, self.config.chunk_chars)
+        self._send_sse((_response(p, i == len(pieces) - 1) for i, p in enumerate(pieces)), len(text), done=False)
+
+    def _codex(self, body):
+        prompt = str(body.get("instructions", "")) + "\n" + "\n".join(
+            str(item.get("content", "")) for item in body.get("input", []) if isinstance(item, dict)
+        )
+        text = _summary_text(prompt, self.config.response_chars)
+        response_id = f"resp_{uuid.uuid4().hex[:24]}"
+
+        def _events():
+            yield {"type": "response.created", "response": {"id": response_id, "status": "in_progress"}}
+            for piece in _chunks(text, self.config.chunk_chars):
+                yield {"type": "response.output_text.delta", "delta": piece}
+            yield {"type": "response.output_text.done", "text": text}
+            yield {"type": "response.completed", "response": {"id": response_id, "status": "completed"}}
+
+        self._send_sse(_events(), len(text))
+
+    # ── 지연 / 오류 주입 ──
+
+    def _should_rate_limit(self, seq, in_flight):
+        config = self.config
+        if seq <= config.fail_first:
+            return True
+        if config.max_concurrent and in_flight > config.max_concurrent:
+            return True
+        return config.error_rate > 0 and config.random.random() < config.error_rate
+
+    def _rate_limited(self, route):
+        headers = {}
+        if self.config.retry_after:
+            headers["Retry-After"] = f"{self.config.retry_after:g}"
+        if route == "gemini":
+            payload = {"error": {
+                "code": 429, "message": "Resource has been exhausted (mock).", "status": "RESOURCE_EXHAUSTED",
+                "details": [{"@type": "type.googleapis.com/google.rpc.RetryInfo",
+                             "retryDelay": f"{self.config.retry_after:g}s"}],
+            }}
+        elif route == "openai":
+            payload = {"error": {"message": "Rate limit reached (mock).", "type": "rate_limit_error",
+                                 "code": "rate_limit_exceeded"}}
+        else:
+            payload = {"detail": "Rate limit reached (mock)."}
+        self._send_json(429, payload, headers)
+
+    def _wait_first_byte(self):
+        delay = self.config.latency
+        if self.config.jitter:
+            delay += self.config.random.uniform(0, self.config.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _chunk_delay(self, chars):
+        if self.config.tokens_per_second <= 0:
+            return 0.0
+        return chars / (self.config.tokens_per_second * CHARS_PER_TOKEN)
+
+    def _generate_delay(self, text):
+        """스트리밍하지 않는 응답은 전체 생성 시간만큼 기다린 뒤 한 번에 보냄."""
+        delay = self._chunk_delay(len(text))
+        if delay > 0:
+            time.sleep(delay)
+
+    # ── 전송 ──
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            return json.loads(raw or b"{}")
+        except ValueError:
+            return {}
+
+    def _send_json(self, status, payload, headers=None):
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_sse(self, events, total_chars, done=True):
+        """이벤트를 'data: ...' 줄로 chunked 전송합니다. 조각마다 처리량에 맞춰 기다림."""
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        per_chunk = self._chunk_delay(self.config.chunk_chars)
+        try:
+            for event in events:
+                if per_chunk:
+                    time.sleep(per_chunk)
+                self._write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+            if done:
+                self._write_chunk(b"data: [DONE]\n\n")
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+
+def start_mock_server(config=None, host="127.0.0.1", port=0):
+    """
+    모의 서버를 백그라운드 스레드로 시작합니다. (벤치마크/테스트용)
+    반환: (server, base_url). 종료는 server.shutdown(); server.server_close()
+    """
+    handler = type("ConfiguredMockLLMHandler", (MockLLMHandler,),
+                   {"config": config or MockConfig(), "state": MockState()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def base_url_env(base_url):
+    """모의 서버를 가리키는 엔진별 기본 URL 설정 (.env 형식 키 → 값)."""
+    return {
+        "OPENAI_BASE_URL": f"{base_url}/v1",
+        "GEMINI_BASE_URL": base_url,
+        "CODEX_BASE_URL": f"{base_url}/backend-api/codex",
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m claw_log.mockllm", description="Claw-Log 모의 LLM 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"포트 (기본: {DEFAULT_PORT})")
+    parser.add_argument("--latency", type=float, default=0.0, help="첫 바이트까지의 지연(초)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="지연에 더할 임의 값 상한(초)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="응답 생성 속도 (0: 즉시)")
+    parser.add_argument("--chunk-chars", type=int, default=16, help="스트리밍 조각 글자 수 (기본: 16)")
+    parser.add_argument("--response-chars", type=int, default=800, help="응답 본문 길이 (기본: 800)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="429 응답 확률 (0~1)")
+    parser.add_argument("--fail-first", type=int, default=0, help="처음 N개 요청은 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="429의 Retry-After 초 (0: 헤더 없음)")
+    parser.add_argument("--max-concurrent", type=int, default=0, help="동시 처리 한도, 초과 시 429 (0: 제한 없음)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = MockConfig(
+        latency=args.latency, jitter=args.jitter, tokens_per_second=args.tokens_per_second,
+        chunk_chars=args.chunk_chars, response_chars=args.response_chars, error_rate=args.error_rate,
+        fail_first=args.fail_first, retry_after=args.retry_after, max_concurrent=args.max_concurrent,
+        seed=args.seed,
+    )
+    MockLLMHandler.config = config
+    try:
+        server = ThreadingHTTPServer((args.host, args.port), MockLLMHandler)
+    except OSError:
+        print(f"\n❌ 포트 {args.port}이 이미 사용 중입니다.")
+        return 1
+    server.daemon_threads = True
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+
+    print(f"\n🧪 Claw-Log 모의 LLM 서버 시작 — {base_url}")
+    print("   .env에 아래 설정을 추가하면 엔진이 이 서버로 요청합니다:")
+    for key, value in base_url_env(base_url).items():
+        print(f"   {key}={value}")
+    print(f"   통계: {base_url}/stats")
+    print("   종료: Ctrl+C\n")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 모의 LLM 서버를 종료합니다.")
+    finally:
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+"""
+Claw-Log Rate Limiter
+LLM 호출을 엔진/모델별 토큰 버킷(분당 요청 수, 분당 토큰 수)으로 조절하고,
+429 등 일시적인 오류는 Retry-After와 지터가 섞인 지수 백오프로 재시도합니다.
+"""
+
+import os
+import random
+import re
+import threading
+import time
+
+DEFAULT_MAX_RETRIES = 4
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+
+# 일시적인 오류로 보고 재시도하는 HTTP 상태 코드
+RETRYABLE_STATUS = (408, 409, 429, 500, 502, 503, 504)
+RETRYABLE_MARKERS = ("RESOURCE_EXHAUSTED", "UNAVAILABLE", "RateLimitError", "APIConnectionError", "APITimeoutError")
+
+_RETRY_DELAY_RE = re.compile(r"retryDelay['\"]?\s*:\s*['\"](\d+(?:\.\d+)?)s")
+
+_registry = {}
+_registry_lock = threading.Lock()
+
+
+def _env_float(name, default):
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def max_retries():
+    """재시도 횟수 (.env: LLM_MAX_RETRIES, 기본 4). 0이면 재시도하지 않음."""
+    return max(0, int(_env_float("LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES)))
+
+
+class TokenBucket:
+    """
+    분당 per_minute만큼 채워지는 토큰 버킷.
+    reserve()는 즉시 차감하고 기다려야 할 시간을 반환하므로(잔량이 음수면 그만큼 대기),
+    동시에 요청한 호출들도 순서대로 간격을 두고 실행됩니다. per_minute가 0이면 제한 없음.
+    """
+
+    def __init__(self, per_minute):
+        self.capacity = max(0.0, float(per_minute))
+        self.rate = self.capacity / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount, now):
+        if not self.capacity:
+            return 0.0
+        # 한 번에 버킷 크기보다 큰 요청은 가득 찬 버킷 하나 분량으로 취급
+        amount = min(float(amount), self.capacity)
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= amount
+        return 0.0 if self.level >= 0 else -self.level / self.rate
+
+
+class RateLimiter:
+    """엔진/모델 하나의 요청 수·토큰 수 버킷과 Retry-After 일시 정지 상태."""
+
+    def __init__(self, rpm=0, tpm=0):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens):
+        """요청 1건과 tokens만큼을 예약하고, 호출 전에 기다려야 할 시간(초)을 반환합니다."""
+        with self._lock:
+            now = time.monotonic()
+            return max(
+                self.blocked_until - now,
+                self.requests.reserve(1, now),
+                self.tokens.reserve(tokens, now),
+                0.0,
+            )
+
+    def acquire(self, tokens):
+        delay = self.reserve(tokens)
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self, tokens):
+        import asyncio
+        delay = self.reserve(tokens)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds):
+        """서버가 Retry-After로 지정한 시간 동안 같은 엔진/모델의 모든 호출을 멈춥니다."""
+        with self._lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+
+
+def get_limiter(engine, model, rpm=0, tpm=0):
+    """
+    엔진/모델별로 공유되는 RateLimiter를 반환합니다.
+    .env의 RATE_LIMIT_RPM / RATE_LIMIT_TPM이 있으면 엔진 기본값 대신 사용합니다.
+    """
+    key = (engine, model)
+    with _registry_lock:
+        limiter = _registry.get(key)
+        if limiter is None:
+            limiter = RateLimiter(
+                rpm=_env_float("RATE_LIMIT_RPM", rpm),
+                tpm=_env_float("RATE_LIMIT_TPM", tpm),
+            )
+            _registry[key] = limiter
+        return limiter
+
+
+# ── 재시도 판단 ──
+
+def error_status(exc):
+    """예외에서 HTTP 상태 코드를 추출합니다. 없으면 None."""
+    for attr in ("status_code", "code"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, "response", None)
+    value = getattr(response, "status_code", None)
+    return value if isinstance(value, int) else None
+
+
+def is_retryable(exc):
+    """429, 5xx, 연결 오류처럼 다시 시도하면 성공할 수 있는 오류인지 판별합니다."""
+    if error_status(exc) in RETRYABLE_STATUS:
+        return True
+    try:
+        import httpx
+        if isinstance(exc, httpx.TransportError):
+            return True
+    except ImportError:
+        pass
+    text = f"{type(exc).__name__}: {exc}"
+    return any(marker in text for marker in RETRYABLE_MARKERS)
+
+
+def retry_after(exc):
+    """응답의 Retry-After 헤더(초) 또는 Gemini RetryInfo의 retryDelay를 반환합니다. 없으면 None."""
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if headers is not None:
+        value = headers.get("retry-after-ms")
+        if value:
+            try:
+                return float(value) / 1000
+            except ValueError:
+                pass
+        value = headers.get("retry-after")
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                from email.utils import parsedate_to_datetime
+                try:
+                    return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+    m = _RETRY_DELAY_RE.search(str(exc))
+    return float(m.group(1)) if m else None
+
+
+def backoff_delay(attempt, server_delay=None):
+    """
+    attempt번째(0부터) 재시도 전 대기 시간.
+    서버가 지정한 시간이 있으면 그만큼 + 약간의 지터, 없으면 지수 백오프 상한의 50~100% 사이 임의 값.
+    """
+    if server_delay is not None:
+        return server_delay + random.uniform(0, 1.0)
+    cap = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * (2 ** attempt))
+    return random.uniform(cap / 2, cap)
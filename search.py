@@ -0,0 +1,182 @@
+"""
+Claw-Log Search Index
+career_logs의 '## 📅' 엔트리를 SQLite FTS5로 색인하여 전문 검색을 제공합니다.
+엔트리 내용 해시 기준으로 증분 갱신하므로, 실행할 때마다 새로 추가된 엔트리만 색인합니다.
+로그 파일의 (크기, mtime)이 마지막 동기화 때와 같으면 색인 갱신을 건너뜁니다.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+
+from claw_log.storage import LOG_FILENAME, get_log_backend, get_log_signature, iter_log_entries, list_log_digests
+
+SEARCH_DB_FILENAME = ".career_logs.search.db"
+DEFAULT_LIMIT = 20
+
+# 대시보드(ThreadingHTTPServer)의 동시 검색이 같은 엔트리를 중복 색인하지 않도록
+_sync_lock = threading.Lock()
+
+
+def _db_path(filename=SEARCH_DB_FILENAME):
+    return Path.cwd() / filename
+
+
+def _connect(db_path):
+    conn = sqlite3.connect(str(db_path), timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS docs ("
+        " id INTEGER PRIMARY KEY, hash TEXT UNIQUE NOT NULL, date TEXT, text TEXT NOT NULL)"
+    )
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type='table' AND name='docs_fts'"
+    ).fetchone()
+    if not exists:
+        # trigram: 한국어(조사 포함)나 코드 식별자도 부분 문자열로 검색 가능 (SQLite 3.34+)
+        try:
+            conn.execute(
+                "CREATE VIRTUAL TABLE docs_fts USING fts5("
+                "text, content='docs', content_rowid='id', tokenize='trigram')"
+            )
+        except sqlite3.OperationalError:
+            conn.execute(
+                "CREATE VIRTUAL TABLE docs_fts USING fts5("
+                "text, content='docs', content_rowid='id', tokenize='unicode61')"
+            )
+    return conn
+
+
+def _log_signature(log_filename):
+    return json.dumps([get_log_backend(), get_log_signature(log_filename)])
+
+
+def _stored_signature(conn):
+    row = conn.execute("SELECT value FROM meta WHERE key = 'log_signature'").fetchone()
+    return row[0] if row else None
+
+
+def sync_index(log_filename=LOG_FILENAME, db_filename=SEARCH_DB_FILENAME):
+    """
+    로그와 검색 색인을 동기화합니다. 새 엔트리만 색인하고, 사라진 엔트리는 삭제합니다.
+    로그가 마지막 동기화 이후 바뀌지 않았으면 바로 반환하고, 새 엔트리는 로그를 한 번만 훑어 읽습니다.
+    반환: (추가된 수, 삭제된 수)
+    """
+    with _sync_lock:
+        conn = _connect(_db_path(db_filename))
+        try:
+            signature = _log_signature(log_filename)
+            if _stored_signature(conn) == signature:
+                return 0, 0
+            # 다른 프로세스(스케줄 실행, 대시보드)와 동시에 갱신하지 않도록 쓰기 잠금 후 다시 확인
+            conn.execute("BEGIN IMMEDIATE")
+            if _stored_signature(conn) == signature:
+                conn.rollback()
+                return 0, 0
+            added, removed = _sync_docs(conn, log_filename)
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('log_signature', ?)", (signature,)
+            )
+            conn.commit()
+            return added, removed
+        finally:
+            conn.close()
+
+
+def _sync_docs(conn, log_filename):
+    current = {d["hash"]: d for d in list_log_digests(log_filename)}
+    indexed = dict(conn.execute("SELECT hash, id FROM docs").fetchall())
+
+    removed = [h for h in indexed if h not in current]
+    for digest in removed:
+        doc_id = indexed[digest]
+        text = conn.execute("SELECT text FROM docs WHERE id=?", (doc_id,)).fetchone()[0]
+        conn.execute("INSERT INTO docs_fts(docs_fts, rowid, text) VALUES('delete', ?, ?)", (doc_id, text))
+        conn.execute("DELETE FROM docs WHERE id=?", (doc_id,))
+
+    # {최신순 위치: 엔트리 요약} — 위치 순서대로 로그를 한 번 훑으며 필요한 것만 색인
+    missing = {d["position"]: d for digest, d in current.items() if digest not in indexed}
+    added = 0
+    if missing:
+        last = max(missing)
+        entries = iter_log_entries(filename=log_filename)
+        try:
+            for entry in entries:
+                if entry["position"] > last:
+                    break
+                d = missing.get(entry["position"])
+                # 목록을 만든 뒤 로그가 바뀌어 위치가 어긋났으면 건너뜀 (다음 동기화에서 색인)
+                if d is None or entry["date"] != d["date"]:
+                    continue
+                cur = conn.execute(
+                    "INSERT OR IGNORE INTO docs(hash, date, text) VALUES (?, ?, ?)",
+                    (d["hash"], d["date"], entry["text"]),
+                )
+                if cur.rowcount:
+                    conn.execute("INSERT INTO docs_fts(rowid, text) VALUES (?, ?)", (cur.lastrowid, entry["text"]))
+                    added += 1
+        finally:
+            entries.close()
+    return added, len(removed)
+
+
+def _build_match_query(query):
+    """사용자 검색어를 FTS5 MATCH 식으로 변환합니다. 공백으로 나눈 각 단어를 모두 포함(AND)."""
+    terms = [t for t in query.split() if t]
+    return " AND ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def search_logs(query, limit=DEFAULT_LIMIT, log_filename=LOG_FILENAME, db_filename=SEARCH_DB_FILENAME):
+    """
+    로그 엔트리를 전문 검색합니다. 로그가 바뀌었으면 검색 전에 새 엔트리를 증분 색인합니다.
+    반환: (결과 목록, 오류 메시지). 결과 항목: {"date", "snippet", "text"} (관련도순)
+    """
+    query = (query or "").strip()
+    if not query:
+        return None, "검색어를 입력하세요."
+
+    try:
+        sync_index(log_filename, db_filename)
+    except Exception as e:
+        return None, f"검색 색인 갱신 실패: {e}"
+
+    conn = _connect(_db_path(db_filename))
+    try:
+        # trigram은 3글자 미만 단어를 MATCH로 찾지 못하므로 그 경우 LIKE로 검색
+        if any(len(t) < 3 for t in query.split()):
+            clauses = " AND ".join("docs.text LIKE ?" for _ in query.split())
+            rows = conn.execute(
+                f"SELECT date, '', text FROM docs WHERE {clauses} ORDER BY date DESC LIMIT ?",
+                [f"%{t}%" for t in query.split()] + [limit],
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT docs.date, snippet(docs_fts, 0, '[', ']', '…', 16), docs.text "
+                "FROM docs_fts JOIN docs ON docs.id = docs_fts.rowid "
+                "WHERE docs_fts MATCH ? ORDER BY bm25(docs_fts), docs.date DESC LIMIT ?",
+                (_build_match_query(query), limit),
+            ).fetchall()
+    except sqlite3.OperationalError as e:
+        return None, f"검색 실패: {e}"
+    finally:
+        conn.close()
+
+    results = []
+    for date, snippet, text in rows:
+        if not snippet:
+            snippet = _plain_snippet(text, query.split()[0])
+        results.append({"date": date, "snippet": snippet.replace("\n", " "), "text": text})
+    return results, None
+
+
+def _plain_snippet(text, term, width=60):
+    """LIKE 검색 결과용 간이 발췌문 (첫 일치 위치 전후)."""
+    m = re.search(re.escape(term), text, flags=re.IGNORECASE)
+    if not m:
+        return text[:width * 2]
+    start = max(0, m.start() - width)
+    end = min(len(text), m.end() + width)
+    return ("…" if start else "") + text[start:m.start()] + f"[{m.group(0)}]" + text[m.end():end] + ("…" if end < len(text) else "")
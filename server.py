@@ -3,26 +3,38 @@ Claw-Log Dashboard Server
 로컬 웹 대시보드: 설정, 프로젝트, 스케줄, 커리어 로그를 브라우저에서 읽기 전용 조회.
 """
 
+import gzip
+import hashlib
 import json
 import re
 import signal
 import threading
+import time
 import webbrowser
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
 from html import escape
-from http.server import HTTPServer, BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 from pathlib import Path
+from urllib.parse import urlparse, parse_qs
 
 # NOTE: main.py에서 lazy import로 server를 호출하므로 circular import 없음.
 # _read_env_data/ENV_PATH를 별도 config 모듈로 분리하면 더 안전함. (TODO)
 from claw_log.main import _read_env_data, ENV_PATH
-from claw_log.storage import read_recent_logs
+from claw_log.storage import read_recent_logs, get_log_overview, get_log_signature, query_log_entries
 from claw_log.scheduler import get_schedule_summary
 
 
+# 스케줄 조회(crontab -l 등 서브프로세스)를 다시 하기까지의 시간 (초)
+SCHEDULE_TTL = 60
+# 이 크기(bytes) 이상인 응답만 gzip/deflate 압축
+COMPRESS_MIN_BYTES = 1024
+
+
 # ── 데이터 수집 ──
 
-def _collect_dashboard_data():
-    """대시보드에 표시할 데이터를 수집합니다."""
+def _collect_dashboard_data(schedule=None):
+    """대시보드에 표시할 데이터를 수집합니다. schedule을 넘기면 스케줄 조회를 생략."""
     env_data = _read_env_data()
 
     # 설정
@@ -63,22 +75,182 @@ def _collect_dashboard_data():
                 })
 
     # 스케줄
-    schedule = get_schedule_summary()
+    if schedule is None:
+        schedule = get_schedule_summary()
 
-    # 로그
+    # 로그 (전체 건수는 오프셋 인덱스에서 조회 — 파일 전체를 파싱하지 않음)
     entries, error = read_recent_logs(n=20)
     logs = entries if entries else []
     log_error = error
+    try:
+        overview = get_log_overview()
+    except Exception:
+        overview = None
+    log_total = overview["entries"] if overview else len(logs)
 
     return {
         "settings": settings,
         "projects": projects,
         "schedule": schedule,
         "logs": logs,
+        "log_total": log_total,
         "log_error": log_error,
     }
 
 
+# ── 렌더링 캐시 ──
+# 같은 상태(.env mtime, 로그 파일 크기/mtime, 스케줄 조회 시각)라면 다시 수집·렌더링하지 않고
+# 이미 만든 응답 본문을 그대로 돌려줍니다. 여러 탭/폴링 요청이 동시에 와도 렌더링은 한 번만 수행.
+
+_cache_lock = threading.Lock()
+_render_cache = {"key": None, "data": None, "pages": {}}
+_schedule_cache = {"at": None, "value": None, "changed_at": time.time()}
+
+
+def _file_signature(path):
+    try:
+        stat = Path(path).stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _cached_schedule():
+    """SCHEDULE_TTL 동안 스케줄 조회 결과를 재사용합니다. 반환: (조회 시각, 요약 문자열)"""
+    now = time.monotonic()
+    if _schedule_cache["at"] is None or now - _schedule_cache["at"] > SCHEDULE_TTL:
+        value = get_schedule_summary()
+        if value != _schedule_cache["value"]:
+            _schedule_cache["changed_at"] = time.time()
+        _schedule_cache["value"] = value
+        _schedule_cache["at"] = now
+    return _schedule_cache["at"], _schedule_cache["value"]
+
+
+def _last_modified(env_sig, log_sig):
+    """페이지 내용이 마지막으로 바뀐 시각 (epoch 초, 정수). .env·로그 mtime과 스케줄 변경 시각 중 최신값."""
+    times = [_schedule_cache["changed_at"]]
+    times += [sig[1] / 1e9 for sig in (env_sig, log_sig) if sig]
+    return int(max(times))
+
+
+def _get_page(kind):
+    """
+    kind("html" 또는 "json")에 해당하는 응답을 캐시에서 가져오거나 새로 만듭니다.
+    반환: {"body": bytes, "etag": str, "last_modified": epoch 초, "encoded": {인코딩: bytes}}
+    """
+    with _cache_lock:
+        schedule_at, schedule = _cached_schedule()
+        env_sig, log_sig = _file_signature(ENV_PATH), get_log_signature()
+        key = (env_sig, log_sig, schedule_at)
+        if key != _render_cache["key"]:
+            _render_cache["key"] = key
+            _render_cache["data"] = _collect_dashboard_data(schedule=schedule)
+            _render_cache["last_modified"] = _last_modified(env_sig, log_sig)
+            _render_cache["pages"] = {}
+
+        pages = _render_cache["pages"]
+        if kind not in pages:
+            data = _render_cache["data"]
+            if kind == "html":
+                body = _render_html(data).encode("utf-8")
+            else:
+                body = json.dumps(data, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+            pages[kind] = {
+                "body": body,
+                "etag": '"' + hashlib.sha1(body).hexdigest()[:20] + '"',
+                "last_modified": _render_cache["last_modified"],
+                "encoded": {},
+            }
+        return pages[kind]
+
+
+def _encode_body(page, encoding):
+    """압축된 본문을 만들고 페이지 캐시에 보관합니다. (같은 내용은 한 번만 압축)"""
+    with _cache_lock:
+        encoded = page["encoded"].get(encoding)
+        if encoded is None:
+            if encoding == "gzip":
+                encoded = gzip.compress(page["body"], mtime=0)
+            else:
+                encoded = zlib.compress(page["body"])
+            page["encoded"][encoding] = encoded
+        return encoded
+
+
+def _choose_encoding(accept_encoding, size):
+    """Accept-Encoding 헤더에서 사용할 압축 방식을 고릅니다 (gzip 우선). 압축하지 않으면 None."""
+    if size < COMPRESS_MIN_BYTES or not accept_encoding:
+        return None
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in ("gzip", "deflate"):
+        if accepted.get(encoding, accepted.get("*", 0)) > 0:
+            return encoding
+    return None
+
+
+# ── 로그 조회 API (/api/logs) ──
+# storage에서 엔트리를 하나씩 읽어 필터링하므로 메모리 사용량은 페이지 크기에만 비례합니다.
+# (sqlite 방식은 필터를 SQL 조회로 처리)
+
+LOGS_PAGE_DEFAULT = 20
+LOGS_PAGE_MAX = 100
+
+def _parse_logs_query(query):
+    """
+    /api/logs 쿼리 파라미터를 해석합니다. 잘못된 값이면 ValueError.
+    offset, limit(최대 LOGS_PAGE_MAX), from/to(YYYY-MM-DD), project(앞부분 일치), format(json|ndjson)
+    """
+    params = {k: v[0] for k, v in parse_qs(query).items()}
+    fmt = params.get("format", "json")
+    if fmt not in ("json", "ndjson"):
+        raise ValueError("format은 json 또는 ndjson 이어야 합니다.")
+
+    try:
+        offset = int(params.get("offset", 0))
+        # ndjson은 limit이 없으면 끝까지 스트리밍
+        limit = int(params["limit"]) if "limit" in params else (LOGS_PAGE_DEFAULT if fmt == "json" else None)
+    except ValueError:
+        raise ValueError("offset, limit은 정수여야 합니다.")
+    if offset < 0 or (limit is not None and limit < 0):
+        raise ValueError("offset, limit은 0 이상이어야 합니다.")
+    if fmt == "json":
+        limit = min(limit, LOGS_PAGE_MAX)
+
+    for key in ("from", "to"):
+        if key in params and not re.fullmatch(r"\d{4}-\d{2}-\d{2}", params[key]):
+            raise ValueError(f"{key} 값은 YYYY-MM-DD 형식이어야 합니다.")
+
+    return {
+        "offset": offset,
+        "limit": limit,
+        "from": params.get("from"),
+        "to": params.get("to"),
+        "project": params.get("project", "").strip().lower() or None,
+        "format": fmt,
+    }
+
+
+def _iter_log_records(query):
+    """필터를 적용한 뒤 offset부터 최대 limit개의 엔트리 레코드를 하나씩 반환합니다."""
+    return query_log_entries(
+        offset=query["offset"],
+        limit=query["limit"],
+        date_from=query["from"],
+        date_to=query["to"],
+        project=query["project"],
+    )
+
+
 # ── 마크다운 → HTML 변환 ──
 
 def _md_to_html(md_text):
@@ -167,6 +339,7 @@ def _render_html(data):
     schedule = data["schedule"]
     logs = data["logs"]
     log_error = data.get("log_error")
+    log_total = data.get("log_total", len(logs))
 
     # 프로젝트 행
     project_rows = ""
@@ -189,6 +362,8 @@ def _render_html(data):
     else:
         logs_html = "<p class='empty'>로그가 없습니다.</p>"
 
+    schedule_class = "schedule-inactive" if "⚠️" in schedule else "schedule-active"
+
     return f"""<!DOCTYPE html>
 <html lang="ko">
 <head>
@@ -288,13 +463,13 @@ def _render_html(data):
 
 <div class="card">
   <h2>⏰ 스케줄</h2>
-  <span class="schedule-badge {'schedule-inactive' if '\u26a0\ufe0f' in schedule else 'schedule-active'}">
+  <span class="schedule-badge {schedule_class}">
     {escape(schedule)}
   </span>
 </div>
 
 <div class="card">
-  <h2>📋 커리어 로그 (최근 {len(logs)}건)</h2>
+  <h2>📋 커리어 로그 (최근 {len(logs)}건 / 전체 {log_total}건)</h2>
   {logs_html}
 </div>
 
@@ -309,27 +484,118 @@ class DashboardHandler(BaseHTTPRequestHandler):
     """로컬 대시보드 HTTP 핸들러."""
 
     def do_GET(self):
-        if self.path == "/" or self.path == "":
-            data = _collect_dashboard_data()
-            html = _render_html(data)
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(html.encode("utf-8"))
-        elif self.path == "/api/data":
-            data = _collect_dashboard_data()
-            # logs를 직렬화 가능하게 변환
-            payload = json.dumps(data, ensure_ascii=False, indent=2, default=str)
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(payload.encode("utf-8"))
+        parsed = urlparse(self.path)
+        if parsed.path == "/" or parsed.path == "":
+            self._send_page(_get_page("html"), "text/html; charset=utf-8")
+        elif parsed.path == "/api/data":
+            self._send_page(_get_page("json"), "application/json; charset=utf-8")
+        elif parsed.path == "/api/logs":
+            self._send_logs(parsed.query)
+        elif parsed.path == "/api/search":
+            self._send_search(parsed.query)
         else:
             self.send_response(404)
             self.send_header("Content-Type", "text/plain; charset=utf-8")
             self.end_headers()
             self.wfile.write(b"404 Not Found")
 
+    def _is_not_modified(self, page):
+        """If-None-Match(우선) 또는 If-Modified-Since 기준으로 304 응답이 가능한지 판단."""
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None:
+            tags = [t.strip() for t in if_none_match.split(",")]
+            return "*" in tags or page["etag"] in tags or f"W/{page['etag']}" in tags
+        if_modified_since = self.headers.get("If-Modified-Since")
+        if if_modified_since:
+            try:
+                return page["last_modified"] <= parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+        return False
+
+    def _send_page(self, page, content_type):
+        """캐시 검증 헤더(ETag/Last-Modified)와 압축 협상을 적용해 페이지를 전송합니다."""
+        if self._is_not_modified(page):
+            self.send_response(304)
+            self.send_header("ETag", page["etag"])
+            self.send_header("Last-Modified", formatdate(page["last_modified"], usegmt=True))
+            self.end_headers()
+            return
+
+        body = page["body"]
+        encoding = _choose_encoding(self.headers.get("Accept-Encoding"), len(body))
+        if encoding:
+            body = _encode_body(page, encoding)
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", page["etag"])
+        self.send_header("Last-Modified", formatdate(page["last_modified"], usegmt=True))
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, obj):
+        body = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_logs(self, query_string):
+        """/api/logs: 페이지 단위 JSON 또는 NDJSON 스트림으로 로그 엔트리를 전송합니다."""
+        try:
+            query = _parse_logs_query(query_string)
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        if query["format"] == "ndjson":
+            # 한 줄에 엔트리 하나씩, 읽는 즉시 전송 (HTTP/1.0: 연결 종료로 본문 끝 표시)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+            self.end_headers()
+            try:
+                for record in _iter_log_records(query):
+                    self.wfile.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            return
+
+        # 다음 페이지 존재 여부 확인을 위해 limit+1개까지 읽음
+        probe = dict(query, limit=query["limit"] + 1)
+        records = list(_iter_log_records(probe))
+        has_more = len(records) > query["limit"]
+        records = records[:query["limit"]]
+        self._send_json(200, {
+            "offset": query["offset"],
+            "limit": query["limit"],
+            "count": len(records),
+            "next_offset": query["offset"] + len(records) if has_more else None,
+            "entries": records,
+        })
+
+    def _send_search(self, query_string):
+        """/api/search?q=검색어&limit=N: 전문 검색 결과를 관련도순으로 반환합니다."""
+        from claw_log.search import search_logs, DEFAULT_LIMIT
+
+        params = {k: v[0] for k, v in parse_qs(query_string).items()}
+        try:
+            limit = min(int(params.get("limit", DEFAULT_LIMIT)), LOGS_PAGE_MAX)
+        except ValueError:
+            self._send_json(400, {"error": "limit은 정수여야 합니다."})
+            return
+        results, error = search_logs(params.get("q", ""), limit=limit)
+        if error:
+            self._send_json(400, {"error": error})
+            return
+        self._send_json(200, {"query": params.get("q", ""), "count": len(results), "results": results})
+
     def log_message(self, format, *args):
         """HTTP 서버 로그 억제."""
         pass
@@ -340,7 +606,8 @@ class DashboardHandler(BaseHTTPRequestHandler):
 def serve_dashboard(port=8080):
     """로컬 대시보드 서버를 시작합니다."""
     try:
-        server = HTTPServer(("localhost", port), DashboardHandler)
+        # 여러 탭/폴링 요청을 동시에 처리 (요청별 데몬 스레드)
+        server = ThreadingHTTPServer(("localhost", port), DashboardHandler)
     except OSError:
         print(f"\n❌ 포트 {port}이 이미 사용 중입니다.")
         print(f"   다른 포트를 지정하세요: claw-log --serve {port + 1}")
@@ -7,6 +7,7 @@ setup(
     package_dir={"claw_log": "."},
     install_requires=[
         "google-genai>=0.3.0",
+        "httpx",
         "openai",
         "python-dotenv",
     ],
@@ -1,64 +1,1007 @@
 import re
+import json
+import zlib
+import codecs
+import contextlib
+import hashlib
+import sqlite3
 import datetime
+import threading
 from pathlib import Path
 import os
 
 LOG_FILENAME = "career_logs.md"
+# 저장소별 마지막 처리 지점 (career_logs.md와 같은 디렉토리)
+WATERMARK_FILENAME = ".claw_watermarks.json"
 
+# 로그 저장 방식 (.env: LOG_BACKEND)
+# - markdown: career_logs.md 최상단에 prepend (기본)
+# - append:   career_logs.seg 세그먼트 파일 끝에 append, career_logs.md는 --log-export로 생성
+# - sqlite:   career_logs.db에 엔트리와 실행 메타데이터 저장, career_logs.md는 --log-export로 생성
+LOG_BACKENDS = ("markdown", "append", "sqlite")
+SEGMENT_SUFFIX = ".seg"
+# 세그먼트 파일 이전/추가를 프로세스 간에 직렬화하는 잠금 파일 (career_logs.seg.lock)
+SEGMENT_LOCK_SUFFIX = ".lock"
+SQLITE_SUFFIX = ".db"
+
+ENTRY_SEPARATOR = "\n---\n\n"
+
+# career_logs.md 엔트리 오프셋 인덱스 (파일 크기/mtime이 바뀌었을 때만 재생성)
+INDEX_VERSION = 1
+_HEADER_BYTES = "## 📅 ".encode("utf-8")
+
+# 세그먼트 레코드 = 엔트리 본문(UTF-8) + 고정 길이 트레일러
+# 트레일러: "\n#CLAW " + 본문 길이(10자리) + " " + crc32(8자리 hex) + "\n"
+# 파일 끝에서 트레일러만 읽으면 직전 레코드 위치를 알 수 있어 역방향 순회가 가능합니다.
+_TRAILER_MAGIC = b"\n#CLAW "
+_TRAILER_SIZE = len(_TRAILER_MAGIC) + 10 + 1 + 8 + 1
+_SCAN_BLOCK_SIZE = 64 * 1024
+
+
+def get_log_backend():
+    """현재 로그 저장 방식 (.env의 LOG_BACKEND, 기본: markdown)"""
+    backend = os.getenv("LOG_BACKEND", "markdown").lower()
+    return backend if backend in LOG_BACKENDS else "markdown"
+
+
+def _format_entry(summary, date_label=None):
+    label = date_label if date_label else datetime.date.today().strftime("%Y-%m-%d")
+    return f"## 📅 {label}\n\n" + summary
+
+
+def _clean_entry(text):
+    return text.rstrip().rstrip("-").rstrip()
+
+
+def _split_markdown_entries(content):
+    """career_logs.md 내용을 '## 📅' 헤더 기준 엔트리 목록(최신순)으로 분할합니다."""
+    parts = re.split(r"(?=^## 📅 )", content, flags=re.MULTILINE)
+    return [_clean_entry(p) for p in parts if p.strip()]
+
+
+def _split_raw_markdown_entries(content):
+    """엔트리를 구분자만 떼어낸 원문 그대로 분할합니다. (다시 내보내도 같은 파일이 되도록)"""
+    parts = re.split(r"(?=^## 📅 )", content, flags=re.MULTILINE)
+    return [p[:-len(ENTRY_SEPARATOR)] if p.endswith(ENTRY_SEPARATOR) else p.rstrip()
+            for p in parts if p.strip()]
+
+
+def _atomic_write_text(file_path, chunks):
+    """임시 파일에 모두 쓴 뒤 교체합니다. 중간에 중단되어도 기존 파일은 그대로 남습니다."""
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        for chunk in chunks:
+            f.write(chunk)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+
+
+# ── 공개 API (저장 방식에 따라 분기) ──
 
 def read_recent_logs(n=5, filename=LOG_FILENAME):
     """최근 N개의 로그 엔트리를 반환합니다. 각 엔트리는 '## 📅' 헤더로 구분."""
+    backend = get_log_backend()
+    if backend == "sqlite":
+        return read_log_entries(0, n, filename)
+    if backend == "append":
+        return _read_recent_segments(n, filename)
+    return _read_recent_markdown(n, filename)
+
+
+def prepend_to_log_file(summary, filename=LOG_FILENAME, date_label=None, meta=None):
+    """
+    새로운 로그를 최신순 맨 앞에 기록합니다.
+    date_label: 커스텀 날짜 레이블 (예: "2026-02-06 ~ 2026-02-12"). None이면 오늘 날짜.
+    meta: 실행 메타데이터 (sqlite 방식에서만 저장)
+          {"engine", "model", "projects": [이름], "payload_chars", "token_estimate"}
+    반환: 기록된 파일 경로 (실패 시 None)
+    """
+    entry = _format_entry(summary, date_label)
+    backend = get_log_backend()
+    if backend == "sqlite":
+        return _insert_sqlite_entry(entry, summary, filename, date_label, meta or {})
+    if backend == "append":
+        return _append_to_segments(entry, filename)
+    return _prepend_to_markdown(entry, filename)
+
+
+def read_log_entries(start=0, n=20, filename=LOG_FILENAME):
+    """
+    최신순 기준 start번째부터 N개의 엔트리를 반환합니다. 반환 형식은 read_recent_logs와 동일.
+    markdown 방식은 오프셋 인덱스로 해당 엔트리 위치만 읽습니다.
+    """
+    backend = get_log_backend()
+    if backend == "sqlite":
+        conn = _open_sqlite(filename)
+        if conn is None:
+            return None, "로그 파일이 없습니다. 먼저 'claw-log'를 실행하세요."
+        try:
+            rows = conn.execute(
+                "SELECT entry FROM entries ORDER BY id DESC LIMIT ? OFFSET ?", (n, start)
+            ).fetchall()
+        except sqlite3.Error as e:
+            return None, f"로그 파일 읽기 실패: {e}"
+        finally:
+            conn.close()
+        if not rows and start == 0 and n > 0:
+            return None, "로그 엔트리를 찾을 수 없습니다."
+        return [_clean_entry(r[0] + ENTRY_SEPARATOR) for r in rows], None
+
+    if backend == "append":
+        seg_path = _ensure_segments(filename)
+        if seg_path is None:
+            return None, "로그 파일이 없습니다. 먼저 'claw-log'를 실행하세요."
+        entries = []
+        for i, raw in enumerate(_iter_segment_entries(seg_path)):
+            if i >= start + n:
+                break
+            if i >= start:
+                entries.append(_clean_entry(raw + ENTRY_SEPARATOR))
+        return entries, None
+
+    file_path = Path.cwd() / filename
+    if not file_path.exists():
+        return None, "로그 파일이 없습니다. 먼저 'claw-log'를 실행하세요."
+    try:
+        index = load_log_index(filename)
+        with open(file_path, "rb") as f:
+            return [_read_indexed_entry(f, item) for item in index[start:start + n]], None
+    except Exception as e:
+        return None, f"로그 파일 읽기 실패: {e}"
+
+
+def iter_log_entries(start=0, filename=LOG_FILENAME):
+    """
+    최신순 start번째부터 엔트리를 하나씩 반환하는 제너레이터. 전체 기록을 메모리에 올리지 않습니다.
+    각 항목: {"position": 최신순 번호(0부터), "date": 날짜 레이블, "text": 엔트리 본문}
+    """
+    backend = get_log_backend()
+    if backend == "sqlite":
+        yield from query_log_entries(offset=start, filename=filename)
+        return
+
+    if backend == "append":
+        seg_path = _ensure_segments(filename)
+        if seg_path is None:
+            return
+        for i, raw in enumerate(_iter_segment_entries(seg_path)):
+            if i < start:
+                continue
+            text = _clean_entry(raw + ENTRY_SEPARATOR)
+            yield {"position": i, "date": _entry_date_label(text), "text": text}
+        return
+
+    file_path = Path.cwd() / filename
+    if not file_path.exists():
+        return
+    index = load_log_index(filename)
+    with open(file_path, "rb") as f:
+        for i in range(start, len(index)):
+            item = index[i]
+            yield {"position": i, "date": item["date"], "text": _read_indexed_entry(f, item)}
+
+
+def list_log_digests(filename=LOG_FILENAME):
+    """
+    모든 엔트리의 요약 정보(최신순)를 본문 없이 반환합니다. 검색 색인의 증분 갱신용.
+    각 항목: {"position", "date", "hash"} — hash는 엔트리 내용이 바뀌면 달라집니다.
+    """
+    backend = get_log_backend()
+    if backend == "sqlite":
+        conn = _open_sqlite(filename)
+        if conn is None:
+            return []
+        try:
+            rows = conn.execute("SELECT date_label, hash FROM entries ORDER BY id DESC").fetchall()
+        finally:
+            conn.close()
+        return [{"position": i, "date": date, "hash": digest} for i, (date, digest) in enumerate(rows)]
+
+    if backend == "append":
+        seg_path = _ensure_segments(filename)
+        if seg_path is None:
+            return []
+        return [{"position": i, "date": date, "hash": digest}
+                for i, (digest, date) in enumerate(_iter_segment_digests(seg_path))]
+
+    if not (Path.cwd() / filename).exists():
+        return []
+    return [{"position": i, "date": item["date"], "hash": item["hash"]}
+            for i, item in enumerate(load_log_index(filename))]
+
+
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+_PROJECT_RE = re.compile(r"^#{2,4}\s*📂\s*\[?([^\]\n]+?)\]?\s*$", re.MULTILINE)
+
+
+def entry_projects(text):
+    """엔트리 본문의 '### 📂 [Project]' 제목에서 프로젝트 이름 목록을 추출합니다."""
+    return [m.group(1).strip() for m in _PROJECT_RE.finditer(text)]
+
+
+def _date_range(label):
+    """날짜 레이블에서 (시작일, 종료일)을 추출합니다. 날짜가 없으면 (None, None)."""
+    dates = _DATE_RE.findall(label or "")
+    return (dates[0], dates[-1]) if dates else (None, None)
+
+
+def query_log_entries(offset=0, limit=None, date_from=None, date_to=None, project=None,
+                      filename=LOG_FILENAME):
+    """
+    조건에 맞는 엔트리를 최신순으로 offset부터 최대 limit개 하나씩 반환합니다.
+    date_from/date_to: YYYY-MM-DD, 엔트리 날짜 범위와 겹치면 포함. project: 이름 앞부분 일치 (대소문자 무시)
+    각 항목: {"position", "date", "projects", "text"}
+    sqlite 방식은 인덱스된 SQL 조회, 그 외 방식은 엔트리를 하나씩 읽으며 필터링합니다.
+    """
+    if limit == 0:
+        return
+    project = project.lower() if project else None
+
+    if get_log_backend() == "sqlite":
+        yield from _query_sqlite_entries(offset, limit, date_from, date_to, project, filename)
+        return
+
+    has_filter = date_from or date_to or project
+    # 필터가 없으면 storage에서 바로 offset 위치부터 읽음
+    skipped = 0 if has_filter else offset
+    sent = 0
+    for entry in iter_log_entries(start=skipped, filename=filename):
+        projects = entry_projects(entry["text"])
+        if date_from or date_to:
+            start, end = _date_range(entry["date"])
+            if start is None or (date_from and end < date_from) or (date_to and start > date_to):
+                continue
+        if project and not any(p.lower().startswith(project) for p in projects):
+            continue
+        if skipped < offset:
+            skipped += 1
+            continue
+        yield dict(entry, projects=projects)
+        sent += 1
+        if limit is not None and sent >= limit:
+            return
+
+
+def _entry_date_label(text):
+    first_line = text.split("\n", 1)[0]
+    return first_line[len("## 📅 "):].strip() if first_line.startswith("## 📅 ") else ""
+
+
+def get_log_overview(filename=LOG_FILENAME):
+    """
+    로그 개요를 반환합니다 (--status, 대시보드용).
+    반환: {"file": 파일명, "entries": 엔트리 수, "latest": 최근 날짜} 또는 로그가 없으면 None
+    """
+    backend = get_log_backend()
+    if backend == "sqlite":
+        conn = _open_sqlite(filename)
+        if conn is None:
+            return None
+        try:
+            count = conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            row = conn.execute(
+                "SELECT date_from FROM entries WHERE date_from IS NOT NULL ORDER BY id DESC LIMIT 1"
+            ).fetchone()
+        finally:
+            conn.close()
+        return {"file": _sqlite_path(filename).name, "entries": count, "latest": row[0] if row else None}
+
+    if backend == "append":
+        # 세그먼트가 아직 없으면 기존 career_logs.md를 옮겨옴. 본문은 읽지 않고 트레일러와 첫 줄만 읽음
+        file_path = _ensure_segments(filename)
+        if file_path is None:
+            return None
+        labels = [date for _, date in _iter_segment_digests(file_path)]
+    else:
+        file_path = Path.cwd() / filename
+        if not file_path.exists():
+            return None
+        labels = [item["date"] for item in load_log_index(filename)]
+
+    latest = None
+    for label in labels:
+        m = _DATE_RE.match(label)
+        if m:
+            latest = m.group(0)
+            break
+    return {"file": file_path.name, "entries": len(labels), "latest": latest}
+
+
+def get_log_signature(filename=LOG_FILENAME):
+    """현재 저장 방식의 로그 파일 (크기, mtime_ns). 캐시 무효화 판단용. 파일이 없으면 None."""
+    backend = get_log_backend()
+    if backend == "sqlite":
+        # WAL 모드에서는 체크포인트 전까지 변경이 -wal 파일에만 기록되므로 함께 확인
+        db_path = _sqlite_path(filename)
+        stats = []
+        for path in (db_path, db_path.with_name(db_path.name + "-wal")):
+            try:
+                stats.append(path.stat())
+            except OSError:
+                pass
+        if not stats:
+            return None
+        return sum(st.st_size for st in stats), max(st.st_mtime_ns for st in stats)
+
+    file_path = _segment_path(filename) if backend == "append" else Path.cwd() / filename
+    try:
+        stat = file_path.stat()
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def export_markdown(filename=LOG_FILENAME):
+    """
+    append/sqlite 방식의 기록을 career_logs.md(최신순) 형식으로 내보냅니다.
+    markdown 방식에서는 파일이 이미 최신이므로 그대로 반환합니다.
+    """
+    file_path = Path.cwd() / filename
+    backend = get_log_backend()
+    if backend == "sqlite":
+        conn = _open_sqlite(filename)
+        if conn is None:
+            return None
+        try:
+            rows = conn.execute("SELECT entry FROM entries ORDER BY id DESC")
+            _atomic_write_text(file_path, (row[0] + ENTRY_SEPARATOR for row in rows))
+            return file_path
+        except Exception as e:
+            print(f"❌ 로그 내보내기 실패: {e}")
+            return None
+        finally:
+            conn.close()
+
+    if backend != "append":
+        return file_path if file_path.exists() else None
+
+    seg_path = _ensure_segments(filename)
+    if seg_path is None:
+        return None
+    try:
+        _atomic_write_text(
+            file_path,
+            (raw + ENTRY_SEPARATOR for raw in _iter_segment_entries(seg_path)),
+        )
+        return file_path
+    except Exception as e:
+        print(f"❌ 로그 내보내기 실패: {e}")
+        return None
+
+
+# ── markdown 방식 ──
+
+_ENTRY_HEADER_RE = re.compile(r"^## 📅 ", re.MULTILINE)
+
+
+def _read_leading_entries(file_path, n):
+    """
+    최신순 markdown 파일의 앞부분을 고정 크기 블록으로 읽다가, N+1번째 엔트리의 시작이
+    보이면(= N개 엔트리가 온전히 확보되면) 중단합니다. 읽는 양은 전체 기록 길이가 아니라 N에 비례.
+    반환: (엔트리 목록, 읽은 내용이 비어있는지 여부)
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buf = ""
+    at_eof = False
+    with open(file_path, "rb") as f:
+        while not at_eof:
+            chunk = f.read(_SCAN_BLOCK_SIZE)
+            at_eof = not chunk
+            buf += decoder.decode(chunk, final=at_eof)
+            # 헤더 앞 머리말도 엔트리 하나로 취급하므로 헤더 위치 기준으로 조각 수 계산
+            starts = [m.start() for m in _ENTRY_HEADER_RE.finditer(buf)]
+            pieces = len(starts) + (1 if buf[:starts[0] if starts else len(buf)].strip() else 0)
+            if pieces > n:
+                break
+
+    entries = _split_markdown_entries(buf)
+    if not at_eof:
+        # 마지막 조각은 블록 경계에서 잘렸을 수 있으므로 버림 (이미 N개 이상 확보됨)
+        entries = entries[:-1]
+    return entries[:n], not buf.strip()
+
+
+def _read_recent_markdown(n, filename):
     file_path = Path.cwd() / filename
 
     if not file_path.exists():
         return None, "로그 파일이 없습니다. 먼저 'claw-log'를 실행하세요."
 
     try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            content = f.read()
+        entries, is_empty = _read_leading_entries(file_path, n)
     except Exception as e:
         return None, f"로그 파일 읽기 실패: {e}"
 
-    if not content.strip():
+    if is_empty:
         return None, "로그 파일이 비어있습니다."
 
-    # ## 📅 날짜 헤더로 엔트리 분할
-    parts = re.split(r"(?=^## 📅 )", content, flags=re.MULTILINE)
-    entries = [p.rstrip().rstrip("-").rstrip() for p in parts if p.strip()]
-
-    if not entries:
+    if not entries and n > 0:
         return None, "로그 엔트리를 찾을 수 없습니다."
 
-    return entries[:n], None
+    return entries, None
 
 
-def prepend_to_log_file(summary, filename=LOG_FILENAME, date_label=None):
-    """
-    현재 작업 디렉토리(CWD) 기준의 로그 파일 최상단에 새로운 로그를 추가합니다. (최신순)
-    date_label: 커스텀 날짜 레이블 (예: "2026-02-06 ~ 2026-02-12"). None이면 오늘 날짜.
-    """
+def _prepend_to_markdown(entry, filename):
+    """현재 작업 디렉토리(CWD) 기준의 로그 파일 최상단에 새로운 로그를 추가합니다."""
     file_path = Path.cwd() / filename
     existing_content = ""
+    old_size = 0
+    index = None
 
     if file_path.exists():
+        old_size = file_path.stat().st_size
+        index = _load_fresh_index(file_path)
         try:
             with open(file_path, "r", encoding="utf-8") as f:
                 existing_content = f.read()
         except Exception as e:
-            print(f"⚠️ 기존 로그 파일 읽기 실패: {e}")
+            print(f"❌ 기존 로그 파일 읽기 실패: {e}")
+            # 읽지 못한 기존 기록을 덮어쓰지 않도록 저장 중단
+            return None
 
-    label = date_label if date_label else datetime.date.today().strftime("%Y-%m-%d")
-    header = f"## 📅 {label}\n\n"
-    separator = "\n---\n\n"
-    
     # 최신 내용이 뒤에 오는 것이 아니라 앞에 오도록 (Prepend)
-    final_content = header + summary + separator + existing_content
-    
-    # 파일 쓰기
     try:
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(final_content)
-        return file_path
+        _atomic_write_text(file_path, (entry, ENTRY_SEPARATOR, existing_content))
     except Exception as e:
         print(f"❌ 로그 파일 저장 실패: {e}")
         return None
+
+    # 기존 인덱스가 유효했다면 새 엔트리만 앞에 끼우고 나머지는 오프셋만 이동 (전체 재스캔 불필요)
+    if index is not None or old_size == 0:
+        try:
+            added = file_path.stat().st_size - old_size
+            with open(file_path, "rb") as f:
+                new_item = _index_item(f, 0, added)
+            shifted = [dict(item, offset=item["offset"] + added) for item in index or []]
+            _save_index(file_path, [new_item] + shifted)
+        except OSError:
+            pass
+    return file_path
+
+
+# ── career_logs.md 엔트리 오프셋 인덱스 ──
+
+def _index_path(file_path):
+    return file_path.with_name(f".{file_path.stem}.idx.json")
+
+
+def _file_signature(file_path):
+    stat = file_path.stat()
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _load_fresh_index(file_path):
+    """사이드카 인덱스가 현재 파일(크기, mtime)과 일치하면 엔트리 목록을, 아니면 None을 반환합니다."""
+    try:
+        with open(_index_path(file_path), "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != INDEX_VERSION or data.get("signature") != _file_signature(file_path):
+        return None
+    return data.get("entries")
+
+
+def _save_index(file_path, entries):
+    index_path = _index_path(file_path)
+    tmp_path = index_path.with_name(index_path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": INDEX_VERSION,
+                "signature": _file_signature(file_path),
+                "entries": entries,
+            }, f, ensure_ascii=False)
+        os.replace(tmp_path, index_path)
+    except OSError:
+        pass
+
+
+def _scan_entry_offsets(f):
+    """파일을 블록 단위로 훑어 '## 📅' 헤더가 시작하는 바이트 오프셋 목록을 반환합니다."""
+    needle = b"\n" + _HEADER_BYTES
+    offsets = []
+    pos = 0
+    tail = b"\n"  # 파일 시작도 줄 시작으로 취급
+    while True:
+        block = f.read(_SCAN_BLOCK_SIZE)
+        if not block:
+            break
+        data = tail + block
+        base = pos - len(tail)
+        i = data.find(needle)
+        while i != -1:
+            offsets.append(base + i + 1)
+            i = data.find(needle, i + 1)
+        # 블록 경계에 걸친 헤더를 위해 끝부분을 남김 (needle보다 짧아 중복 검출 없음)
+        tail = data[-len(_HEADER_BYTES):]
+        pos += len(block)
+    return offsets, pos
+
+
+def _index_item(f, offset, length):
+    """엔트리 하나의 인덱스 항목: 바이트 위치, 날짜 레이블, 내용 해시."""
+    f.seek(offset)
+    raw = f.read(length)
+    first_line = raw.split(b"\n", 1)[0].decode("utf-8", errors="replace")
+    return {
+        "offset": offset,
+        "length": length,
+        "date": _entry_date_label(first_line),
+        "hash": hashlib.sha1(raw).hexdigest()[:16],
+    }
+
+
+def _build_index(file_path):
+    with open(file_path, "rb") as f:
+        offsets, size = _scan_entry_offsets(f)
+        # 첫 헤더 앞의 머리말도 엔트리로 취급 (read_recent_logs와 동일)
+        if not offsets or offsets[0] > 0:
+            first = offsets[0] if offsets else size
+            f.seek(0)
+            if f.read(first).strip():
+                offsets.insert(0, 0)
+        bounds = offsets + [size]
+        return [_index_item(f, start, end - start) for start, end in zip(bounds, bounds[1:])]
+
+
+def load_log_index(filename=LOG_FILENAME):
+    """
+    career_logs.md의 엔트리 인덱스(최신순)를 반환합니다.
+    각 항목: {"offset", "length", "date", "hash"}. 파일 크기나 mtime이 바뀐 경우에만 재생성합니다.
+    """
+    file_path = Path.cwd() / filename
+    entries = _load_fresh_index(file_path)
+    if entries is None:
+        entries = _build_index(file_path)
+        _save_index(file_path, entries)
+    return entries
+
+
+def _read_indexed_entry(f, item):
+    f.seek(item["offset"])
+    return _clean_entry(f.read(item["length"]).decode("utf-8", errors="replace"))
+
+
+# ── append 방식 (세그먼트 파일) ──
+
+def _segment_path(filename=LOG_FILENAME):
+    return (Path.cwd() / filename).with_suffix(SEGMENT_SUFFIX)
+
+
+@contextlib.contextmanager
+def _segment_lock(filename=LOG_FILENAME):
+    """세그먼트 파일 옆의 잠금 파일에 배타 잠금을 겁니다. (POSIX: flock, Windows: msvcrt.locking)"""
+    seg_path = _segment_path(filename)
+    lock_path = seg_path.with_name(seg_path.name + SEGMENT_LOCK_SUFFIX)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        if os.name == "nt":
+            import msvcrt
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                os.lseek(fd, 0, os.SEEK_SET)
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+
+def _pack_record(entry):
+    body = entry.encode("utf-8")
+    trailer = f"{len(body):010d} {zlib.crc32(body):08x}\n".encode("ascii")
+    return body + _TRAILER_MAGIC + trailer
+
+
+def _read_trailer_before(f, end):
+    """end 위치에서 끝나는 레코드의 트레일러만 읽어 (start, crc)를 반환합니다. 형식이 맞지 않으면 None."""
+    if end < _TRAILER_SIZE:
+        return None
+    f.seek(end - _TRAILER_SIZE)
+    trailer = f.read(_TRAILER_SIZE)
+    if not trailer.startswith(_TRAILER_MAGIC) or not trailer.endswith(b"\n"):
+        return None
+    try:
+        length_str, crc_str = trailer[len(_TRAILER_MAGIC):-1].split(b" ")
+        length, crc = int(length_str), int(crc_str, 16)
+    except ValueError:
+        return None
+    start = end - _TRAILER_SIZE - length
+    if start < 0:
+        return None
+    return start, crc
+
+
+def _read_record_before(f, end):
+    """end 위치에서 끝나는 레코드를 읽어 (start, body)를 반환합니다. 유효하지 않으면 None."""
+    trailer = _read_trailer_before(f, end)
+    if trailer is None:
+        return None
+    start, crc = trailer
+    length = end - _TRAILER_SIZE - start
+    f.seek(start)
+    body = f.read(length)
+    if zlib.crc32(body) != crc:
+        return None
+    return start, body
+
+
+def _valid_end(f, size):
+    """
+    마지막 온전한 레코드의 끝 위치를 반환합니다.
+    쓰기 도중 중단되어 트레일러가 없는 꼬리는 건너뛰고, 그 앞의 트레일러를 역방향으로 찾습니다.
+    """
+    if size == 0 or _read_record_before(f, size):
+        return size
+
+    search_end = size
+    while search_end > 0:
+        block_start = max(0, search_end - _SCAN_BLOCK_SIZE)
+        f.seek(block_start)
+        block = f.read(search_end - block_start)
+        i = block.rfind(_TRAILER_MAGIC)
+        while i != -1:
+            end = block_start + i + _TRAILER_SIZE
+            if end <= size and _read_record_before(f, end):
+                return end
+            i = block.rfind(_TRAILER_MAGIC, 0, i)
+        if block_start == 0:
+            break
+        # 블록 경계에 걸친 트레일러를 놓치지 않도록 살짝 겹쳐서 이어 탐색
+        search_end = block_start + len(_TRAILER_MAGIC) - 1
+    return 0
+
+
+def _iter_segment_entries(seg_path):
+    """세그먼트 파일의 엔트리 원문(헤더 + 요약)을 최신순(파일 끝 → 앞)으로 하나씩 반환합니다."""
+    with open(seg_path, "rb") as f:
+        end = _valid_end(f, os.fstat(f.fileno()).st_size)
+        while end > 0:
+            record = _read_record_before(f, end)
+            if record is None:
+                break
+            end, body = record
+            yield body.decode("utf-8", errors="replace")
+
+
+def _iter_segment_digests(seg_path):
+    """
+    세그먼트 엔트리의 (crc 해시, 날짜 레이블)을 최신순으로 반환합니다.
+    본문 전체는 읽지 않고 트레일러와 첫 줄만 읽습니다.
+    """
+    with open(seg_path, "rb") as f:
+        end = _valid_end(f, os.fstat(f.fileno()).st_size)
+        while end > 0:
+            trailer = _read_trailer_before(f, end)
+            if trailer is None:
+                break
+            start, crc = trailer
+            f.seek(start)
+            first_line = f.read(min(256, end - _TRAILER_SIZE - start)).split(b"\n", 1)[0]
+            yield f"{crc:08x}", _entry_date_label(first_line.decode("utf-8", errors="replace"))
+            end = start
+
+
+def _ensure_segments(filename=LOG_FILENAME):
+    """
+    세그먼트 파일 경로를 반환합니다.
+    처음 append 방식으로 전환한 경우 기존 career_logs.md 엔트리를 오래된 순으로 옮겨옵니다.
+    """
+    seg_path = _segment_path(filename)
+    if seg_path.exists():
+        return seg_path
+
+    md_path = Path.cwd() / filename
+    if not md_path.exists():
+        return None
+    try:
+        with _segment_lock(filename):
+            # 잠금을 기다리는 동안 다른 실행이 이미 옮겼을 수 있음
+            if seg_path.exists():
+                return seg_path
+            return _migrate_markdown_to_segments(md_path, seg_path)
+    except OSError as e:
+        print(f"⚠️ 기존 로그 이전 실패: {e}")
+        return None
+
+
+def _migrate_markdown_to_segments(md_path, seg_path):
+    try:
+        with open(md_path, "r", encoding="utf-8") as f:
+            entries = _split_raw_markdown_entries(f.read())
+        tmp_path = seg_path.with_name(seg_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            for entry in reversed(entries):
+                f.write(_pack_record(entry))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, seg_path)
+        print(f"📦 기존 {md_path.name}의 엔트리 {len(entries)}개를 {seg_path.name}로 옮겼습니다.")
+        return seg_path
+    except Exception as e:
+        print(f"⚠️ 기존 로그 이전 실패: {e}")
+        return None
+
+
+def _append_to_segments(entry, filename):
+    """세그먼트 파일 끝에 레코드 하나를 추가합니다. 기존 기록은 읽거나 다시 쓰지 않습니다."""
+    seg_path = _ensure_segments(filename) or _segment_path(filename)
+    record = _pack_record(entry)
+    try:
+        # 스케줄 실행과 수동 실행이 겹치면 쓰는 중인 레코드가 상대에게는 중단된 꼬리로 보이므로,
+        # 꼬리 확인 → 잘라내기 → 추가를 잠금 안에서 한 번에 처리
+        with _segment_lock(filename):
+            fd = os.open(seg_path, os.O_RDWR | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0), 0o644)
+            try:
+                # 이전 쓰기가 중단되어 남은 불완전한 꼬리가 있으면 잘라냄
+                with open(seg_path, "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    valid_end = _valid_end(f, size)
+                if valid_end != size:
+                    os.ftruncate(fd, valid_end)
+                view = memoryview(record)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        return seg_path
+    except Exception as e:
+        print(f"❌ 로그 파일 저장 실패: {e}")
+        return None
+
+
+def _read_recent_segments(n, filename):
+    seg_path = _ensure_segments(filename)
+    if seg_path is None:
+        return None, "로그 파일이 없습니다. 먼저 'claw-log'를 실행하세요."
+
+    entries = []
+    try:
+        for raw in _iter_segment_entries(seg_path):
+            if len(entries) >= n:
+                break
+            entries.append(_clean_entry(raw + ENTRY_SEPARATOR))
+    except Exception as e:
+        return None, f"로그 파일 읽기 실패: {e}"
+
+    if not entries:
+        return None, "로그 엔트리를 찾을 수 없습니다."
+
+    return entries, None
+
+
+# ── sqlite 방식 ──
+# entries: 엔트리 원문(헤더 + 요약)과 실행 메타데이터, entry_projects: 프로젝트별 조회용
+# WAL 모드라 대시보드 등 읽기 연결이 기록 중인 실행을 막지 않습니다.
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    date_label TEXT NOT NULL,
+    date_from TEXT,
+    date_to TEXT,
+    engine TEXT,
+    model TEXT,
+    payload_chars INTEGER,
+    token_estimate INTEGER,
+    summary TEXT NOT NULL,
+    entry TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_entries_date ON entries(date_from, date_to);
+CREATE TABLE IF NOT EXISTS entry_projects (
+    entry_id INTEGER NOT NULL REFERENCES entries(id) ON DELETE CASCADE,
+    project TEXT NOT NULL COLLATE NOCASE
+);
+CREATE INDEX IF NOT EXISTS idx_entry_projects_project ON entry_projects(project, entry_id);
+CREATE INDEX IF NOT EXISTS idx_entry_projects_entry ON entry_projects(entry_id);
+"""
+
+
+_import_lock = threading.Lock()
+
+
+def _sqlite_path(filename=LOG_FILENAME):
+    return (Path.cwd() / filename).with_suffix(SQLITE_SUFFIX)
+
+
+def _open_sqlite(filename=LOG_FILENAME, create=False):
+    """
+    sqlite 연결을 엽니다. DB가 없고 create=False면 기존 career_logs.md가 있을 때만 만들어 이전합니다.
+    반환: 연결 또는 기록이 없으면 None
+    """
+    db_path = _sqlite_path(filename)
+    md_path = Path.cwd() / filename
+    if not db_path.exists():
+        if md_path.exists():
+            _import_markdown_into_sqlite(md_path, db_path)
+        elif not create:
+            return None
+
+    conn = sqlite3.connect(str(db_path), timeout=10)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(_SQLITE_SCHEMA)
+    return conn
+
+
+def _insert_row(conn, entry, summary, date_label, meta):
+    date_from, date_to = _date_range(date_label)
+    projects = meta.get("projects") or entry_projects(summary)
+    cur = conn.execute(
+        "INSERT INTO entries (date_label, date_from, date_to, engine, model, payload_chars,"
+        " token_estimate, summary, entry, hash, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            date_label, date_from, date_to,
+            meta.get("engine"), meta.get("model"),
+            meta.get("payload_chars"), meta.get("token_estimate"),
+            summary, entry, hashlib.sha1(entry.encode("utf-8")).hexdigest()[:16],
+            datetime.datetime.now().isoformat(timespec="seconds"),
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO entry_projects (entry_id, project) VALUES (?, ?)",
+        [(cur.lastrowid, p) for p in dict.fromkeys(projects)],
+    )
+
+
+def _import_markdown_into_sqlite(md_path, db_path):
+    """
+    처음 sqlite 방식으로 전환한 경우 기존 career_logs.md 엔트리를 오래된 순으로 옮겨옵니다.
+    임시 DB에 모두 넣은 뒤 제자리에 연결하므로, 대시보드의 다른 스레드나 다른 실행은
+    이전 도중의 빈 DB가 아니라 이전이 끝난 DB만 보게 됩니다.
+    """
+    with _import_lock:
+        if db_path.exists():
+            return
+        tmp_path = db_path.with_name(f"{db_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(md_path, "r", encoding="utf-8") as f:
+                raw_entries = _split_raw_markdown_entries(f.read())
+            conn = sqlite3.connect(str(tmp_path))
+            try:
+                conn.execute("PRAGMA foreign_keys=ON")
+                conn.executescript(_SQLITE_SCHEMA)
+                with conn:
+                    for raw in reversed(raw_entries):
+                        label = _entry_date_label(raw)
+                        header = f"## 📅 {label}\n\n"
+                        summary = raw[len(header):] if raw.startswith(header) else raw
+                        _insert_row(conn, raw, summary, label, {})
+            finally:
+                conn.close()
+            try:
+                # link는 대상이 있으면 실패하므로 다른 실행이 먼저 만든 DB(와 그 뒤 기록)를 덮어쓰지 않음
+                os.link(tmp_path, db_path)
+            except FileExistsError:
+                return
+            except OSError:
+                # 하드 링크를 지원하지 않는 파일 시스템
+                if db_path.exists():
+                    return
+                os.replace(tmp_path, db_path)
+            print(f"📦 기존 {md_path.name}의 엔트리 {len(raw_entries)}개를 {db_path.name}로 옮겼습니다.")
+        finally:
+            try:
+                os.remove(tmp_path)
+            except FileNotFoundError:
+                pass
+
+
+def _insert_sqlite_entry(entry, summary, filename, date_label, meta):
+    label = date_label if date_label else datetime.date.today().strftime("%Y-%m-%d")
+    try:
+        conn = _open_sqlite(filename, create=True)
+        try:
+            with conn:
+                _insert_row(conn, entry, summary, label, meta)
+        finally:
+            conn.close()
+        return _sqlite_path(filename)
+    except sqlite3.Error as e:
+        print(f"❌ 로그 DB 저장 실패: {e}")
+        return None
+
+
+def _escape_like(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _query_sqlite_entries(offset, limit, date_from, date_to, project, filename):
+    conn = _open_sqlite(filename)
+    if conn is None:
+        return
+    where, params = [], []
+    if date_from:
+        where.append("date_to >= ?")
+        params.append(date_from)
+    if date_to:
+        where.append("date_from <= ?")
+        params.append(date_to)
+    if project:
+        # 앞부분 일치 LIKE는 COLLATE NOCASE 인덱스(idx_entry_projects_project)로 범위 조회
+        where.append("id IN (SELECT entry_id FROM entry_projects WHERE project LIKE ? ESCAPE '\\')")
+        params.append(_escape_like(project) + "%")
+    # 최신순(id 역순, 기본 키) 페이지 조회. 프로젝트 목록은 같은 쿼리에서 붙임
+    sql = (
+        "SELECT id, date_label, entry,"
+        " (SELECT group_concat(project, char(31)) FROM entry_projects WHERE entry_id = entries.id)"
+        " FROM entries"
+        + (" WHERE " + " AND ".join(where) if where else "")
+        + " ORDER BY id DESC LIMIT ? OFFSET ?"
+    )
+    params += [-1 if limit is None else limit, offset]
+    try:
+        position, prev_id = None, None
+        # fetchall 없이 커서를 순회해 대량 조회(ndjson 스트리밍)도 메모리를 일정하게 유지
+        for entry_id, date_label, entry, projects in conn.execute(sql, params):
+            # 최신순 위치는 전체 테이블을 매번 번호 매기지 않고, 돌려주는 엔트리 사이의 id 개수만 셈
+            if position is None:
+                position = conn.execute("SELECT COUNT(*) FROM entries WHERE id > ?", (entry_id,)).fetchone()[0]
+            elif where:
+                position += 1 + conn.execute(
+                    "SELECT COUNT(*) FROM entries WHERE id > ? AND id < ?", (entry_id, prev_id)
+                ).fetchone()[0]
+            else:
+                position += 1
+            prev_id = entry_id
+            yield {
+                "position": position,
+                "date": date_label,
+                "projects": projects.split("\x1f") if projects else [],
+                "text": _clean_entry(entry + ENTRY_SEPARATOR),
+            }
+    finally:
+        conn.close()
+
+
+# ── 저장소별 수집 워터마크 ──
+
+def load_watermarks(filename=WATERMARK_FILENAME):
+    """
+    저장소별 워터마크를 읽어옵니다.
+    반환: {repo_path: {"head": 커밋 SHA, "worktree_hash": 미커밋 diff 해시, "updated_at": ISO 시각}}
+    """
+    file_path = Path.cwd() / filename
+    if not file_path.exists():
+        return {}
+    try:
+        with open(file_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (json.JSONDecodeError, IOError):
+        return {}
+
+
+def save_watermarks(updates, filename=WATERMARK_FILENAME):
+    """
+    워터마크를 갱신합니다. updates에 포함된 저장소만 덮어쓰고 나머지는 유지.
+    임시 파일에 쓴 뒤 교체하므로 중간에 중단되어도 기존 파일이 깨지지 않습니다.
+    """
+    file_path = Path.cwd() / filename
+    watermarks = load_watermarks(filename)
+    now = datetime.datetime.now().isoformat(timespec="seconds")
+    for repo, mark in updates.items():
+        watermarks[repo] = dict(mark, updated_at=now)
+
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(watermarks, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, file_path)
+        return True
+    except Exception as e:
+        print(f"⚠️ 워터마크 저장 실패: {e}")
+        return False
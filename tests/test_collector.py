@@ -0,0 +1,68 @@
+import subprocess
+
+from claw_log.collector import collect_commits, list_commit_changes, worktree_pathspec
+
+
+def _git(repo, *args):
+    subprocess.run(["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                   check=True, capture_output=True)
+
+
+def _make_repo(tmp_path):
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    (repo / "plain.py").write_text("a\n", encoding="utf-8")
+    (repo / "한글.py").write_text("b\n", encoding="utf-8")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-qm", "init")
+    return repo
+
+
+def test_worktree_pathspec_keeps_non_ascii_names(tmp_path):
+    repo = _make_repo(tmp_path)
+    (repo / "plain.py").write_text("a\nc\n", encoding="utf-8")
+    (repo / "한글.py").write_text("b\nd\n", encoding="utf-8")
+
+    assert worktree_pathspec(repo) == [":(literal)plain.py", ":(literal)한글.py"]
+
+
+def test_list_commit_changes_keeps_non_ascii_renames(tmp_path):
+    repo = _make_repo(tmp_path)
+    _git(repo, "mv", "한글.py", "새 파일.py")
+    _git(repo, "commit", "-qm", "rename")
+
+    changes = list_commit_changes(repo, ["HEAD~1..HEAD"])
+    assert [path for path, _, _ in changes[0][1]] == ["새 파일.py"]
+
+
+def test_collect_commits_keeps_non_ascii_files(tmp_path):
+    repo = _make_repo(tmp_path)
+    (repo / "big.txt").write_text("x\n", encoding="utf-8")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-qm", "small")
+    # big.txt는 이 커밋에서만 제외되므로 diff 헤더로 파일을 구분해야 함
+    (repo / "big.txt").write_text("x\n" * 3000, encoding="utf-8")
+    (repo / "한글.py").write_text("b\nd\n", encoding="utf-8")
+    _git(repo, "commit", "-qam", "big")
+
+    text, _, truncated = collect_commits(repo, ["HEAD~2..HEAD"])
+    assert not truncated
+    assert "+d" in text
+
+
+def test_collect_commits_pairs_renames(tmp_path):
+    repo = _make_repo(tmp_path)
+    (repo / "module.py").write_text("".join(f"line {i}\n" for i in range(200)), encoding="utf-8")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-qm", "add module")
+    _git(repo, "mv", "module.py", "renamed.py")
+    (repo / "renamed.py").write_text("".join(f"line {i}\n" for i in range(199)) + "changed\n", encoding="utf-8")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-qm", "rename")
+
+    text, _, _ = collect_commits(repo, ["HEAD~1..HEAD"])
+    assert "rename from module.py" in text
+    assert "new file mode" not in text
+    assert "+changed" in text
+    assert len(text.splitlines()) < 30
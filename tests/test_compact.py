@@ -0,0 +1,75 @@
+from claw_log.compact import compact_diff, parse_diff, select_hunks
+
+
+def _file_diff(path, *hunks):
+    return f"diff --git a/{path} b/{path}\nindex 1111111..2222222 100644\n--- a/{path}\n+++ b/{path}\n" + "".join(hunks)
+
+
+def _hunk(lines, header="@@ -1,3 +1,3 @@ def f():\n"):
+    return header + "".join(line + "\n" for line in lines)
+
+
+def test_reindent_only_hunk_is_dropped():
+    diff = _file_diff("a.py", _hunk([" def f():", "-  return 1", "+    return 1"]))
+    text, stats = compact_diff(diff)
+    assert stats["whitespace_hunks"] == 1
+    assert text == ""
+
+
+def test_reordered_lines_are_kept():
+    diff = _file_diff("pay.py", _hunk([
+        " def transfer():",
+        "-    debit(account)",
+        "-    credit(target)",
+        "+    credit(target)",
+        "+    debit(account)",
+    ]))
+    text, stats = compact_diff(diff)
+    assert stats["whitespace_hunks"] == 0
+    assert "+    debit(account)" in text
+
+
+def test_whitespace_inside_tokens_is_kept():
+    diff = _file_diff("acl.py", _hunk([" if ok:", "-    allowed = user.in group", "+    allowed = user.ingroup"]))
+    text, stats = compact_diff(diff)
+    assert stats["whitespace_hunks"] == 0
+    assert "user.ingroup" in text
+
+
+def test_moved_block_is_summarised():
+    block = ["def helper(x):", "    y = x * 2", "    return y + 1"]
+    diff = (
+        _file_diff("old.py", _hunk([" import os"] + ["-" + l for l in block], "@@ -1,4 +1,1 @@\n"))
+        + _file_diff("new.py", _hunk([" import sys"] + ["+" + l for l in block], "@@ -1,1 +1,4 @@\n"))
+    )
+    text, stats = compact_diff(diff)
+    assert stats["moved_hunks"] == 2
+    assert "helper" not in text
+    assert "(이동된 코드 3줄 생략)" in text
+
+
+def test_edit_is_not_treated_as_move():
+    diff = _file_diff("a.py", _hunk([" def f():", "-    a = 1", "-    b = 2", "-    c = 3", "+    a = 10", "+    b = 20"]))
+    _, stats = compact_diff(diff)
+    assert stats["moved_hunks"] == 0
+
+
+def test_select_hunks_prefers_definitions_within_budget():
+    trivial = _hunk([" x", "-# old comment", "+# new comment"], "@@ -1,2 +1,2 @@\n")
+    important = _hunk([" x", "+def new_api(request):", "+    return handle(request)"], "@@ -10,1 +10,3 @@\n")
+    section = _file_diff("api.py", trivial, important)
+
+    def count(text):
+        return len(text.split())
+
+    f = [p for p in parse_diff(section) if not isinstance(p, str)][0]
+    budget = count(f.render([])) + count(f.hunks[1].render())
+    picked = select_hunks(section, budget, count)
+    assert "def new_api" in picked
+    assert "# new comment" not in picked
+    assert "(덜 중요한 변경 1곳 생략)" in picked
+
+
+def test_select_hunks_returns_none_when_nothing_fits():
+    section = _file_diff("a.py", _hunk([" x", "+y = 1"]))
+    assert select_hunks(section, 1, lambda text: len(text)) is None
@@ -0,0 +1,50 @@
+import datetime
+import os
+import subprocess
+
+import pytest
+
+from claw_log.main import collect_daily_diffs
+
+
+def _git(repo, *args, when=None):
+    env = dict(os.environ)
+    if when is not None:
+        env["GIT_AUTHOR_DATE"] = env["GIT_COMMITTER_DATE"] = when.isoformat()
+    subprocess.run(["git", "-C", str(repo), "-c", "user.name=t", "-c", "user.email=t@t", *args],
+                   check=True, capture_output=True, env=env)
+
+
+def _commit_on(repo, day, name, text):
+    (repo / name).write_text(text, encoding="utf-8")
+    _git(repo, "add", name)
+    _git(repo, "commit", "-qm", f"add {name}", when=datetime.datetime.combine(day, datetime.time(12)))
+
+
+@pytest.mark.parametrize("collector", ["log", "batch"])
+def test_collect_daily_diffs_splits_commits_by_day(tmp_path, monkeypatch, collector):
+    monkeypatch.setenv("COLLECTOR", collector)
+    today = datetime.date.today()
+    repo = tmp_path / "repo"
+    repo.mkdir()
+    _git(repo, "init", "-q")
+    _commit_on(repo, today - datetime.timedelta(days=2), "first.py", "first_day = 1\n")
+    _commit_on(repo, today - datetime.timedelta(days=1), "second.py", "second_day = 2\n")
+    (repo / "second.py").write_text("second_day = 2\nuncommitted = 3\n", encoding="utf-8")
+
+    buckets = collect_daily_diffs([str(repo)], days=2, jobs=2)
+
+    assert [day for day, _ in buckets] == [today - datetime.timedelta(days=d) for d in (2, 1, 0)]
+    diffs = [results[0][1] or "" for _, results in buckets]
+    assert all(results[0][0] == str(repo) for _, results in buckets)
+    assert "+first_day = 1" in diffs[0] and "second_day" not in diffs[0]
+    assert "+second_day = 2" in diffs[1] and "first_day" not in diffs[1]
+    assert "uncommitted" not in diffs[1]
+    # 미커밋 변경은 오늘 묶음에만 포함
+    assert "Uncommitted Current Work" in diffs[2] and "+uncommitted = 3" in diffs[2]
+    assert "Past Commits" not in diffs[2]
+
+
+def test_collect_daily_diffs_skips_missing_repos(tmp_path):
+    buckets = collect_daily_diffs([str(tmp_path / "missing")], days=1)
+    assert [results for _, results in buckets] == [[], []]
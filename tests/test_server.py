@@ -0,0 +1,93 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+from claw_log import storage
+from claw_log.server import LOGS_PAGE_MAX, DashboardHandler, _parse_logs_query
+
+
+@pytest.fixture
+def logs_url(tmp_path, monkeypatch):
+    """엔트리 5개(2026-01-01 ~ 05, proj0/proj1 번갈아)가 있는 대시보드 서버의 /api/logs 주소."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("LOG_BACKEND", "markdown")
+    for i in range(5):
+        storage.prepend_to_log_file(f"### 📂 [proj{i % 2}]\n- 작업 {i}", date_label=f"2026-01-{i + 1:02d}")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), DashboardHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/api/logs"
+    server.shutdown()
+    server.server_close()
+
+
+# 환경의 HTTP 프록시 설정과 무관하게 로컬 서버로 직접 요청
+_opener = urllib.request.build_opener(urllib.request.ProxyHandler({}))
+
+
+def _get(url):
+    with _opener.open(url) as resp:
+        return resp.read().decode("utf-8")
+
+
+# ── 쿼리 파라미터 검증 ──
+
+@pytest.mark.parametrize("query", [
+    "format=xml",
+    "offset=abc",
+    "limit=1.5",
+    "offset=-1",
+    "limit=-5",
+    "from=2026-1-1",
+    "to=yesterday",
+])
+def test_parse_logs_query_rejects_bad_values(query):
+    with pytest.raises(ValueError):
+        _parse_logs_query(query)
+
+
+def test_parse_logs_query_defaults_and_caps():
+    assert _parse_logs_query("")["limit"] == 20
+    assert _parse_logs_query("limit=100000")["limit"] == LOGS_PAGE_MAX
+    assert _parse_logs_query("format=ndjson")["limit"] is None
+    assert _parse_logs_query("project=%20Proj%20")["project"] == "proj"
+
+
+# ── /api/logs 페이지 조회 ──
+
+def test_logs_pages_follow_next_offset(logs_url):
+    dates, offset = [], 0
+    while offset is not None:
+        page = json.loads(_get(f"{logs_url}?limit=2&offset={offset}"))
+        assert page["count"] <= 2
+        dates += [e["date"] for e in page["entries"]]
+        offset = page["next_offset"]
+
+    assert dates == ["2026-01-05", "2026-01-04", "2026-01-03", "2026-01-02", "2026-01-01"]
+
+
+def test_logs_filters_keep_positions(logs_url):
+    page = json.loads(_get(f"{logs_url}?project=PROJ1&from=2026-01-02&to=2026-01-04&limit=1"))
+    assert [(e["position"], e["date"], e["projects"]) for e in page["entries"]] == [(1, "2026-01-04", ["proj1"])]
+    assert page["next_offset"] == 1
+
+    page = json.loads(_get(f"{logs_url}?project=PROJ1&from=2026-01-02&to=2026-01-04&offset=1"))
+    assert [e["date"] for e in page["entries"]] == ["2026-01-02"]
+    assert page["next_offset"] is None
+
+
+def test_logs_ndjson_streams_every_entry(logs_url):
+    lines = _get(f"{logs_url}?format=ndjson&offset=1").splitlines()
+    assert [json.loads(line)["position"] for line in lines] == [1, 2, 3, 4]
+
+
+def test_logs_bad_query_returns_400(logs_url):
+    with pytest.raises(urllib.error.HTTPError) as exc:
+        _get(f"{logs_url}?offset=-1")
+    assert exc.value.code == 400
+    assert "error" in json.loads(exc.value.read().decode("utf-8"))
@@ -0,0 +1,162 @@
+import pytest
+
+from claw_log import storage
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def _write_entries(backend, monkeypatch, count):
+    monkeypatch.setenv("LOG_BACKEND", backend)
+    for i in range(count):
+        storage.prepend_to_log_file(f"### 📂 [proj{i % 2}]\n- 작업 {i}", date_label=f"2026-01-{i + 1:02d}")
+
+
+def _texts(n=100):
+    entries, error = storage.read_log_entries(0, n)
+    assert error is None
+    return entries
+
+
+# ── append 방식: 트레일러/CRC 복구 ──
+
+def test_segment_reads_skip_torn_tail(log_dir, monkeypatch):
+    _write_entries("append", monkeypatch, 3)
+    seg_path = storage._segment_path()
+    before = _texts()
+    # 쓰기 도중 중단된 레코드: 본문은 있지만 트레일러가 잘림
+    torn = storage._pack_record("## 📅 2026-01-09\n\n- 중단됨")[:-5]
+    with open(seg_path, "ab") as f:
+        f.write(torn)
+
+    assert _texts() == before
+    assert before[0].startswith("## 📅 2026-01-03")
+
+
+def test_segment_append_truncates_torn_tail(log_dir, monkeypatch):
+    _write_entries("append", monkeypatch, 2)
+    seg_path = storage._segment_path()
+    valid_size = seg_path.stat().st_size
+    with open(seg_path, "ab") as f:
+        f.write(b"partial record without trailer")
+
+    storage.prepend_to_log_file("- 다음 작업", date_label="2026-01-05")
+
+    record = storage._pack_record(storage._format_entry("- 다음 작업", "2026-01-05"))
+    assert seg_path.stat().st_size == valid_size + len(record)
+    assert [e.splitlines()[0] for e in _texts()] == [
+        "## 📅 2026-01-05", "## 📅 2026-01-02", "## 📅 2026-01-01",
+    ]
+
+
+def test_segment_crc_mismatch_is_treated_as_torn(log_dir, monkeypatch):
+    _write_entries("append", monkeypatch, 3)
+    seg_path = storage._segment_path()
+    data = bytearray(seg_path.read_bytes())
+    # 마지막 레코드 본문의 한 바이트를 바꿔 CRC가 맞지 않게 함
+    data[-storage._TRAILER_SIZE - 1] ^= 0xFF
+    seg_path.write_bytes(bytes(data))
+
+    assert [e.splitlines()[0] for e in _texts()] == ["## 📅 2026-01-02", "## 📅 2026-01-01"]
+    with open(seg_path, "rb") as f:
+        assert storage._valid_end(f, len(data)) < len(data)
+
+
+def test_segment_migrates_markdown_in_order(log_dir, monkeypatch):
+    _write_entries("markdown", monkeypatch, 3)
+    expected = _texts()
+
+    monkeypatch.setenv("LOG_BACKEND", "append")
+    assert _texts() == expected
+    assert storage._segment_path().exists()
+
+
+# ── markdown 방식: 오프셋 인덱스 ──
+
+def test_markdown_index_is_updated_on_prepend(log_dir, monkeypatch):
+    _write_entries("markdown", monkeypatch, 3)
+    file_path = log_dir / storage.LOG_FILENAME
+    storage.load_log_index()
+    build_index = storage._build_index
+    rebuilds = []
+    monkeypatch.setattr(storage, "_build_index", lambda path: rebuilds.append(path) or build_index(path))
+
+    storage.prepend_to_log_file("### 📂 [proj9]\n- 새 작업", date_label="2026-02-01")
+
+    index = storage._load_fresh_index(file_path)
+    assert rebuilds == []
+    assert index == build_index(file_path)
+    assert [item["date"] for item in index] == ["2026-02-01", "2026-01-03", "2026-01-02", "2026-01-01"]
+
+
+def test_markdown_index_reads_match_full_parse(log_dir, monkeypatch):
+    _write_entries("markdown", monkeypatch, 5)
+    content = (log_dir / storage.LOG_FILENAME).read_text(encoding="utf-8")
+    expected = storage._split_markdown_entries(content)
+
+    assert _texts() == expected
+    assert storage.read_log_entries(2, 2)[0] == expected[2:4]
+    assert [e["text"] for e in storage.iter_log_entries(start=3)] == expected[3:]
+
+
+def test_markdown_index_rebuilds_after_external_edit(log_dir, monkeypatch):
+    _write_entries("markdown", monkeypatch, 2)
+    file_path = log_dir / storage.LOG_FILENAME
+    storage.load_log_index()
+    # 사용자가 편집기로 파일 앞에 엔트리를 직접 추가
+    file_path.write_text("## 📅 2026-03-01\n\n- 수동 기록\n---\n\n" + file_path.read_text(encoding="utf-8"),
+                         encoding="utf-8")
+
+    assert storage._load_fresh_index(file_path) is None
+    assert [item["date"] for item in storage.load_log_index()] == ["2026-03-01", "2026-01-02", "2026-01-01"]
+
+
+# ── sqlite 방식: 가져오기/내보내기 ──
+
+def test_sqlite_import_export_round_trip(log_dir, monkeypatch):
+    _write_entries("markdown", monkeypatch, 4)
+    md_path = log_dir / storage.LOG_FILENAME
+    original = md_path.read_text(encoding="utf-8")
+    expected = _texts()
+
+    monkeypatch.setenv("LOG_BACKEND", "sqlite")
+    assert _texts() == expected
+    assert storage._sqlite_path().exists()
+    assert list(log_dir.glob("*.tmp")) == []
+
+    md_path.unlink()
+    assert storage.export_markdown() == md_path
+    assert md_path.read_text(encoding="utf-8") == original
+
+
+def test_sqlite_export_includes_new_entries(log_dir, monkeypatch):
+    _write_entries("markdown", monkeypatch, 2)
+    monkeypatch.setenv("LOG_BACKEND", "sqlite")
+    storage.prepend_to_log_file("### 📂 [proj7]\n- DB 기록", date_label="2026-01-10",
+                                meta={"engine": "test", "projects": ["proj7"]})
+
+    storage.export_markdown()
+    monkeypatch.setenv("LOG_BACKEND", "markdown")
+    assert [e.splitlines()[0] for e in _texts()] == [
+        "## 📅 2026-01-10", "## 📅 2026-01-02", "## 📅 2026-01-01",
+    ]
+
+
+@pytest.mark.parametrize("filters", [
+    {},
+    {"project": "PROJ1"},
+    {"project": "proj_"},
+    {"date_from": "2026-01-03"},
+    {"date_from": "2026-01-02", "date_to": "2026-01-04", "project": "proj0"},
+    {"offset": 1, "limit": 2},
+    {"offset": 1, "limit": 1, "project": "proj0"},
+])
+def test_sqlite_query_matches_markdown(log_dir, monkeypatch, filters):
+    _write_entries("markdown", monkeypatch, 6)
+    expected = list(storage.query_log_entries(**filters))
+
+    monkeypatch.setenv("LOG_BACKEND", "sqlite")
+    assert list(storage.query_log_entries(**filters)) == expected
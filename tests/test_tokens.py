@@ -0,0 +1,37 @@
+from claw_log.tokens import allocate_budget, count_tokens, fit_to_budget
+
+
+def _diff(n_files=5, lines=40):
+    header = "commit " + "a" * 40 + "\nAuthor: t <t@t>\nDate:   Mon Jan 1 00:00:00 2026 +0000\n\n    Add payment flow\n\n"
+    files = "".join(
+        f"diff --git a/src/f{i}.py b/src/f{i}.py\n@@ -1,0 +1,{lines} @@\n"
+        + "".join(f"+value_{j} = compute(item_{j})\n" for j in range(lines))
+        for i in range(n_files)
+    )
+    return header + files
+
+
+def test_fit_to_budget_keeps_commit_header_under_tiny_budget():
+    text, dropped = fit_to_budget(_diff(), 40)
+    assert text.startswith("commit " + "a" * 40)
+    assert len(dropped) == 5
+
+
+def test_fit_to_budget_keeps_whole_files_that_fit():
+    diff = _diff()
+    budget = count_tokens(diff) // 2
+    text, dropped = fit_to_budget(diff, budget)
+    assert "Add payment flow" in text
+    assert 0 < len(dropped) < 5
+    assert count_tokens(text) <= budget
+
+
+def test_fit_to_budget_returns_small_diff_unchanged():
+    diff = _diff(n_files=1, lines=3)
+    assert fit_to_budget(diff, 10000) == (diff, [])
+
+
+def test_allocate_budget_guarantees_a_floor_share():
+    alloc = allocate_budget([10000, 100, 100], 3000)
+    assert alloc[1] == 100 and alloc[2] == 100
+    assert sum(alloc) <= 3000
@@ -0,0 +1,217 @@
+"""
+Claw-Log Token Budget
+LLM에 보낼 diff의 토큰 수를 세고, 모델 컨텍스트 안에서 프로젝트별 예산을 나눕니다.
+tiktoken이 설치되어 있으면 OpenAI 계열 모델은 실제 토크나이저로, 그 외에는 보정된 근사값으로 셉니다.
+"""
+
+import fnmatch
+import os
+import re
+from functools import lru_cache
+
+from claw_log.compact import diff_header_path, select_hunks
+
+# 모델별 컨텍스트 윈도우 (입력 + 출력 토큰)
+CONTEXT_WINDOWS = {
+    "gemini-2.5-flash": 1048576,
+    "gpt-4o-mini": 128000,
+    "gpt-5.1": 272000,
+}
+DEFAULT_CONTEXT_WINDOW = 128000
+
+# 프로젝트 하나에 보낼 diff 상한 (.env: PROJECT_TOKENS). 이전의 프로젝트당 15,000자와 비슷한 분량
+DEFAULT_PROJECT_TOKENS = 5000
+OUTPUT_RESERVE_TOKENS = 4096
+PROMPT_RESERVE_TOKENS = 2048
+
+# 근사 계산 보정값 (토큰/글자): 한글 음절은 대부분 1토큰 이하, 코드/영문은 3~4글자당 1토큰.
+# 예산 초과를 피하도록 실제보다 약간 많게 잡음
+HANGUL_TOKENS_PER_CHAR = 1.0
+OTHER_WIDE_TOKENS_PER_CHAR = 1.0
+ASCII_CHARS_PER_TOKEN = 3.2
+
+_HANGUL_RE = re.compile(r"[가-힣ㄱ-ㆎ]")
+_WIDE_RE = re.compile(r"[^\x00-\x7f]")
+_SPACE_RUN_RE = re.compile(r"[ \t]{2,}")
+
+
+@lru_cache(maxsize=8)
+def _encoding_for(model):
+    """OpenAI 계열 모델의 tiktoken 인코딩. tiktoken이 없거나 해당 없는 모델이면 None."""
+    if not model or not model.startswith(("gpt-", "o1", "o3", "o4")):
+        return None
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def tokenizer_name(model=None):
+    """토큰 수 계산 방식 이름 (--dry-run 표시용)."""
+    encoding = _encoding_for(model)
+    return f"tiktoken {encoding.name}" if encoding else "근사값"
+
+
+def _heuristic_tokens(text):
+    hangul = len(_HANGUL_RE.findall(text))
+    wide = len(_WIDE_RE.findall(text)) - hangul
+    # 들여쓰기 같은 연속 공백은 토크나이저가 한 토큰으로 묶으므로 한 칸으로 취급
+    ascii_chars = len(_SPACE_RUN_RE.sub(" ", text)) - hangul - wide
+    return int(hangul * HANGUL_TOKENS_PER_CHAR + wide * OTHER_WIDE_TOKENS_PER_CHAR
+               + ascii_chars / ASCII_CHARS_PER_TOKEN + 0.5)
+
+
+def count_tokens(text, model=None):
+    """text의 토큰 수. model이 OpenAI 계열이고 tiktoken이 있으면 정확한 값, 아니면 근사값."""
+    if not text:
+        return 0
+    encoding = _encoding_for(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return _heuristic_tokens(text)
+
+
+def payload_token_budget(model=None):
+    """
+    한 요청에 보낼 diff 토큰 예산: 모델 컨텍스트 - 프롬프트 - 출력 여유.
+    .env의 PAYLOAD_TOKENS로 더 작게 제한할 수 있습니다. (비용 조절용)
+    """
+    window = CONTEXT_WINDOWS.get(model, DEFAULT_CONTEXT_WINDOW)
+    budget = window - PROMPT_RESERVE_TOKENS - OUTPUT_RESERVE_TOKENS
+    try:
+        override = int(os.getenv("PAYLOAD_TOKENS") or 0)
+    except ValueError:
+        override = 0
+    if override > 0:
+        budget = min(budget, override)
+    return max(1, budget)
+
+
+def project_token_budget():
+    """프로젝트 하나에 보낼 diff 토큰 상한 (.env: PROJECT_TOKENS)."""
+    try:
+        return max(1, int(os.getenv("PROJECT_TOKENS", DEFAULT_PROJECT_TOKENS)))
+    except ValueError:
+        return DEFAULT_PROJECT_TOKENS
+
+
+def allocate_budget(sizes, total):
+    """
+    total 토큰을 프로젝트별 필요량(sizes) 목록에 맞춰 나눕니다.
+    전부 들어가면 필요량 그대로, 넘치면 각 프로젝트에 최소 몫(total / 2N)을 먼저 보장한 뒤
+    남은 예산을 초과분 크기에 비례해 배분합니다. 반환: sizes와 같은 순서의 배정량 목록
+    """
+    if sum(sizes) <= total:
+        return list(sizes)
+    floor = total // (2 * len(sizes))
+    alloc = [min(size, floor) for size in sizes]
+    remaining = total - sum(alloc)
+    extra = [size - a for size, a in zip(sizes, alloc)]
+    weight = sum(extra)
+    return [a + (remaining * e // weight if weight else 0) for a, e in zip(alloc, extra)]
+
+
+# ── 파일 단위 우선순위 ──
+# 0: 커밋 메시지/구분 헤더, 1: 소스, 2: 테스트/문서, 3: 설정/데이터, 4: 생성물/lock/벤더
+
+GENERATED_GLOBS = (
+    "*.lock", "*-lock.json", "*-lock.yaml", "go.sum", "*.min.js", "*.min.css", "*.map", "*.snap",
+    "*.pb.go", "*_pb2.py", "*_pb2_grpc.py", "*.generated.*", "*.g.dart", "*.pbxproj", "*.svg",
+)
+GENERATED_DIRS = ("dist", "build", "vendor", "third_party", "node_modules", "generated", "__snapshots__")
+TEST_DOC_GLOBS = ("test_*", "*_test.*", "*.test.*", "*.spec.*", "*.md", "*.rst", "*.txt")
+TEST_DOC_DIRS = ("test", "tests", "__tests__", "spec", "docs", "doc")
+CONFIG_GLOBS = ("*.json", "*.yaml", "*.yml", "*.toml", "*.ini", "*.cfg", "*.xml", "*.csv", ".env*", "*.properties")
+
+_META_START_RE = re.compile(r"^(commit [0-9a-f]{7,40}|=== \[)")
+
+
+def file_priority(path):
+    """diff 파일 경로의 전송 우선순위 (작을수록 먼저)."""
+    name = path.rsplit("/", 1)[-1]
+    dirs = path.split("/")[:-1]
+    if any(d in GENERATED_DIRS for d in dirs) or any(fnmatch.fnmatch(name, g) for g in GENERATED_GLOBS):
+        return 4
+    if any(d in TEST_DOC_DIRS for d in dirs) or any(fnmatch.fnmatch(name, g) for g in TEST_DOC_GLOBS):
+        return 2
+    if any(fnmatch.fnmatch(name, g) for g in CONFIG_GLOBS):
+        return 3
+    return 1
+
+
+def split_sections(diff):
+    """
+    get_git_diff_for_path 출력을 [(우선순위, 파일 경로 또는 None, 텍스트)] 조각으로 나눕니다.
+    커밋 헤더/메시지와 '=== [...] ===' 구분선은 경로 None, 우선순위 0.
+    """
+    sections = []
+    current, path = [], None
+    for line in diff.splitlines(keepends=True):
+        header_path = diff_header_path(line)
+        if header_path is not None or _META_START_RE.match(line):
+            if current:
+                sections.append((file_priority(path) if path else 0, path, "".join(current)))
+            current, path = [], header_path
+        current.append(line)
+    if current:
+        sections.append((file_priority(path) if path else 0, path, "".join(current)))
+    return sections
+
+
+def _truncate_to_tokens(text, budget, model=None):
+    """줄 단위로 잘라 budget 토큰 이내의 앞부분을 반환합니다."""
+    lines = text.splitlines(keepends=True)
+    lo, hi = 0, len(lines)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if count_tokens("".join(lines[:mid]), model) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return "".join(lines[:lo])
+
+
+def fit_to_budget(diff, budget, model=None):
+    """
+    diff를 budget 토큰 이내로 줄입니다. 커밋 메시지 → 소스 → 테스트/문서 → 설정 → 생성물 순으로
+    파일 단위로 담고, 들어가지 않는 파일은 생략 목록으로 남깁니다. 원래 순서는 유지됩니다.
+    반환: (줄인 diff, 생략된 파일 경로 목록)
+    """
+    if count_tokens(diff, model) <= budget:
+        return diff, []
+
+    sections = split_sections(diff)
+    costs = [count_tokens(text, model) for _, _, text in sections]
+    order = sorted(range(len(sections)), key=lambda i: (sections[i][0], i))
+
+    # 생략 안내 한 줄 분량을 남겨둠 (예산이 아주 작으면 그만큼 줄임)
+    remaining = max(0, budget - min(64, budget // 4))
+    kept = {}
+    for i in order:
+        if costs[i] <= remaining:
+            kept[i] = sections[i][2]
+            remaining -= costs[i]
+        elif sections[i][0] == 0:
+            # 커밋/프로젝트 구분 헤더는 예산이 모자라도 첫 줄은 남겨 어느 변경인지 알 수 있게 함
+            kept[i] = sections[i][2].splitlines(keepends=True)[0]
+            remaining = max(0, remaining - count_tokens(kept[i], model))
+        elif remaining >= 256 and sections[i][1] and sections[i][0] <= 2:
+            # 남은 예산이 충분하면 소스/테스트/문서 파일은 중요한 hunk만이라도 담음
+            partial = select_hunks(sections[i][2], remaining, lambda t: count_tokens(t, model))
+            if partial is None:
+                head = _truncate_to_tokens(sections[i][2], remaining - 16, model)
+                partial = head + "... (이하 생략)\n" if head else None
+            if partial:
+                kept[i] = partial
+                remaining -= count_tokens(partial, model)
+
+    dropped = [sections[i][1] for i in range(len(sections)) if i not in kept and sections[i][1]]
+    text = "".join(kept[i] for i in sorted(kept))
+    if dropped:
+        names = ", ".join(dropped[:10]) + (f" 외 {len(dropped) - 10}개" if len(dropped) > 10 else "")
+        text += f"\n[예산 초과로 생략된 파일 {len(dropped)}개: {names}]\n"
+    return text, dropped